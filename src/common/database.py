@@ -1,80 +1,383 @@
 """
 파일명: src/common/database.py
 목적: 데이터베이스 연결 및 쿼리 실행 담당
-기능: 
+기능:
 - PostgreSQL 데이터베이스에 연결
+- 모듈 전역 연결 풀(ThreadedConnectionPool)에서 연결을 빌리고 반납 (pooled_connection)
 - SQL 쿼리 실행 및 결과 반환
+- 대용량 결과 스트리밍 조회 (iter_query / iter_query_frames: 서버측 named cursor)
+- DataFrame 대량 적재 (copy_dataframe: COPY FROM STDIN, 청크 단위, 임시 스테이징 테이블 + upsert)
 - 에러 발생 시 로깅
+주의사항:
+  - 풀 크기는 .env의 DB_POOL_MINCONN / DB_POOL_MAXCONN 으로 설정 (기본 1 / 10)
+  - 풀의 연결이 모두 사용 중이면 DB_POOL_TIMEOUT초(기본 30초)까지 반납을 기다린 뒤 오류
+  - 일정 시간(DB_POOL_PING_SECONDS, 기본 30초) 이상 쉬던 연결은 빌려줄 때 SELECT 1로 확인하고, 끊겼으면 새 연결로 교체
+  - 스트리밍 조회 시 한 번에 받아오는 행 수는 DB_ITERSIZE (기본 10000)
+  - fork된 자식 프로세스는 부모의 소켓을 쓰지 않도록 자체 풀을 새로 만듦
 변경이력:
   - 2025-09-01: 최초 생성 (BenKorea)
 """
 
-import psycopg2
+import atexit
+import io
 import os
-from common.logger import log_error, log_debug
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2 import sql
+from common.logger import log_error, log_debug, log_info, log_warn
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_pool_slots = None  # 풀 크기(maxconn)만큼의 BoundedSemaphore. 풀이 다 빌려졌으면 PoolError 대신 반납될 때까지 대기
+_last_used = weakref.WeakKeyDictionary()  # conn → 마지막 반납 시각 (폐기된 연결은 자동 제거되어 id 재사용과 무관)
+
+
+def _connection_params() -> dict:
+    return dict(
+        host=os.getenv("DB_HOST", "localhost"),
+        database=os.getenv("DB_NAME", "ai4ref"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+        port=os.getenv("DB_PORT", "5432")
+    )
+
 def get_db_connection():
-    """표준 데이터베이스 연결을 반환합니다."""
+    """표준 데이터베이스 연결을 반환합니다. (풀과 무관한 단독 연결, 호출측에서 close)"""
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            database=os.getenv("DB_NAME", "ai4ref"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", "postgres"),
-            port=os.getenv("DB_PORT", "5432")
-        )
+        conn = psycopg2.connect(**_connection_params())
         log_debug("데이터베이스 연결 성공")
         return conn
     except psycopg2.Error as e:
         log_error(f"데이터베이스 연결 실패: {e}")
         raise
 
+def get_pool():
+    """모듈 전역 연결 풀을 반환합니다. 최초 호출 시(또는 fork 후 자식 프로세스에서) 생성합니다."""
+    global _pool, _pool_pid, _pool_slots
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # fork 후에는 부모의 연결을 닫지 않고 버림 (닫으면 부모 세션이 종료됨)
+            minconn = int(os.getenv("DB_POOL_MINCONN", "1"))
+            maxconn = int(os.getenv("DB_POOL_MAXCONN", "10"))
+            try:
+                _pool = pg_pool.ThreadedConnectionPool(minconn, maxconn, **_connection_params())
+            except psycopg2.Error as e:
+                log_error(f"데이터베이스 연결 풀 생성 실패: {e}")
+                raise
+            _pool_pid = os.getpid()
+            _pool_slots = threading.BoundedSemaphore(maxconn)
+            _last_used.clear()
+            log_debug(f"데이터베이스 연결 풀 생성 (min={minconn}, max={maxconn})")
+    return _pool
+
+def close_pool():
+    """연결 풀의 모든 연결을 닫습니다. (프로세스 종료 시 자동 호출)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid() and not _pool.closed:
+            _pool.closeall()
+            log_debug("데이터베이스 연결 풀 종료")
+        _pool = None
+        _last_used.clear()
+
+atexit.register(close_pool)
+
+def _is_healthy(conn) -> bool:
+    """연결 상태 확인. 최근에 쓴 연결은 closed 플래그만, 오래 쉰 연결은 SELECT 1로 확인합니다."""
+    if conn.closed:
+        return False
+    idle = time.monotonic() - _last_used.get(conn, 0.0)
+    if idle < float(os.getenv("DB_POOL_PING_SECONDS", "30")):
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error as e:
+        log_warn(f"유휴 연결 확인 실패, 새 연결로 교체: {e}")
+        return False
+
+def _checkout(db_pool):
+    """풀에서 정상 연결을 빌립니다. 유휴 중 끊긴 연결은 폐기하고 다시 빌림 (대신 받은 연결도 확인, 풀 크기만큼 시도 후 포기)"""
+    conn = db_pool.getconn()
+    for _ in range(db_pool.maxconn):
+        if _is_healthy(conn):
+            return conn
+        _last_used.pop(conn, None)
+        db_pool.putconn(conn, close=True)
+        conn = db_pool.getconn()
+    if _is_healthy(conn):
+        return conn
+    db_pool.putconn(conn, close=True)
+    log_error("데이터베이스 연결 풀에서 정상 연결을 얻지 못했습니다.")
+    raise psycopg2.Error("데이터베이스 연결 풀에서 정상 연결을 얻지 못했습니다.")
+
+@contextmanager
+def pooled_connection():
+    """풀에서 연결을 빌려주고 블록이 끝나면 반납합니다.
+
+    풀의 연결이 모두 사용 중이면 반납될 때까지 최대 DB_POOL_TIMEOUT초(기본 30초) 기다립니다.
+    예외가 발생하면 롤백 후 반납하며, 끊긴 연결은 풀에서 폐기합니다.
+    커밋은 호출측에서 합니다.
+
+    사용예시:
+        >>> with pooled_connection() as conn:
+        ...     with conn.cursor() as cur:
+        ...         cur.execute("SELECT 1")
+        ...     conn.commit()
+    """
+    db_pool = get_pool()
+    slots = _pool_slots
+    timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    if not slots.acquire(timeout=timeout):
+        log_error(f"데이터베이스 연결 풀 대기 시간 초과 ({timeout}초)")
+        raise psycopg2.Error(f"데이터베이스 연결 풀 대기 시간 초과 ({timeout}초)")
+    try:
+        conn = _checkout(db_pool)
+    except Exception:
+        slots.release()
+        raise
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                pass
+        raise
+    finally:
+        broken = bool(conn.closed)
+        if broken:
+            _last_used.pop(conn, None)
+        else:
+            _last_used[conn] = time.monotonic()
+        if db_pool is _pool and not db_pool.closed:
+            db_pool.putconn(conn, close=broken)
+        slots.release()
+
 def execute_query(query: str, params=None, fetch_one=False, fetch_all=False):
     """쿼리 실행 헬퍼 함수"""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        cur.execute(query, params)
-        
-        result = None
-        if fetch_one:
-            result = cur.fetchone()
-        elif fetch_all:
-            result = cur.fetchall()
-        
-        conn.commit()
-        cur.close()
-        conn.close()
-        
+        with pooled_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+
+                result = None
+                if fetch_one:
+                    result = cur.fetchone()
+                elif fetch_all:
+                    result = cur.fetchall()
+
+            conn.commit()
+
         return result
-        
+
     except psycopg2.Error as e:
         log_error(f"쿼리 실행 오류: {e}")
-        if 'conn' in locals():
-            conn.rollback()
         raise
 
 def execute_many(query: str, data_list):
     """배치 삽입 헬퍼 함수"""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        cur.executemany(query, data_list)
-        
-        conn.commit()
-        affected_rows = cur.rowcount
-        cur.close()
-        conn.close()
-        
+        with pooled_connection() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(query, data_list)
+                affected_rows = cur.rowcount
+
+            conn.commit()
+
         return affected_rows
-        
+
     except psycopg2.Error as e:
         log_error(f"배치 실행 오류: {e}")
-        if 'conn' in locals():
+        raise
+
+def _server_cursor(conn, itersize: Optional[int]):
+    cur = conn.cursor(name=f"ai4rm_stream_{uuid.uuid4().hex}")
+    cur.itersize = itersize or int(os.getenv("DB_ITERSIZE", "10000"))
+    return cur
+
+def iter_query(query: str, params=None, itersize: Optional[int] = None) -> Iterator[tuple]:
+    """서버측 named cursor로 결과를 한 행씩 스트리밍합니다.
+
+    fetchall()과 달리 itersize 행씩 나누어 받아오므로 결과 전체가 클라이언트 메모리에 올라오지 않습니다.
+    반복이 끝나거나 중단되면 커서를 닫고 연결을 풀에 반납합니다.
+
+    사용예시:
+        >>> for patient_id, report in iter_query("SELECT patient_id, report FROM pathology"):
+        ...     process(patient_id, report)
+    """
+    try:
+        with pooled_connection() as conn:
+            with _server_cursor(conn, itersize) as cur:
+                cur.execute(query, params)
+                for row in cur:
+                    yield row
+            conn.rollback()  # 읽기 전용 트랜잭션 종료
+    except psycopg2.Error as e:
+        log_error(f"스트리밍 조회 오류: {e}")
+        raise
+
+def iter_query_frames(query: str, params=None, chunk_rows: int = 50000) -> Iterator[pd.DataFrame]:
+    """서버측 named cursor로 결과를 chunk_rows 행씩 DataFrame으로 스트리밍합니다.
+
+    사용예시:
+        >>> for chunk in iter_query_frames("SELECT * FROM pathology", chunk_rows=100000):
+        ...     deidentify_columns(chunk, config)
+    """
+    try:
+        with pooled_connection() as conn:
+            with _server_cursor(conn, chunk_rows) as cur:
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    # named cursor는 첫 fetch 이후에 description이 채워짐
+                    yield pd.DataFrame(rows, columns=[column[0] for column in cur.description])
             conn.rollback()
+    except psycopg2.Error as e:
+        log_error(f"스트리밍 조회 오류: {e}")
+        raise
+
+COPY_NULL = "\\N"  # COPY CSV의 NULL 표기 (빈 문자열과 NULL을 구분하기 위해 명시)
+
+def _table_identifier(table: str):
+    """'schema.table' 또는 'table'을 따옴표 처리된 식별자로 만듭니다."""
+    return sql.Identifier(*table.split("."))
+
+def _pg_type(dtype) -> str:
+    """DataFrame dtype → PostgreSQL 컬럼 타입 (대상 테이블 자동 생성용)"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+def _restore_integer_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """결측값 때문에 float64가 된 정수 컬럼을 Int64로 되돌립니다. (1.0 → 1, BIGINT 컬럼에 COPY 가능)"""
+    converted = {}
+    for column in df.columns:
+        values = df[column]
+        if not pd.api.types.is_float_dtype(values.dtype):
+            continue
+        present = values.dropna()
+        if present.empty or not ((present % 1 == 0) & (present.abs() < 2 ** 63)).all():
+            continue
+        converted[column] = values.astype("Int64")
+    return df.assign(**converted) if converted else df
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = 50000) -> Iterator[io.StringIO]:
+    """DataFrame을 chunk_rows 행씩 COPY용 CSV 버퍼로 변환합니다. (메모리에는 한 청크만 유지)
+
+    결측값은 COPY_NULL(\\N)로, 빈 문자열은 그대로 빈 문자열로 기록합니다.
+    """
+    for start in range(0, len(df), max(1, chunk_rows)):
+        buffer = io.StringIO()
+        df.iloc[start:start + chunk_rows].to_csv(buffer, header=False, index=False, na_rep=COPY_NULL)
+        buffer.seek(0)
+        yield buffer
+
+def copy_dataframe(df: pd.DataFrame, table: str, columns: Optional[Sequence[str]] = None,
+                   upsert_keys: Optional[Sequence[str]] = None, create_table: bool = False,
+                   chunk_rows: int = 50000) -> int:
+    """DataFrame을 COPY FROM STDIN(CSV)으로 테이블에 대량 적재합니다.
+
+    매개변수:
+        df (pd.DataFrame): 적재할 데이터 (컬럼명 = 테이블 컬럼명)
+        table (str): 대상 테이블 ('schema.table' 가능)
+        columns (Optional[Sequence[str]]): 적재할 컬럼 (기본: df의 모든 컬럼)
+        upsert_keys (Optional[Sequence[str]]): 지정 시 임시 스테이징 테이블에 COPY한 뒤
+            INSERT ... ON CONFLICT (keys) DO UPDATE 로 병합 (대상 테이블에 해당 키의 UNIQUE 제약 필요)
+        create_table (bool): 대상 테이블이 없으면 df dtype으로 생성 (upsert_keys 지정 시 UNIQUE (keys) 제약 포함)
+        chunk_rows (int): CSV 변환/전송 단위 행 수
+
+    반환값:
+        int: 적재(또는 병합)된 행 수
+
+    주의사항:
+        - 전체 적재는 하나의 트랜잭션이며, 실패 시 롤백되어 대상 테이블은 변경되지 않습니다
+        - 결측값이 있어 float64가 된 정수 컬럼(값이 모두 정수)은 Int64로 바꾸어 1.0이 아닌 1로 전송합니다
+    """
+    columns = list(columns) if columns is not None else [str(column) for column in df.columns]
+    if df.empty:
+        return 0
+    data = _restore_integer_columns(df[columns])
+    target = _table_identifier(table)
+    column_list = sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+
+    try:
+        with pooled_connection() as conn:
+            with conn.cursor() as cur:
+                if create_table:
+                    definitions = sql.SQL(", ").join(
+                        sql.SQL("{} {}").format(sql.Identifier(column), sql.SQL(_pg_type(data[column].dtype)))
+                        for column in columns
+                    )
+                    if upsert_keys:
+                        # ON CONFLICT (keys)에 필요한 UNIQUE 제약
+                        definitions = sql.SQL("{}, UNIQUE ({})").format(
+                            definitions, sql.SQL(", ").join(sql.Identifier(key) for key in upsert_keys)
+                        )
+                    cur.execute(sql.SQL("CREATE TABLE IF NOT EXISTS {} ({})").format(target, definitions))
+
+                copy_target = target
+                if upsert_keys:
+                    # 트랜잭션 종료 시 자동 삭제되는 스테이징 테이블 (대상 테이블과 같은 컬럼 타입)
+                    copy_target = sql.Identifier(f"_stage_{table.split('.')[-1]}")
+                    cur.execute(sql.SQL(
+                        "CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    ).format(copy_target, target))
+
+                copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL {})").format(
+                    copy_target, column_list, sql.Literal(COPY_NULL)
+                ).as_string(conn)
+                for number, buffer in enumerate(iter_csv_chunks(data, chunk_rows), 1):
+                    cur.copy_expert(copy_sql, buffer)
+                    log_debug(f"[copy_dataframe] {table}: 청크 {number} 전송 ({min(number * chunk_rows, len(data))}/{len(data)}행)")
+
+                affected_rows = len(data)
+                if upsert_keys:
+                    updates = [column for column in columns if column not in upsert_keys]
+                    if updates:
+                        conflict_action = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(
+                            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(column)) for column in updates
+                        ))
+                    else:
+                        conflict_action = sql.SQL("DO NOTHING")
+                    cur.execute(sql.SQL(
+                        "INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT ({}) {}"
+                    ).format(
+                        target, column_list, column_list, copy_target,
+                        sql.SQL(", ").join(sql.Identifier(key) for key in upsert_keys), conflict_action,
+                    ))
+                    affected_rows = cur.rowcount
+
+            conn.commit()
+
+        log_info(f"[copy_dataframe] {table}: {affected_rows}행 적재 완료")
+        return affected_rows
+
+    except psycopg2.Error as e:
+        log_error(f"[copy_dataframe] {table} 적재 오류: {e}")
         raise
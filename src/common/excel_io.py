@@ -5,23 +5,93 @@
 - input_dir를 인자로 받아 폴더 내 모든 xls/xlsx 파일을 탐색
 - Path 객체 및 pandas 라이브러리 사용
 - {파일명: 데이터프레임} 형태의 딕셔너리 반환
+- read_excel_file: 매직 바이트(OLE2/ZIP)로 형식을 판별하여 엔진을 고르는 공용 로더
+  (calamine 우선, 형식별로 성공한 엔진을 기억하여 다음 파일부터 먼저 시도)
+- iter_excels / iter_excel_chunks: 파일 단위 / 행 청크 단위 스트리밍 읽기 (openpyxl read-only, calamine)
+- ExcelStreamWriter: openpyxl write-only 모드 스트리밍 xlsx 저장 (파일당 상수 메모리)
+- save_frames / iter_frames / iter_frame_chunks: 중간산출물 포맷(xlsx | parquet(zstd) | feather(Arrow IPC, zstd)) 입출력
+  (parquet/feather는 pyarrow 필요, 최종 전달 산출물만 xlsx로 저장하는 것을 권장)
 변경이력:
   - 2025-10-02: 최초 구현 (BenKorea)
 """
 
+import importlib.util
 import inspect
 import os
+from itertools import islice
 from pathlib import Path
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+from openpyxl import Workbook, load_workbook
 from common.logger import log_error, log_debug, log_info
 
+# 매직 바이트: 구형 .xls(OLE2 복합문서) / .xlsx(ZIP 컨테이너)
+OLE2_MAGIC = b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1"
+ZIP_MAGIC = b"PK\x03\x04"
+_HAS_CALAMINE = importlib.util.find_spec("python_calamine") is not None
+
+# 파일 형식(signature)별로 마지막에 성공한 엔진 {"ole2": "calamine", ...}
+_engine_cache: Dict[str, str] = {}
+
+# 중간산출물 포맷 → 확장자
+INTERMEDIATE_FORMATS = {"xlsx": ".xlsx", "parquet": ".parquet", "feather": ".feather"}
+_STRIPPED_EXTENSIONS = ('.xls', '.xlsx', '.parquet', '.feather')
+
+def sniff_excel_format(file) -> str:
+  """파일 앞 8바이트로 형식을 판별합니다. "ole2"(xls) | "zip"(xlsx) | "unknown" """
+  with open(file, "rb") as f:
+    head = f.read(8)
+  if head.startswith(OLE2_MAGIC):
+    return "ole2"
+  if head.startswith(ZIP_MAGIC):
+    return "zip"
+  return "unknown"
+
+
+def candidate_engines(signature: str) -> List[str]:
+  """형식에 맞는 엔진 시도 순서를 반환합니다. 캐시된 엔진 → calamine → 형식 전용 엔진 순."""
+  if signature == "ole2":
+    engines = ['xlrd']
+  elif signature == "zip":
+    engines = ['openpyxl']
+  else:
+    engines = ['openpyxl', 'xlrd']
+  if _HAS_CALAMINE:
+    engines.insert(0, 'calamine')
+  cached = _engine_cache.get(signature)
+  if cached in engines:
+    engines.remove(cached)
+    engines.insert(0, cached)
+  return engines
+
+
+def read_excel_file(file) -> pd.DataFrame:
+  """
+  단일 엑셀 파일을 읽습니다.
+  매직 바이트로 xls/xlsx를 판별하여 해당 형식을 읽을 수 있는 엔진만 시도하므로,
+  구형 .xls를 openpyxl로 먼저 파싱하다 예외가 나는 낭비가 없습니다.
+  모든 후보 엔진이 실패하면 ValueError를 발생시킵니다.
+  """
+  signature = sniff_excel_format(file)
+  last_error = None
+  for engine in candidate_engines(signature):
+    try:
+      df = pd.read_excel(file, engine=engine)
+      _engine_cache[signature] = engine
+      log_debug(f"[read_excel_file] {engine}로 성공: {Path(file).name} ({signature}, shape={df.shape})")
+      return df
+    except Exception as e:
+      log_debug(f"[read_excel_file] {engine} 실패: {Path(file).name} - {e}")
+      last_error = e
+  raise ValueError(f"모든 엔진 실패: {file} - {last_error}")
+
+
 def read_excels(input_dir: str) -> Dict[str, pd.DataFrame]:
   excel_files = Path(input_dir).rglob("*.xls*")
   dfs = {}
   for file in excel_files:
     try:
-      df = pd.read_excel(file)
+      df = read_excel_file(file)
       dfs[file.name] = df
       log_debug(f"[read_excels] from: {file.name} (shape={df.shape})")
     except Exception as e:
@@ -29,6 +99,138 @@ def read_excels(input_dir: str) -> Dict[str, pd.DataFrame]:
   return dfs
 
 
+def iter_excels(input_dir: str) -> Iterator[Tuple[str, pd.DataFrame]]:
+  """read_excels의 제너레이터 버전. (파일명, 데이터프레임)을 한 파일씩 반환하여 동시에 한 파일만 메모리에 둡니다."""
+  for file in sorted(Path(input_dir).rglob("*.xls*")):
+    try:
+      df = read_excel_file(file)
+    except Exception as e:
+      log_error(f"[iter_excels] 엑셀 파일 읽기 오류: {file} - {e}")
+      continue
+    yield file.name, df
+
+
+def _convert_cell(value):
+  """pd.read_excel과 같은 규칙으로 셀 값을 변환합니다. (정수형 float → int, 빈 문자열 → None)"""
+  if isinstance(value, float) and value.is_integer():
+    return int(value)
+  if value == "":
+    return None
+  return value
+
+
+def _iter_sheet_rows(file, engine: str) -> Iterator[tuple]:
+  """첫 번째 시트의 행을 값 튜플로 하나씩 반환합니다."""
+  if engine == "openpyxl":
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+      for row in wb.worksheets[0].iter_rows(values_only=True):
+        yield tuple(_convert_cell(value) for value in row)
+    finally:
+      wb.close()
+  elif engine == "calamine":
+    from python_calamine import CalamineWorkbook
+    wb = CalamineWorkbook.from_path(str(file))
+    try:
+      for row in wb.get_sheet_by_index(0).iter_rows():
+        yield tuple(_convert_cell(value) for value in row)
+    finally:
+      wb.close()
+  else:
+    raise ValueError(f"스트리밍을 지원하지 않는 엔진: {engine}")
+
+
+def iter_excel_chunks(file, chunk_rows: int = 10000, engine: Optional[str] = None) -> Iterator[pd.DataFrame]:
+  """
+  엑셀 파일 하나를 chunk_rows 행씩 데이터프레임으로 스트리밍합니다.
+
+  Args:
+      file: 엑셀 파일 경로
+      chunk_rows (int): 청크당 행 수
+      engine (Optional[str]): "openpyxl"(read-only) 또는 "calamine". 미지정 시 매직 바이트로 판별하여
+          xlsx(ZIP)는 openpyxl, 그 외는 calamine. calamine이 없으면 read_excel_file 결과를 나누어 반환
+
+  Yields:
+      pd.DataFrame: 첫 행을 헤더로 사용한 청크. 인덱스는 파일 전체 기준으로 이어집니다.
+
+  Example:
+      >>> for chunk in iter_excel_chunks("data/raw/report.xlsx", chunk_rows=5000):
+      ...     process(chunk)
+  """
+  if engine is None:
+    engine = "openpyxl" if sniff_excel_format(file) == "zip" else "calamine"
+    if engine == "calamine" and not _HAS_CALAMINE:
+      df = read_excel_file(file)
+      for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+      return
+  rows = _iter_sheet_rows(file, engine)
+  header = next(rows, None)
+  if header is None:
+    return
+  columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+  start = 0
+  while True:
+    chunk = list(islice(rows, chunk_rows))
+    if not chunk:
+      break
+    yield pd.DataFrame(chunk, columns=columns, index=pd.RangeIndex(start, start + len(chunk)))
+    start += len(chunk)
+  log_debug(f"[iter_excel_chunks] {Path(file).name}: {start}행 ({engine})")
+
+
+def build_output_filename(original_filename: str, prefix: Optional[str] = None, extension: str = ".xlsx") -> str:
+  """원본 파일명에 접두사를 붙이고 확장자를 바꾼 저장 파일명을 반환합니다. (예: report1.xls → deid_report1.xlsx)"""
+  base_filename = os.path.basename(original_filename)
+  name_without_ext = os.path.splitext(base_filename)[0] if base_filename.endswith(_STRIPPED_EXTENSIONS) else base_filename
+  name_parts = []
+  if prefix:
+    name_parts.append(prefix.rstrip('_'))
+  name_parts.append(name_without_ext)
+  return '_'.join(name_parts) + extension
+
+
+class ExcelStreamWriter:
+  """
+  openpyxl write-only 모드로 데이터프레임 청크를 하나의 xlsx 파일에 이어 쓰는 스트리밍 저장기.
+
+  Example:
+      >>> with ExcelStreamWriter("output/deid_report1.xlsx") as writer:
+      ...     for chunk in iter_excel_chunks("input/report1.xlsx"):
+      ...         writer.append(deidentify(chunk))
+  """
+
+  def __init__(self, output_path):
+    self.output_path = str(output_path)
+    self._wb = Workbook(write_only=True)
+    self._ws = self._wb.create_sheet()
+    self._header_written = False
+    self.rows_written = 0
+
+  def append(self, df: pd.DataFrame) -> None:
+    """청크를 이어 씁니다. 첫 청크의 컬럼명을 헤더로 기록합니다."""
+    if not self._header_written:
+      self._ws.append([str(col) for col in df.columns])
+      self._header_written = True
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+      self._ws.append(row)
+    self.rows_written += len(df)
+
+  def close(self) -> None:
+    os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+    self._wb.save(self.output_path)
+    log_debug(f"[ExcelStreamWriter] 저장 완료: {self.output_path} ({self.rows_written}행)")
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    if exc_type is None:
+      self.close()
+    return False
+
+
 def save_excels(output_dir: str, dataframes_dict: Dict[str, pd.DataFrame], 
                     prefix: Optional[str] = None) -> None:
     """
@@ -75,24 +277,8 @@ def save_excels(output_dir: str, dataframes_dict: Dict[str, pd.DataFrame],
     
     for original_filename, df in dataframes_dict.items():
         try:
-            # 파일명 처리 (.xls → .xlsx 변환)
-            base_filename = os.path.basename(original_filename)
-            if base_filename.endswith('.xls'):
-                base_filename = base_filename[:-4] + '.xlsx'
-            elif not base_filename.endswith('.xlsx'):
-                base_filename = base_filename + '.xlsx'
-            
-            # 접두사/접미사 추가
-            name_parts = []
-            if prefix:
-                name_parts.append(prefix.rstrip('_'))
-            
-            # 파일명에서 확장자 분리
-            name_without_ext = base_filename.replace('.xlsx', '')
-            name_parts.append(name_without_ext)
-            
-            # 최종 파일명 생성
-            final_filename = '_'.join(name_parts) + '.xlsx'
+            # 파일명 처리 (.xls → .xlsx 변환, 접두사 추가)
+            final_filename = build_output_filename(original_filename, prefix)
             output_path = os.path.join(output_dir, final_filename)
             
             # 파일 저장
@@ -108,3 +294,119 @@ def save_excels(output_dir: str, dataframes_dict: Dict[str, pd.DataFrame],
     log_info(f"[save_excel_files] 저장 완료: {saved_count}개, 실패: {failed_count}개")
 
 
+def _check_format(fmt: str) -> str:
+    if fmt not in INTERMEDIATE_FORMATS:
+        raise ValueError(f"지원하지 않는 중간산출물 포맷: {fmt} (가능: {list(INTERMEDIATE_FORMATS)})")
+    return fmt
+
+
+def to_arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """숫자/문자가 섞인 object 컬럼은 Arrow로 저장할 수 없으므로 결측이 아닌 값을 문자열로 변환합니다."""
+    mixed = [col for col in df.columns
+             if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed")]
+    if not mixed:
+        return df
+    df = df.copy()
+    for col in mixed:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    log_debug(f"[to_arrow_safe] 혼합 타입 컬럼을 문자열로 변환: {mixed}")
+    return df
+
+
+def list_frame_files(input_dir: str, fmt: str = "xlsx", prefix: str = "", recursive: bool = False) -> List[Path]:
+    """input_dir에서 지정 포맷의 파일 목록을 정렬하여 반환합니다. (xlsx는 .xls 포함)
+
+    Args:
+        prefix (str): 이 접두사로 시작하는 파일만 (예: "structured_" → 구조화 단계 산출물만, 검증 리포트 등은 제외)
+        recursive (bool): 하위 디렉토리까지 탐색할지 여부 (기본: input_dir 바로 아래만)
+    """
+    pattern = prefix + ("*.xls*" if _check_format(fmt) == "xlsx" else f"*{INTERMEDIATE_FORMATS[fmt]}")
+    directory = Path(input_dir)
+    return sorted(directory.rglob(pattern) if recursive else directory.glob(pattern))
+
+
+def read_frame_file(file) -> pd.DataFrame:
+    """확장자에 따라 parquet/feather/엑셀 파일 하나를 읽습니다."""
+    suffix = Path(file).suffix.lower()
+    if suffix == ".parquet":
+        return pd.read_parquet(file)
+    if suffix == ".feather":
+        return pd.read_feather(file)
+    return read_excel_file(file)
+
+
+def iter_frames(input_dir: str, fmt: str = "xlsx", prefix: str = "") -> Iterator[Tuple[str, pd.DataFrame]]:
+    """iter_excels의 포맷 일반화 버전. (파일명, 데이터프레임)을 한 파일씩 반환합니다.
+
+    list_frame_files와 같이 input_dir 바로 아래에서 prefix로 시작하는 파일만 읽습니다.
+    """
+    for file in list_frame_files(input_dir, fmt, prefix=prefix):
+        try:
+            df = read_frame_file(file)
+        except Exception as e:
+            log_error(f"[iter_frames] 파일 읽기 오류: {file} - {e}")
+            continue
+        log_debug(f"[iter_frames] from: {file.name} (shape={df.shape})")
+        yield file.name, df
+
+
+def iter_frame_chunks(file, chunk_rows: int = 10000) -> Iterator[pd.DataFrame]:
+    """iter_excel_chunks의 포맷 일반화 버전. parquet은 row batch 단위로 스트리밍합니다."""
+    suffix = Path(file).suffix.lower()
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+        start = 0
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_rows):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+    elif suffix == ".feather":
+        df = pd.read_feather(file)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+    else:
+        yield from iter_excel_chunks(file, chunk_rows)
+
+
+def save_frames(output_dir: str, dataframes_dict: Dict[str, pd.DataFrame],
+                prefix: Optional[str] = None, fmt: str = "xlsx") -> None:
+    """
+    save_excels의 포맷 일반화 버전. 단계 사이 중간산출물(structured_ 등)을 빠른 컬럼 포맷으로 저장합니다.
+
+    Args:
+        output_dir (str): 저장할 디렉토리 경로
+        dataframes_dict (Dict[str, pd.DataFrame]): {파일명: 데이터프레임} 딕셔너리
+        prefix (Optional[str]): 파일명 앞에 붙일 접두사
+        fmt (str): "xlsx" | "parquet"(zstd 압축) | "feather"(Arrow IPC, zstd 압축)
+
+    Example:
+        >>> save_frames("data/structured/", dfs, prefix="structured_", fmt="parquet")
+        # 결과: "data/structured/structured_report1.parquet"
+    """
+    if _check_format(fmt) == "xlsx":
+        save_excels(output_dir, dataframes_dict, prefix=prefix)
+        return
+
+    if not dataframes_dict:
+        log_info("[save_frames] 저장할 데이터가 없습니다.")
+        return
+    os.makedirs(output_dir, exist_ok=True)
+
+    saved_count = 0
+    failed_count = 0
+    for original_filename, df in dataframes_dict.items():
+        output_path = os.path.join(output_dir, build_output_filename(original_filename, prefix, INTERMEDIATE_FORMATS[fmt]))
+        try:
+            df = to_arrow_safe(df.reset_index(drop=True))
+            if fmt == "parquet":
+                df.to_parquet(output_path, index=False, compression="zstd")
+            else:
+                df.to_feather(output_path, compression="zstd")
+            log_debug(f"[save_frames] 저장 완료: {output_path}")
+            saved_count += 1
+        except Exception as e:
+            log_error(f"[save_frames] 저장 실패: {original_filename} - {e}")
+            failed_count += 1
+
+    log_info(f"[save_frames] 저장 완료({fmt}): {saved_count}개, 실패: {failed_count}개")
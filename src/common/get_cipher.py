@@ -1,29 +1,123 @@
 """
 파일명: src/common/get_cipher.py
 목적: Format Preserver Encryption 제공
-기능: 
+기능:
   - .env 파일에서 FF3_KEY, FF3_TWEAK, FF3_ALPHANUMERIC, FF3_NUMERIC 읽어옴
+  - FF3_KEY 지문(fingerprint) 계산: 키 원문 노출 없이 키 교체 여부 판별
+  - get_cipher: (alphabet 종류, 키 지문)별로 FF3 암호화 객체를 한 번만 만들어 재사용 (스레드/fork 안전)
+  - rotate_cipher_key: .env를 다시 읽어 새 키로 암호화 객체를 재생성
+  - get_active_settings / get_active_fingerprint: get_cipher가 고정해 쓰는 키 설정 (가명 캐시가 같은 키를 쓰도록)
+주의사항:
+  - .env는 프로세스당 한 번만 읽습니다. 실행 중 키/트윅을 바꿨다면 rotate_cipher_key()를 호출해야 반영됩니다
 변경이력:
   - 2025-09-18: 최초 생성 (BenKorea)
 """
 
+import hashlib
 import os
+import threading
 
 from common.logger import log_critical, log_debug
 from dotenv import load_dotenv
 from ff3 import FF3Cipher
 
-def get_cipher(alphabet_type="alphanumeric"):
-    load_dotenv()
+_env_loaded = False
+_cipher_lock = threading.Lock()
+_ciphers = {}               # (alphabet_type, 키 지문) → FF3Cipher
+_active_fingerprint = None  # 현재 사용 중인 키 지문 (rotate_cipher_key 전까지 고정)
+_active_key = None          # 지문 고정 시점의 (KEY, TWEAK). 이후 생성되는 모든 alphabet의 암호화 객체가 공유
+
+
+def _reset_after_fork():
+    """fork된 자식 프로세스: 부모 스레드가 잡고 있었을 수 있는 잠금을 새로 만듭니다. (캐시는 그대로 재사용)"""
+    global _cipher_lock
+    _cipher_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _ensure_env_loaded():
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+def load_ff3_settings(alphabet_type="alphanumeric"):
+    """.env에서 (KEY, TWEAK, ALPHABET)을 읽어 반환합니다. 누락 시 RuntimeError."""
+    _ensure_env_loaded()
     KEY = os.getenv("FF3_KEY")
     TWEAK = os.getenv("FF3_TWEAK")
     if alphabet_type == "numeric":
         ALPHABET = os.getenv("FF3_NUMERIC")
     else:
         ALPHABET = os.getenv("FF3_ALPHANUMERIC")
-    log_debug(f"[get_cipher] alphabet_type = {alphabet_type}")
 
     if not KEY or not TWEAK or not ALPHABET:
         log_critical("필수 환경변수(FF3_KEY, FF3_TWEAK, FF3_ALPHANUMERIC, FF3_NUMERIC)가 누락되었습니다.")
         raise RuntimeError("필수 환경변수(FF3_KEY, FF3_TWEAK, FF3_ALPHANUMERIC, FF3_NUMERIC)가 누락되었습니다.")
-    return FF3Cipher.withCustomAlphabet(KEY, TWEAK, ALPHABET)
+    return KEY, TWEAK, ALPHABET
+
+def get_key_fingerprint(key: str) -> str:
+    """FF3 키의 지문(SHA-256 앞 16자리)을 반환합니다. 키 원문은 저장하지 않습니다."""
+    return hashlib.sha256(b"ai4rm-ff3-key-fingerprint:" + key.encode("utf-8")).hexdigest()[:16]
+
+def _pinned_settings(alphabet_type: str):
+    """(_cipher_lock 보유 상태에서) 고정된 (KEY, TWEAK)과 현재 ALPHABET을 반환합니다. 처음이면 현재 환경변수로 고정."""
+    global _active_fingerprint, _active_key
+    KEY, TWEAK, ALPHABET = load_ff3_settings(alphabet_type)
+    if _active_key is None:
+        _active_key = (KEY, TWEAK)
+        _active_fingerprint = get_key_fingerprint(KEY)
+    # 실행 중 환경변수가 바뀌었더라도 rotate_cipher_key() 전까지는 고정된 키/트윅을 사용
+    KEY, TWEAK = _active_key
+    return KEY, TWEAK, ALPHABET
+
+def get_active_settings(alphabet_type="alphanumeric"):
+    """get_cipher가 사용하는(고정된) (KEY, TWEAK, ALPHABET)을 반환합니다. 가명 캐시 등 키에 묶인 자원은 이 값을 사용해야 합니다."""
+    with _cipher_lock:
+        return _pinned_settings(alphabet_type)
+
+def get_active_fingerprint() -> str:
+    """get_cipher가 사용하는(고정된) 키의 지문을 반환합니다."""
+    with _cipher_lock:
+        _pinned_settings("alphanumeric")
+        return _active_fingerprint
+
+def get_cipher(alphabet_type="alphanumeric"):
+    """alphabet 종류별 FF3 암호화 객체를 반환합니다. 같은 키로는 프로세스당 한 번만 생성합니다."""
+    cipher = _ciphers.get((alphabet_type, _active_fingerprint))
+    if cipher is not None:
+        return cipher
+    with _cipher_lock:
+        KEY, TWEAK, ALPHABET = _pinned_settings(alphabet_type)
+        cache_key = (alphabet_type, _active_fingerprint)
+        if cache_key not in _ciphers:
+            _ciphers[cache_key] = FF3Cipher.withCustomAlphabet(KEY, TWEAK, ALPHABET)
+            log_debug(f"[get_cipher] 암호화 객체 생성: alphabet_type = {alphabet_type}, key = {_active_fingerprint}")
+        return _ciphers[cache_key]
+
+def rotate_cipher_key() -> str:
+    """.env를 다시 읽고(override) 캐시된 암호화 객체를 모두 폐기합니다. 새 키 지문을 반환합니다.
+
+    사용예시:
+        >>> new_fingerprint = rotate_cipher_key()  # FF3_KEY 교체 후
+        >>> cipher = get_cipher("numeric")         # 새 키로 생성
+    """
+    global _env_loaded, _active_fingerprint, _active_key
+    with _cipher_lock:
+        load_dotenv(override=True)
+        _env_loaded = True
+        _ciphers.clear()
+        KEY, TWEAK, _ = load_ff3_settings()
+        _active_key = (KEY, TWEAK)
+        _active_fingerprint = get_key_fingerprint(KEY)
+    log_debug(f"[rotate_cipher_key] 암호화 객체 캐시 초기화, key = {_active_fingerprint}")
+    return _active_fingerprint
+
+def clear_cipher_cache():
+    """캐시된 암호화 객체를 모두 폐기합니다. (다음 get_cipher 호출 시 현재 환경변수로 재생성)"""
+    global _active_fingerprint, _active_key
+    with _cipher_lock:
+        _ciphers.clear()
+        _active_fingerprint = None
+        _active_key = None
@@ -9,6 +9,8 @@
   - 프로젝트 로거 자동 보장(없으면 생성)
   - audit 로거의 stdout 출력 금지 보장(정책 위반 시 예외)
   - get_logger, log_info 등 래퍼 제공
+  - 로거 핸들 캐시 및 레벨 비활성 시 메시지를 만들지 않는 지연(lazy) 로깅
+    (log_debug("... %s", value) 또는 log_debug(lambda: f"...") 형태)
 변경이력:
   - 2025-08-12: 새로 생성 (BenKorea)
 """
@@ -20,7 +22,7 @@ import logging
 import logging.config
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 
 import yaml
 from dotenv import load_dotenv
@@ -168,15 +170,27 @@ def setup_logging() -> None:
     logging.config.dictConfig(cfg)
 
 
+_logger_cache: Dict[Optional[str], logging.Logger] = {}
+
+
 def get_logger(name: Optional[str] = PROJECT_NAME) -> logging.Logger:
     """
     지정된 이름의 로거 반환. 최초 호출 시 자동으로 setup_logging() 수행.
-    기본값은 .env의 PROJECT_NAME.
+    기본값은 .env의 PROJECT_NAME. 한 번 만든 핸들은 캐시하여 재사용합니다.
     """
+    logger = _logger_cache.get(name)
+    if logger is not None:
+        return logger
     root_logger = logging.getLogger()
     if not root_logger.hasHandlers():
         setup_logging()
-    return logging.getLogger(name or None)
+    logger = _logger_cache[name] = logging.getLogger(name or None)
+    return logger
+
+
+def is_enabled(level: int = logging.DEBUG) -> bool:
+    """프로젝트 로거에서 해당 레벨이 기록되는지 여부 (비싼 로그 메시지를 만들기 전에 확인)"""
+    return get_logger().isEnabledFor(level)
 
 
 def audit_log(action: str, detail: Optional[Dict[str, Any]] = None,
@@ -200,17 +214,30 @@ def audit_log(action: str, detail: Optional[Dict[str, Any]] = None,
 
 
 # 편의 래퍼(일관 API)
-def log_debug(msg: str) -> None:
-    get_logger().debug(msg)
+# msg에 %-style 인자(args)를 주거나 callable을 주면 해당 레벨이 꺼져 있을 때 문자열을 만들지 않음
+Message = Union[str, Callable[[], str]]
+
+
+def _log(level: int, msg: Message, args: tuple) -> None:
+    logger = get_logger()
+    if not logger.isEnabledFor(level):
+        return
+    if callable(msg):
+        msg = msg()
+    # stacklevel=3: 래퍼가 아닌 실제 호출 위치를 funcName/lineno로 기록
+    logger.log(level, msg, *args, stacklevel=3)
+
+def log_debug(msg: Message, *args: Any) -> None:
+    _log(logging.DEBUG, msg, args)
 
-def log_info(msg: str) -> None:
-    get_logger().info(msg)
+def log_info(msg: Message, *args: Any) -> None:
+    _log(logging.INFO, msg, args)
 
-def log_warn(msg: str) -> None:
-    get_logger().warning(msg)
+def log_warn(msg: Message, *args: Any) -> None:
+    _log(logging.WARNING, msg, args)
 
-def log_error(msg: str) -> None:
-    get_logger().error(msg)
+def log_error(msg: Message, *args: Any) -> None:
+    _log(logging.ERROR, msg, args)
 
-def log_critical(msg: str) -> None:
-    get_logger().critical(msg)
+def log_critical(msg: Message, *args: Any) -> None:
+    _log(logging.CRITICAL, msg, args)
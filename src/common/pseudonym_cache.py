@@ -0,0 +1,163 @@
+"""
+파일명: src/common/pseudonym_cache.py
+목적: FF3 가명화 결과(원본 → 가명) 영구 캐시
+기능:
+  - (키 지문, tweak, alphabet) 조합별 네임스페이스로 캐시 분리
+  - 메모리 LRU 계층 + SQLite 디스크 계층
+  - 디스크 저장 시 원본은 HMAC-SHA256 조회키로, 가명은 AES-GCM으로 암호화 (encrypted-at-rest)
+  - FF3_KEY 교체 시 이전 키 지문의 캐시 행을 열 때 자동 폐기
+  - .env의 FF3_CACHE_PATH가 설정된 경우에만 get_pseudonym_cache()가 캐시를 생성
+"""
+
+import hashlib
+import hmac
+import os
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from Crypto.Cipher import AES
+from dotenv import load_dotenv
+
+from common.get_cipher import get_active_settings, get_key_fingerprint
+from common.logger import log_debug, log_info
+
+# SQLite 바인딩 변수 한도(기본 999) 이하로 IN 조회를 나눔
+_SQL_CHUNK = 500
+
+
+class PseudonymCache:
+    """원본 ID → 가명 ID 매핑을 메모리(LRU)와 SQLite에 저장하는 캐시.
+
+    매개변수:
+        db_path (str | Path): SQLite 파일 경로 (상위 디렉토리는 자동 생성)
+        key (str): FF3_KEY (암호화/조회키 유도에만 사용되며 저장되지 않음)
+        tweak (str): FF3_TWEAK
+        alphabet (str): FF3 알파벳 (numeric/alphanumeric)
+        memory_size (int): 메모리 LRU 계층 최대 항목 수
+
+    주의사항:
+        - 키는 pseudonymize_id와 동일하게 str(원본값)을 사용합니다
+        - 디스크에는 원본/가명 평문이 남지 않습니다
+    """
+
+    def __init__(self, db_path, key: str, tweak: str, alphabet: str, memory_size: int = 100_000):
+        self.db_path = Path(db_path)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+
+        key_bytes = key.encode("utf-8")
+        self.key_fingerprint = get_key_fingerprint(key)
+        self.namespace = hashlib.sha256(
+            f"{self.key_fingerprint}|{tweak}|{alphabet}".encode("utf-8")
+        ).hexdigest()[:32]
+        self._lookup_key = hmac.new(key_bytes, b"ai4rm-pseudonym-cache:lookup", hashlib.sha256).digest()
+        self._value_key = hmac.new(key_bytes, b"ai4rm-pseudonym-cache:value", hashlib.sha256).digest()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pseudonyms ("
+            " key_fingerprint TEXT NOT NULL,"
+            " namespace TEXT NOT NULL,"
+            " lookup BLOB NOT NULL,"
+            " value BLOB NOT NULL,"
+            " PRIMARY KEY (namespace, lookup)) WITHOUT ROWID"
+        )
+        # 키 교체 시 이전 키로 만든 매핑은 모두 무효
+        purged = self._conn.execute(
+            "DELETE FROM pseudonyms WHERE key_fingerprint != ?", (self.key_fingerprint,)
+        ).rowcount
+        self._conn.commit()
+        if purged:
+            log_info(f"[PseudonymCache] FF3_KEY 변경 감지: 이전 키의 캐시 {purged}건 폐기")
+        log_debug(f"[PseudonymCache] 캐시 열기: {self.db_path} (namespace={self.namespace[:8]})")
+
+    # --- 암호화 헬퍼 ---
+    def _lookup(self, original: str) -> bytes:
+        return hmac.new(self._lookup_key, f"{self.namespace}|{original}".encode("utf-8"), hashlib.sha256).digest()
+
+    def _seal(self, pseudonym: str) -> bytes:
+        cipher = AES.new(self._value_key, AES.MODE_GCM)
+        ciphertext, tag = cipher.encrypt_and_digest(pseudonym.encode("utf-8"))
+        return cipher.nonce + tag + ciphertext
+
+    def _open(self, sealed: bytes) -> str:
+        nonce, tag, ciphertext = sealed[:16], sealed[16:32], sealed[32:]
+        cipher = AES.new(self._value_key, AES.MODE_GCM, nonce=nonce)
+        return cipher.decrypt_and_verify(ciphertext, tag).decode("utf-8")
+
+    # --- 메모리 LRU 계층 ---
+    def _remember(self, original: str, pseudonym: str) -> None:
+        self._memory[original] = pseudonym
+        self._memory.move_to_end(original)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # --- 공개 API ---
+    def get(self, original: str) -> Optional[str]:
+        """단일 원본값의 가명을 반환합니다. 없으면 None."""
+        return self.get_many([original]).get(original)
+
+    def get_many(self, originals: Iterable[str]) -> Dict[str, str]:
+        """여러 원본값을 한 번에 조회하여 {원본: 가명} 딕셔너리(적중분만)를 반환합니다."""
+        found: Dict[str, str] = {}
+        missing = []
+        for original in originals:
+            if original in self._memory:
+                self._memory.move_to_end(original)
+                found[original] = self._memory[original]
+            else:
+                missing.append(original)
+
+        for start in range(0, len(missing), _SQL_CHUNK):
+            chunk = missing[start:start + _SQL_CHUNK]
+            lookups = {self._lookup(original): original for original in chunk}
+            placeholders = ",".join("?" * len(lookups))
+            rows = self._conn.execute(
+                f"SELECT lookup, value FROM pseudonyms WHERE namespace = ? AND lookup IN ({placeholders})",
+                (self.namespace, *lookups.keys()),
+            ).fetchall()
+            for lookup, sealed in rows:
+                original = lookups[lookup]
+                pseudonym = self._open(sealed)
+                found[original] = pseudonym
+                self._remember(original, pseudonym)
+        return found
+
+    def put(self, original: str, pseudonym: str) -> None:
+        """단일 매핑을 저장합니다."""
+        self.put_many({original: pseudonym})
+
+    def put_many(self, mapping: Dict[str, str]) -> None:
+        """여러 매핑을 한 트랜잭션으로 저장합니다."""
+        if not mapping:
+            return
+        rows = []
+        for original, pseudonym in mapping.items():
+            self._remember(original, pseudonym)
+            rows.append((self.key_fingerprint, self.namespace, self._lookup(original), self._seal(pseudonym)))
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pseudonyms (key_fingerprint, namespace, lookup, value) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        """SQLite 연결을 닫습니다."""
+        self._conn.close()
+
+
+def get_pseudonym_cache(alphabet_type="alphanumeric") -> Optional[PseudonymCache]:
+    """.env 설정으로 PseudonymCache를 생성합니다. FF3_CACHE_PATH 미설정 시 None."""
+    load_dotenv()
+    cache_path = os.getenv("FF3_CACHE_PATH")
+    if not cache_path:
+        log_debug("[get_pseudonym_cache] FF3_CACHE_PATH 미설정: 캐시 사용 안 함")
+        return None
+    # get_cipher와 같은 고정된 키 사용 (실행 중 FF3_KEY만 바뀐 경우 캐시를 새 키로 폐기/기록하지 않도록)
+    KEY, TWEAK, ALPHABET = get_active_settings(alphabet_type)
+    log_debug(f"[get_pseudonym_cache] alphabet_type = {alphabet_type}, path = {cache_path}")
+    return PseudonymCache(cache_path, KEY, TWEAK, ALPHABET)
@@ -0,0 +1,139 @@
+"""
+파일명: src/deidentifier/deid_plan.py
+목적: deidentification.yml의 targets 설정을 한 번 검증·컴파일한 비식별화 실행 계획(DeidPlan)
+기능:
+  - 타겟마다 정책 문자열을 검증하고 컬럼 처리 핸들러(모듈 수준 함수)로 미리 결정
+  - regular_expression은 한 번만 컴파일 (잘못된 정규식은 계획 생성 시 ValueError)
+  - pickle 가능: 워커 프로세스에 계획을 그대로 전달 (암호화 객체/캐시는 실행 시 인자로 받음)
+  - serial_number 타겟 분리(split_serial): 병렬 처리 시 부모에서 순차 적용할 규칙만 따로 추출
+주의사항:
+  - 지원하지 않는 정책은 계획 생성 시 한 번만 경고하고 제외합니다 (deidentify_columns의 기존 동작과 동일)
+"""
+
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from common.logger import log_debug
+from deidentifier.deid_utils import pseudonymize_age, pseudonymize_date, pseudonymize_ids, serialize_id
+
+
+class DeidContext(NamedTuple):
+    """실행 시 핸들러에 전달되는 암호화 객체와 가명 캐시 (alphabet 종류별)"""
+    ciphers: Dict[str, Any]
+    caches: Dict[str, Any]
+
+
+def _apply_fpe(values: pd.Series, rule: "DeidRule", context: DeidContext) -> pd.Series:
+    return pseudonymize_ids(values, context.ciphers[rule.alphabet], context.caches.get(rule.alphabet))
+
+
+def _apply_date(values: pd.Series, rule: "DeidRule", context: DeidContext) -> pd.Series:
+    return values.apply(lambda x: pseudonymize_date(x, rule.policy))
+
+
+def _apply_age(values: pd.Series, rule: "DeidRule", context: DeidContext) -> pd.Series:
+    return values.apply(lambda x: pseudonymize_age(x, rule.policy))
+
+
+def _apply_serial(values: pd.Series, rule: "DeidRule", context: DeidContext) -> pd.Series:
+    return values.apply(lambda x: serialize_id(x) if pd.notnull(x) else x)
+
+
+def _apply_masking(values: pd.Series, rule: "DeidRule", context: DeidContext) -> pd.Series:
+    return values.where(values.isna(), rule.anonymization_value)
+
+
+# (deidentification_policy, 세부 정책) → (핸들러, FPE alphabet)
+_HANDLERS: Dict[Tuple[str, str], Tuple[Callable, Optional[str]]] = {
+    ("pseudonymization", "fpe_numeric"): (_apply_fpe, "numeric"),
+    ("pseudonymization", "fpe_alphanumeric"): (_apply_fpe, "alphanumeric"),
+    ("pseudonymization", "year_to_january_first"): (_apply_date, None),
+    ("pseudonymization", "month_to_first_day"): (_apply_date, None),
+    ("pseudonymization", "age_to_5year_group"): (_apply_age, None),
+    ("pseudonymization", "age_to_10year_group"): (_apply_age, None),
+    ("anonymization", "serial_number"): (_apply_serial, None),
+    ("anonymization", "masking"): (_apply_masking, None),
+}
+
+
+class DeidRule(NamedTuple):
+    key: str
+    policy: str                      # 세부 정책 (예: fpe_numeric, masking)
+    handler: Callable                # (values, rule, context) → 비식별화된 values
+    alphabet: Optional[str]          # FPE 타겟의 alphabet 종류
+    anonymization_value: str
+    pattern: Optional["re.Pattern"]  # 보고서 텍스트용 정규식 (없으면 None)
+
+    @property
+    def is_serial(self) -> bool:
+        return self.handler is _apply_serial
+
+
+class DeidPlan:
+    """targets 설정을 검증하여 만든 컬럼 비식별화 실행 계획.
+
+    매개변수:
+        rules (List[DeidRule]): targets 순서대로의 규칙 (보통 from_targets로 생성)
+
+    사용예시:
+        >>> plan = DeidPlan.from_targets(config["targets"])
+        >>> df = deidentify_columns(df, plan, cipher_alphanumeric, cipher_numeric)
+    """
+
+    def __init__(self, rules: List[DeidRule]):
+        self.rules = rules
+
+    @classmethod
+    def from_targets(cls, targets: Dict[str, dict]) -> "DeidPlan":
+        rules = []
+        for key, conf in (targets or {}).items():
+            conf = conf or {}
+            policy = conf.get("deidentification_policy", "no_apply")
+            if policy == "no_apply":
+                continue
+            if policy == "pseudonymization":
+                detail = conf.get("pseudonymization_policy", "")
+            elif policy == "anonymization":
+                detail = conf.get("anonymization_policy", "")
+            else:
+                log_debug(f"[DeidPlan] 지원하지 않는 정책: {policy} (키: {key}). 제외합니다.")
+                continue
+            if (policy, detail) not in _HANDLERS:
+                log_debug(f"[DeidPlan] 경고: 지원하지 않는 {policy} 세부 정책 '{detail}' (키: '{key}'). 제외합니다.")
+                continue
+
+            regex = conf.get("regular_expression")
+            try:
+                pattern = re.compile(regex) if regex else None
+            except re.error as e:
+                raise ValueError(f"[DeidPlan] '{key}' 정규식 오류: {e} (regex={regex})") from e
+
+            handler, alphabet = _HANDLERS[(policy, detail)]
+            rules.append(DeidRule(key, detail, handler, alphabet, conf.get("anonymization_value", ""), pattern))
+        log_debug(f"[DeidPlan] 계획 생성: 타겟 {len(targets or {})}개 중 {len(rules)}개 적용 - {[rule.key for rule in rules]}")
+        return cls(rules)
+
+    def split_serial(self) -> Tuple["DeidPlan", "DeidPlan"]:
+        """(워커에서 처리할 계획, 부모에서 순차 처리할 serial_number 계획)으로 나눕니다."""
+        return (DeidPlan([rule for rule in self.rules if not rule.is_serial]),
+                DeidPlan([rule for rule in self.rules if rule.is_serial]))
+
+    def apply(self, df: pd.DataFrame, context: DeidContext) -> pd.DataFrame:
+        """계획의 규칙을 순서대로 df 컬럼에 적용합니다. extracted_{key} 컬럼이 있으면 우선 사용."""
+        for rule in self.rules:
+            extracted_key = f"extracted_{rule.key}"
+            if extracted_key in df.columns:
+                column = extracted_key
+            elif rule.key in df.columns:
+                column = rule.key
+            else:
+                log_debug(f"[deidentify_columns] 컬럼 '{rule.key}' 또는 '{extracted_key}'가 DataFrame에 존재하지 않음. 건너뜀.")
+                continue
+            df[column] = rule.handler(df[column], rule, context)
+            log_debug(f"[deidentify_columns] 컬럼 '{column}''{rule.policy}' → 1st result: {df[column].iloc[0] if len(df) > 0 else 'N/A'}")
+        return df
+
+    def __len__(self) -> int:
+        return len(self.rules)
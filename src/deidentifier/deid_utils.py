@@ -6,6 +6,7 @@ Purpose:
 
 Functions:
     - pseudonymize_id: FF3 형태보존암호화를 통한 ID 가명화
+    - pseudonymize_ids: 컬럼 단위 일괄 ID 가명화 (고유값만 암호화)
     - pseudonymize_date: 날짜 정보 가명화 (연도/월 단위)
     - deidentify_columns: DataFrame 컬럼 레벨 비식별화
     - process_text_pattern_in_column: 정규식 기반 텍스트 패턴 비식별화
@@ -35,7 +36,8 @@ Example:
 # 표준 라이브러리
 import os
 import re
-from typing import Any, Union
+from collections import Counter
+from typing import Any, Pattern, Union
 
 # 서드파티 라이브러리
 import chardet
@@ -97,7 +99,57 @@ def pseudonymize_id(id_value: Union[str, int], cipher: Any) -> str:
     else:
         id_padded = id_str.zfill(8)
         return cipher.encrypt(id_padded)
-    
+
+def pseudonymize_ids(id_values: pd.Series, cipher: Any, cache: Any = None) -> pd.Series:
+    """ID 컬럼 전체를 FF3(형태보존암호화) 알고리즘으로 일괄 가명화합니다.
+
+    컬럼의 고유값만 추려 각각 한 번씩 pseudonymize_id로 암호화한 뒤,
+    pandas 벡터 연산(take)으로 원래 행 위치에 되돌려 배치합니다.
+    동일한 환자번호가 여러 행에 반복되는 추출본에서 암호화 호출 수가
+    행 수가 아닌 고유값 수로 줄어듭니다.
+
+    매개변수:
+        id_values (pd.Series): 가명화할 원본 ID 컬럼
+        cipher: get_cipher() 함수로 생성된 FF3 암호화 객체
+        cache: get_pseudonym_cache()로 생성된 PseudonymCache (선택). 지정 시
+            캐시에 없는 고유값만 암호화하고 새 결과를 캐시에 기록
+
+    반환값:
+        pd.Series: 원본과 같은 인덱스를 갖는 가명화된 ID 컬럼 (object dtype)
+
+    사용예시:
+        >>> cipher = get_cipher(alphabet_type="numeric")
+        >>> pseudonymize_ids(pd.Series(["12345", "12345", 678]), cipher)
+        0    84729361
+        1    84729361
+        2    20938471
+        dtype: object
+
+    주의사항:
+        - 각 고유값은 pseudonymize_id로 처리되므로 하이픈 위치 보존 및
+          8자리 0-패딩 규칙이 행 단위 처리와 완전히 동일합니다
+        - 결측값도 하나의 고유값으로 취급되어 pseudonymize_id와 같은 결과(또는 예외)를 냅니다
+    """
+    if id_values.empty:
+        return id_values.astype(object)
+
+    codes, uniques = pd.factorize(id_values, use_na_sentinel=False)
+    keys = [str(value) for value in uniques]
+    cached = cache.get_many(keys) if cache is not None else {}
+    encrypted = {}
+    pseudo_values = []
+    for value, key in zip(uniques, keys):
+        pseudo_id = cached.get(key) or encrypted.get(key)
+        if pseudo_id is None:
+            pseudo_id = pseudonymize_id(value, cipher)
+            encrypted[key] = pseudo_id
+        pseudo_values.append(pseudo_id)
+    if cache is not None:
+        cache.put_many(encrypted)
+    pseudo_uniques = pd.Index(pseudo_values, dtype=object)
+    log_debug(f"[pseudonymize_ids] {len(id_values)}행 중 고유값 {len(uniques)}개, 캐시 적중 {len(cached)}개, 암호화 {len(encrypted)}개")
+    return pd.Series(pseudo_uniques.take(codes), index=id_values.index, name=id_values.name, dtype=object)
+
 def pseudonymize_date(date_value: Union[str, Any], policy: str) -> str:
     # date_value가 Timestamp일 경우 문자열로 변환
     date_str = str(date_value)
@@ -148,13 +200,23 @@ def serialize_id(id_value: Union[str, int]) -> str:
 #############################
 # replace 계열 함수들
 #############################
-def replace_with_pseudonymized_id(text: str, regex: str, cipher: Any) -> str:
+# 행마다 로그를 남기지 않고 치환 건수만 세어 두었다가 배치(타겟/파일) 단위로 요약 로그를 남김
+replacement_counts: Counter = Counter()
+
+def flush_replacement_counts(context: str) -> None:
+    """누적된 replace_with_* 치환 건수를 한 줄로 기록하고 초기화합니다. (context 예: "[deidentify_report_column] 'patient_id'")"""
+    if replacement_counts:
+        log_debug("%s 치환 건수: %s", context, dict(replacement_counts))
+        replacement_counts.clear()
+
+def replace_with_pseudonymized_id(text: str, regex: Union[str, Pattern], cipher: Any, cache: Any = None) -> str:
     """텍스트에서 ID 패턴을 찾아 가명화하여 대체하는 함수
 
     매개변수:
         text (str): 처리할 텍스트
-        regex (str): ID를 찾기 위한 정규식
+        regex (str | Pattern): ID를 찾기 위한 정규식 (컴파일된 패턴도 가능)
         cipher: get_cipher() 함수로 생성된 FF3 암호화 객체
+        cache: PseudonymCache (선택). 지정 시 암호화 전에 캐시를 먼저 조회
 
     반환값:
         str: ID가 가명화로 대체된 텍스트
@@ -162,17 +224,21 @@ def replace_with_pseudonymized_id(text: str, regex: str, cipher: Any) -> str:
     matches = re.findall(regex, text)
     if not matches:
         return text
-    pseudo_id = pseudonymize_id(matches[0], cipher)
+    pseudo_id = cache.get(str(matches[0])) if cache is not None else None
+    if pseudo_id is None:
+        pseudo_id = pseudonymize_id(matches[0], cipher)
+        if cache is not None:
+            cache.put(str(matches[0]), pseudo_id)
     text = text.replace(matches[0], pseudo_id)
-    log_debug(f"[replace_id] with {regex} → {pseudo_id}")
+    replacement_counts["replace_id"] += 1
     return text    
   
-def replace_with_pseudonymized_date(text: str, regex: str, policy: str) -> str:
+def replace_with_pseudonymized_date(text: str, regex: Union[str, Pattern], policy: str) -> str:
     """텍스트에서 날짜 패턴을 찾아 가명화하는 함수.
     
     매개변수:
         text (str): 처리할 텍스트
-        regex (str): 날짜를 찾기 위한 정규식
+        regex (str | Pattern): 날짜를 찾기 위한 정규식
         policy (str): 가명화 정책 ('year_to_january_first', 'month_to_first_day')
     
     반환값:
@@ -183,15 +249,15 @@ def replace_with_pseudonymized_date(text: str, regex: str, policy: str) -> str:
         return text
     pseudo_date = pseudonymize_date(matches[0], policy)
     text = text.replace(matches[0], pseudo_date)
-    log_debug(f"[replace_date] with {regex} → {pseudo_date}")
+    replacement_counts["replace_date"] += 1
     return text
 
-def replace_with_pseudonymized_age(text: str, regex: str, policy: str) -> str:
+def replace_with_pseudonymized_age(text: str, regex: Union[str, Pattern], policy: str) -> str:
     """텍스트에서 나이 패턴을 찾아 가명화하는 함수.
 
     매개변수:
         text (str): 처리할 텍스트
-        regex (str): 나이를 찾기 위한 정규식
+        regex (str | Pattern): 나이를 찾기 위한 정규식
         policy (str): 가명화 정책 ('age_to_5year_group', 'age_to_10year_group')
 
     반환값:
@@ -202,15 +268,15 @@ def replace_with_pseudonymized_age(text: str, regex: str, policy: str) -> str:
         return text
     pseudo_age = pseudonymize_age(matches[0], policy)
     text = text.replace(matches[0], pseudo_age)
-    log_debug(f"[replace_age] with {regex} → {pseudo_age}")
+    replacement_counts["replace_age"] += 1
     return text
 
-def replace_with_serialized_id(text: str, regex: str) -> str:
+def replace_with_serialized_id(text: str, regex: Union[str, Pattern]) -> str:
     """텍스트에서 ID 패턴을 찾아 일련번호로 대체하는 함수.
     
     매개변수:
         text (str): 처리할 텍스트
-        regex (str): ID를 찾기 위한 정규식 패턴
+        regex (str | Pattern): ID를 찾기 위한 정규식 패턴
 
     반환값:
         str: ID가 일련번호로 대체된 텍스트
@@ -221,15 +287,15 @@ def replace_with_serialized_id(text: str, regex: str) -> str:
     
     serialized_id = serialize_id(matches[0])
     result = text.replace(matches[0], serialized_id)
-    log_debug(f"[replace_serialized_id] with {regex} → {serialized_id}")
+    replacement_counts["replace_serialized_id"] += 1
     return result
 
-def replace_with_masked_id(text: str, regex: str, anonymization_value: str) -> str:
+def replace_with_masked_id(text: str, regex: Union[str, Pattern], anonymization_value: str) -> str:
     """텍스트에서 ID 패턴을 찾아 마스킹 값으로 대체하는 함수.
     
     매개변수:
         text (str): 처리할 텍스트
-        regex (str): ID를 찾기 위한 정규식 패턴 (named group 포함)
+        regex (str | Pattern): ID를 찾기 위한 정규식 패턴 (named group 포함)
         anonymization_value (str): 대체할 마스킹 값
 
     반환값:
@@ -244,8 +310,8 @@ def replace_with_masked_id(text: str, regex: str, anonymization_value: str) -> s
                 result = result.replace(group_value, anonymization_value)
         return result
     
-    result = re.sub(regex, replace_func, text)
-    log_debug(f"[replace_with_masked_id] with {regex} → {anonymization_value}")
+    result, count = re.subn(regex, replace_func, text)
+    replacement_counts["replace_with_masked_id"] += count
     return result
 
 
@@ -316,19 +382,20 @@ def extract_targets(df, report_column, target_key, target_conf):
         df.loc[~mask, report_column] = df.loc[~mask, report_column].str.replace(regex, '', regex=True, flags=re.M)
         # 디버깅 로그
         log_debug(f"[extract_targets] specimen '육' 포함 mask: {mask.value_counts().to_dict()}")
-        log_debug(f"[extract_targets] specimen '육' 포함 행:\n{df.loc[mask, new_column_name]}")
+        log_debug(lambda: f"[extract_targets] specimen '육' 포함 행:\n{df.loc[mask, new_column_name]}")
 
     else:
         df[report_column] = df[report_column].str.replace(regex, '', regex=True, flags=re.M)
 
     ###로그 출력 (치환 후 데이터 기준)
     print("\n")  # 단순 줄바꿈 출력
-    log_debug(
+    # 컬럼 전체를 문자열로 만드는 비용이 크므로 DEBUG가 켜져 있을 때만 생성
+    log_debug(lambda: (
        f"[extract_targets] {target_key} 추출: "
        f"{len(df[report_column])}행, {len(extracted_all)}회\n"
        f"정규식 {regex}\n"
        f"각보고서 첫번째 추출결과:{df[new_column_name].to_string()}"
-    )
+    ))
     # with pd.option_context('display.max_colwidth', None):
     #     log_debug(f"[extract_targets] '{target_key}' 삭제 후 전문:\n{df[report_column].head(2).to_string()}")
     print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
@@ -336,37 +403,71 @@ def extract_targets(df, report_column, target_key, target_conf):
 
     return df
 
-def validation_extraction(df, report_column, existing_column_mapping):
+MISMATCH_SAMPLE_SIZE = 10  # 로그에 남길 불일치 행 index 수 (전체 목록은 불일치 리포트 파일에 기록)
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """결측값은 빈 문자열로, 나머지는 문자열로 변환 (벡터 연산)"""
+    return values.astype(object).where(values.notna(), "").astype(str)
+
+
+def _to_ymd(values: pd.Series, date_format: str) -> pd.Series:
+    """날짜 값을 yyyy-mm-dd 문자열로 변환 (한 번의 pd.to_datetime 호출). 변환할 수 없는 값은 문자열 그대로."""
+    parsed = pd.to_datetime(values, errors="coerce", format=date_format)
+    return parsed.dt.strftime("%Y-%m-%d").where(parsed.notna(), _as_text(values))
+
+
+def _write_mismatch_report(mismatch_frames: list, report_path: str) -> None:
+    """불일치 행을 (check, row, expected, extracted) 형식으로 저장합니다. 확장자 .parquet이면 Parquet, 그 외 CSV."""
+    report = pd.concat(mismatch_frames, ignore_index=True)
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    if report_path.endswith(".parquet"):
+        report.to_parquet(report_path, index=False)
+    else:
+        report.to_csv(report_path, index=False, encoding="utf-8-sig")
+    log_debug(f"[validation_extraction] 불일치 리포트 저장: {report_path} ({len(report)}행)")
+
+
+def validation_extraction(df, report_column, existing_column_mapping, mismatch_report_path=None,
+                          date_format="ISO8601"):
     """
     모든 텍스트 추출이 완료된 후, report_column에 줄바꿈(\n, \r, \r\n) 이외의 문자가 남아있는지 검사.
     남아있으면 경고 메시지, 모두 줄바꿈만 남았으면 성공 메시지 출력 및 컬럼 삭제.
     추가: existing_column_mapping에 존재하는 컬럼들과 extracted_ 접두사 컬럼의 값을 비교.
     - patient_id는 8자리 제로패딩 후 비교
-    - 날짜형식 컬럼은 yyyy-mm-dd로 변환 후 비교
+    - 날짜형식 컬럼은 yyyy-mm-dd로 변환 후 비교 (date_format으로 한 번에 변환, 변환 불가 값은 문자열 그대로 비교)
     - 모든 값이 일치하면 extracted_ 컬럼 삭제
     - report_column은 비교하지 않고, 줄바꿈만 남으면 삭제
+    - 모든 검사는 컬럼 단위 벡터 연산으로 수행
+    - mismatch_report_path 지정 시 남은 전문/불일치 행을 파일(.parquet 또는 .csv)로 저장하고, 로그에는 건수와 일부 index만 남김
     """
 
-    df['extracted_specimen'] = df['extracted_specimen'].replace(to_replace=r'.*육.*', value='', regex=True)
-    print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
-    log_debug("[validation_extraction] specimen에 '육'이 포함되어 공백으로 대체합니다. (오류정정)")
+    if 'extracted_specimen' in df.columns:
+        df['extracted_specimen'] = df['extracted_specimen'].replace(to_replace=r'.*육.*', value='', regex=True)
+        print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
+        log_debug("[validation_extraction] specimen에 '육'이 포함되어 공백으로 대체합니다. (오류정정)")
 
-    df['extracted_gross_findings'] = df['extracted_gross_findings'].replace(to_replace=r'\[[가-힣]+\]', value='', regex=True)
-    print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
-    log_debug("[validation_extraction] gross_findings에 '[병리의사명]' 패턴이 포함되어 공백으로 대체합니다. (오류정정)")
+    if 'extracted_gross_findings' in df.columns:
+        df['extracted_gross_findings'] = df['extracted_gross_findings'].replace(to_replace=r'\[[가-힣]+\]', value='', regex=True)
+        print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
+        log_debug("[validation_extraction] gross_findings에 '[병리의사명]' 패턴이 포함되어 공백으로 대체합니다. (오류정정)")
 
+    mismatch_frames = []
 
     # 1. report_column: 줄바꿈만 남았는지 검사
-    only_newline = df[report_column].fillna("").apply(
-        lambda x: re.sub(r'[\r\n]', '', x).strip() == ""
-    )
+    remaining = _as_text(df[report_column]).str.replace(r'[\r\n]', '', regex=True).str.strip()
+    only_newline = remaining.eq("")
     if only_newline.all():
         print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
         log_debug("[validation_extraction] 모든 타겟들을 리포트 컬럼에서 삭제 후 줄바꿈만 남았습니다. 리포트 컬럼을 삭제합니다. (정상)")
         df.drop(columns=[report_column], inplace=True)
     else:
-        remain_idx = only_newline[~only_newline].index.tolist()
-        log_debug(f"[validation_extraction][경고] 모든 타겟들을 리포트 컬럼에서 삭제 후 줄바꿈 이외의 문자가 남아있는 행이 {len(remain_idx)}개 있습니다. index: {remain_idx} (비정상)")
+        remain_idx = df.index[~only_newline]
+        log_debug(f"[validation_extraction][경고] 모든 타겟들을 리포트 컬럼에서 삭제 후 줄바꿈 이외의 문자가 남아있는 행이 {len(remain_idx)}개 있습니다. "
+                  f"index(앞 {MISMATCH_SAMPLE_SIZE}개): {remain_idx[:MISMATCH_SAMPLE_SIZE].tolist()} (비정상)")
+        mismatch_frames.append(pd.DataFrame({
+            "check": report_column, "row": remain_idx, "expected": "", "extracted": remaining[~only_newline].to_numpy(),
+        }))
 
     # 2. existing_column_mapping 컬럼과 extracted_ 컬럼 비교 (report_column은 비교하지 않음)
     for logical_col, physical_col in existing_column_mapping.items():
@@ -374,25 +475,25 @@ def validation_extraction(df, report_column, existing_column_mapping):
         if extracted_col in df.columns and physical_col in df.columns:
             # patient_id: 8자리 제로패딩
             if 'patient_id' in logical_col:
-                left = df[physical_col].fillna("").apply(lambda x: str(x).zfill(8))
-                right = df[extracted_col].fillna("").apply(lambda x: str(x).zfill(8))
+                left = _as_text(df[physical_col]).str.zfill(8)
+                right = _as_text(df[extracted_col]).str.zfill(8)
             # 날짜형식: yyyy-mm-dd 변환
             elif any(key in logical_col for key in ['date', '날짜']):
-                def to_ymd(val):
-                    try:
-                        return pd.to_datetime(val).strftime('%Y-%m-%d')
-                    except Exception:
-                        return str(val)
-                left = df[physical_col].fillna("").apply(to_ymd)
-                right = df[extracted_col].fillna("").apply(to_ymd)
+                left = _to_ymd(df[physical_col], date_format)
+                right = _to_ymd(df[extracted_col], date_format)
             else:
-                left = df[physical_col].fillna("").astype(str).str.strip()
-                right = df[extracted_col].fillna("").astype(str).str.strip()
+                left = _as_text(df[physical_col]).str.strip()
+                right = _as_text(df[extracted_col]).str.strip()
             # 비교
-            mismatch = ~(left == right)
+            mismatch = left.ne(right)
             if mismatch.any():
-                mismatch_idx = mismatch[mismatch].index.tolist()
-                log_debug(f"[validation_extraction][불일치] {physical_col} vs {extracted_col} 불일치 행: {mismatch_idx}")
+                mismatch_idx = df.index[mismatch]
+                log_debug(f"[validation_extraction][불일치] {physical_col} vs {extracted_col} 불일치 {len(mismatch_idx)}행, "
+                          f"index(앞 {MISMATCH_SAMPLE_SIZE}개): {mismatch_idx[:MISMATCH_SAMPLE_SIZE].tolist()}")
+                mismatch_frames.append(pd.DataFrame({
+                    "check": f"{physical_col} vs {extracted_col}", "row": mismatch_idx,
+                    "expected": left[mismatch].to_numpy(), "extracted": right[mismatch].to_numpy(),
+                }))
             else:
                 print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
                 log_debug(f"[validation_extraction] {physical_col} vs {extracted_col} 모든 값이 일치합니다. extracted_ 컬럼을 삭제합니다. (정상)")
@@ -401,116 +502,85 @@ def validation_extraction(df, report_column, existing_column_mapping):
             print("\n*****************************************************************************************************************")  # 단순 줄바꿈 출력
             log_debug(f"[validation_extraction][INFO] {physical_col} 또는 {extracted_col} 컬럼이 존재하지 않아 비교를 건너뜁니다.")
 
+    if mismatch_report_path and mismatch_frames:
+        _write_mismatch_report(mismatch_frames, str(mismatch_report_path))
+
     return df
 
 
 ##############################
 # 래핑함수
 ##############################
-def deidentify_columns(df: pd.DataFrame, targets: dict, cipher_alphanumeric: Any, cipher_numeric: Any) -> pd.DataFrame:
+def deidentify_columns(df: pd.DataFrame, targets: Any, cipher_alphanumeric: Any, cipher_numeric: Any,
+                       cache_alphanumeric: Any = None, cache_numeric: Any = None) -> pd.DataFrame:
     """
     데이터프레임의 개별 컬럼들을 비식별화하는 함수
+    targets: DeidPlan(권장, 한 번 만들어 재사용) 또는 deidentification.yml의 targets 딕셔너리(호출마다 계획 생성)
+    cache_alphanumeric/cache_numeric이 주어지면 FF3 가명화 전에 PseudonymCache를 조회
     """
-    target_keys = list(targets.keys())
-    log_debug(f"[deidentify_columns] 처리할 타겟: {len(target_keys)}개 - {target_keys}")
-    
-    for key in target_keys:
-        extracted_key = f"extracted_{key}"
-        if extracted_key in df.columns:
-            col_to_use = extracted_key
-        elif key in df.columns:
-            col_to_use = key
-        else:
-            log_debug(f"[deidentify_columns] 컬럼 '{key}' 또는 '{extracted_key}'가 DataFrame에 존재하지 않음. 건너뜀.")
-            continue
-        policy = targets[key].get("deidentification_policy", "no_apply")
-        if policy == "pseudonymization":
-            pseudo_policy = targets[key].get("pseudonymization_policy", "")
-            if pseudo_policy == "fpe_numeric":
-                df[col_to_use] = df[col_to_use].apply(lambda x: pseudonymize_id(x, cipher_numeric))
-                log_debug(f"[deidentify_columns] 컬럼 '{col_to_use}''{ pseudo_policy }' → 1st result: {df[col_to_use].iloc[0] if len(df) > 0 else 'N/A'}")
-            elif pseudo_policy == "fpe_alphanumeric":
-                df[col_to_use] = df[col_to_use].apply(lambda x: pseudonymize_id(x, cipher_alphanumeric))
-                log_debug(f"[deidentify_columns] 컬럼 '{col_to_use}''{ pseudo_policy }' → 1st result: {df[col_to_use].iloc[0] if len(df) > 0 else 'N/A'}")
-            elif pseudo_policy in ("year_to_january_first", "month_to_first_day"):
-                df[col_to_use] = df[col_to_use].apply(lambda x: pseudonymize_date(x, pseudo_policy))
-                log_debug(f"[deidentify_columns] 컬럼 '{col_to_use}''{ pseudo_policy }' → 1st result: {df[col_to_use].iloc[0] if len(df) > 0 else 'N/A'}")    
-            elif pseudo_policy in ("age_to_5year_group", "age_to_10year_group"):
-                df[col_to_use] = df[col_to_use].apply(lambda x: pseudonymize_age(x, pseudo_policy))
-                log_debug(f"[deidentify_columns] 컬럼 '{col_to_use}''{ pseudo_policy }' → 1st result: {df[col_to_use].iloc[0] if len(df) > 0 else 'N/A'}")    
-            else:
-                log_debug(f"[deidentify_columns] 경고: 지원하지 않는 pseudonymization_policy '{pseudo_policy}' (컬럼: '{col_to_use}'). 처리를 건너뜁니다.")
-
-        elif policy == "anonymization":
-            anonymization_policy = targets[key].get("anonymization_policy", "")
-            anonymization_value = targets[key].get("anonymization_value", "")
-            if anonymization_policy == "serial_number":
-                df[col_to_use] = df[col_to_use].apply(lambda x: serialize_id(x) if pd.notnull(x) else x)
-                log_debug(f"[deidentify_columns] 컬럼 '{col_to_use}''{ anonymization_policy }' → 1st result: {df[col_to_use].iloc[0] if len(df) > 0 else 'N/A'}")
-            elif anonymization_policy == "masking":
-                df[col_to_use] = df[col_to_use].apply(lambda x: anonymization_value if pd.notnull(x) else x)
-                log_debug(f"[deidentify_columns] 컬럼 '{col_to_use}''{ anonymization_policy }' → 1st result: {df[col_to_use].iloc[0] if len(df) > 0 else 'N/A'}")
-            else:
-                log_debug(f"[deidentify_columns] 경고: 지원하지 않는 anonymization_policy '{anonymization_policy}' (컬럼: '{col_to_use}'). 처리를 건너뜁니다.")
-        elif policy == "no_apply":
-            pass
-        else:
-            log_debug(f"[deidentify_columns] 지원하지 않는 정책: {policy} (컬럼: {col_to_use})")
+    # deid_plan이 이 모듈의 가명화 함수를 사용하므로 순환 import를 피해 함수 내부에서 import
+    from deidentifier.deid_plan import DeidContext, DeidPlan
+
+    plan = targets if isinstance(targets, DeidPlan) else DeidPlan.from_targets(targets)
+    log_debug(f"[deidentify_columns] 처리할 타겟: {len(plan)}개 - {[rule.key for rule in plan.rules]}")
+    context = DeidContext(
+        ciphers={"alphanumeric": cipher_alphanumeric, "numeric": cipher_numeric},
+        caches={"alphanumeric": cache_alphanumeric, "numeric": cache_numeric},
+    )
+    return plan.apply(df, context)
+
 
+def extract_target_to_column(df: pd.DataFrame, report_column: str, target_key: str, regex: Union[str, Pattern]) -> pd.DataFrame:
+    """비식별화된 리포트 텍스트에서 타겟의 첫 매치 값을 extracted_{target_key} 컬럼으로 기록합니다. (텍스트는 그대로)"""
+    # report_scanner가 이 모듈의 replace_with_* 함수를 사용하므로 순환 import를 피해 함수 내부에서 import
+    from deidentifier.report_scanner import first_match
 
+    pattern = re.compile(regex) if isinstance(regex, str) else regex
+    df[f"extracted_{target_key}"] = df[report_column].map(lambda x: first_match(pattern, x))
     return df
 
 
 #################################################
 # 불용처리함수- 로직이 수정되어 더이상 사용하지 않음
 #################################################
-def deidentify_report_column(df: pd.DataFrame, report_column: str, targets: dict, cipher_alphanumeric: Any, cipher_numeric: Any) -> pd.DataFrame:
+def deidentify_report_column(df: pd.DataFrame, report_column: str, targets: Any, cipher_alphanumeric: Any, cipher_numeric: Any,
+                             cache_alphanumeric: Any = None, cache_numeric: Any = None,
+                             engine: str = "sequential") -> pd.DataFrame:
     """
     리포트 텍스트 컬럼 내부의 개인정보를 비식별화하는 함수
-    targets 딕셔너리에서 키들을 자동으로 추출하여 처리
+    targets: DeidPlan 또는 targets 딕셔너리 (딕셔너리면 DeidPlan으로 변환하며, 규칙의 컴파일된 정규식을 사용)
+    engine:
+      - "sequential": 타겟마다 Series.apply로 컬럼 전체를 순회 (기존 방식)
+      - "compiled": 보고서마다 한 번 순회하며 모든 타겟을 순서대로 적용 (CompiledReportScanner)
+    두 엔진은 같은 타겟별 단계(치환 후 값 타겟은 extracted_{key} 기록)를 같은 순서로 적용하므로 결과가 같습니다.
+    페이지 머릿글/바닥글은 구조화 단계의 non_targets에서 삭제합니다.
     """
-    target_keys = list(targets.keys())
-    log_debug(f"[deidentify_report_column] 처리할 패턴: {len(target_keys)}개 - {target_keys}")
-    
-    for key in target_keys:
-        policy = targets[key].get("deidentification_policy", "no_apply")
-        if policy == "pseudonymization":
-            pseudo_policy = targets[key].get("pseudonymization_policy", "")
-            if pseudo_policy == "fpe_numeric":
-                df[report_column] = df[report_column].apply(lambda x: replace_with_pseudonymized_id(x, targets[key]["regular_expression"], cipher_numeric))
-                df = extract_target_to_column(df, report_column, key, targets[key]["regular_expression"])
-            elif pseudo_policy == "fpe_alphanumeric":
-                df[report_column] = df[report_column].apply(lambda x: replace_with_pseudonymized_id(x, targets[key]["regular_expression"], cipher_alphanumeric))
-                df = extract_target_to_column(df, report_column, key, targets[key]["regular_expression"])
-            elif pseudo_policy in ("year_to_january_first", "month_to_first_day"):
-                df[report_column] = df[report_column].apply(lambda x: replace_with_pseudonymized_date(x, targets[key]["regular_expression"], pseudo_policy))
-                df = extract_target_to_column(df, report_column, key, targets[key]["regular_expression"])
-            elif pseudo_policy in ("age_to_5year_group", "age_to_10year_group"):
-                df[report_column] = df[report_column].apply(lambda x: replace_with_pseudonymized_age(x, targets[key]["regular_expression"], pseudo_policy))
-                df = extract_target_to_column(df, report_column, key, targets[key]["regular_expression"])
-            else:
-                log_debug(f"[deidentify_report_column] 경고: 지원하지 않는 pseudonymization_policy '{pseudo_policy}' (키: '{key}'). 처리를 건너뜁니다.")
-
-        elif policy == "anonymization":
-            anonymization_policy = targets[key].get("anonymization_policy", "")
-            anonymization_value = targets[key].get("anonymization_value", "")
-            if anonymization_policy == "serial_number":
-                if key not in df.columns:
-                    df[report_column] = df[report_column].apply(lambda x: replace_with_serialized_id(x, targets[key]["regular_expression"]))
-                    df = extract_target_to_column(df, report_column, key, targets[key]["regular_expression"])
-                else:  # key in df.columns
-                    df[report_column] = df[report_column].apply(lambda x: replace_with_masked_id(x, targets[key]["regular_expression"], anonymization_value) if pd.notnull(x) else x)
-            elif anonymization_policy == "masking":
-                df[report_column] = df[report_column].apply(lambda x: replace_with_masked_id(x, targets[key]["regular_expression"], anonymization_value) if pd.notnull(x) else x)
-            else:
-                log_debug(f"[deidentify_report_column] 경고: 지원하지 않는 anonymization_policy '{anonymization_policy}' (컬럼: '{key}'). 처리를 건너뜁니다.")
-        elif policy == "no_apply":
-            pass
-        else:
-            log_debug(f"[deidentify_report_column] 지원하지 않는 정책: {policy} (컬럼: {key})")
-
-    # 모든 개별 비식별화 작업 완료 후, 페이지 머릿글/바닥글 제거
-    df[report_column] = df[report_column].apply(lambda x: remove_page_headers_footers(x) if pd.notnull(x) else x)
-    log_debug(f"[deidentify_report_column] 페이지 머릿글/바닥글 제거 완료")
+    # deid_plan/report_scanner가 이 모듈의 가명화 함수를 사용하므로 순환 import를 피해 함수 내부에서 import
+    from deidentifier.report_scanner import CompiledReportScanner
+
+    if engine not in ("sequential", "compiled"):
+        raise ValueError(f"[deidentify_report_column] 지원하지 않는 engine: {engine}")
+    scanner = CompiledReportScanner(targets, cipher_alphanumeric, cipher_numeric,
+                                    cache_alphanumeric, cache_numeric, existing_columns=df.columns)
+    log_debug(f"[deidentify_report_column] 처리할 패턴: {len(scanner.steps)}개 - {[step.key for step in scanner.steps]} (engine={engine})")
+
+    if engine == "compiled":
+        texts, columns = [], {key: [] for key in scanner.extract_keys}
+        for text in df[report_column].tolist():
+            text, values = scanner.scan_with_values(text)
+            texts.append(text)
+            for key in scanner.extract_keys:
+                columns[key].append(values[key])
+        df[report_column] = pd.Series(texts, index=df.index, dtype=object)
+        for key in scanner.extract_keys:
+            df[f"extracted_{key}"] = pd.Series(columns[key], index=df.index, dtype=object)
+        flush_replacement_counts("[deidentify_report_column] compiled")
+        return df
+
+    for step in scanner.steps:
+        df[report_column] = df[report_column].apply(lambda x: step.replace(x) if isinstance(x, str) and x else x)
+        if step.extract:
+            df = extract_target_to_column(df, report_column, step.key, step.pattern)
+        flush_replacement_counts(f"[deidentify_report_column] '{step.key}'")
 
     return df
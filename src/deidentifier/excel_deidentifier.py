@@ -1,22 +1,26 @@
 """
 파일명: src/deindentifier/excel_deidentifier.py
 목적: Excel 컬럼 범용 비식별화 모듈
-사용법: python excel_deidentifier.py <excel_path> <yml_path> <output_path>
+사용법: python excel_deidentifier.py <excel_path> <yml_path> <output_path> [--workers N] [--chunk-rows N]
 변경이력:
   - 2025-10-10: 최초 구현 (BenKorea)
 """
 
 import warnings
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
 import typer
 
-from common.excel_io import save_excels
+from common.excel_io import ExcelStreamWriter, build_output_filename, iter_excel_chunks, read_excel_file, save_excels
 from common.get_cipher import get_cipher
+from common.pseudonym_cache import get_pseudonym_cache
 from common.logger import log_debug, log_error, log_info, log_warn
 from common.load_config import load_config
+from deidentifier.deid_plan import DeidPlan
 from deidentifier.deid_utils import deidentify_columns
+from deidentifier.parallel_deidentifier import deidentify_files_parallel
 
 # OLE2 경고 전역 무시
 warnings.filterwarnings("ignore", message=".*OLE2 inconsistency.*")
@@ -27,7 +31,9 @@ app = typer.Typer()
 def main(
     excel_path: Path = typer.Argument(..., help="엑셀 파일 또는 디렉토리"),
     yml_path: Path = typer.Argument(..., help="비식별화 정책 YAML 파일"),
-    output_path: Path = typer.Argument(..., help="출력 경로")
+    output_path: Path = typer.Argument(..., help="출력 경로"),
+    workers: int = typer.Option(1, "--workers", "-w", help="병렬 처리 프로세스 수 (1이면 단일 프로세스)"),
+    chunk_rows: Optional[int] = typer.Option(None, "--chunk-rows", help="행 청크 크기 (병렬: 청크 분배, 단일: 스트리밍 읽기/쓰기)")
 ):
     """Excel 파일을 YAML 설정에 따라 비식별화 처리합니다."""
     
@@ -36,53 +42,60 @@ def main(
         
         # 설정 로드
         config = load_config(str(yml_path), section="pet")
-        targets = config.get('targets', {})
+        # 정책 검증·정규식 컴파일은 한 번만 (파일/청크/워커마다 같은 계획을 재사용)
+        plan = DeidPlan.from_targets(config.get('targets', {}))
         # 암호화 객체 초기화
         cipher_alphanumeric = get_cipher("alphanumeric")
         cipher_numeric = get_cipher("numeric")
         log_debug("[try] 암호화 객체 초기화 완료")
         
-        # 엑셀 로드 (강력한 호환성)
-        dfs = {}
-        if excel_path.is_file():
-            # 단일 파일: 다중 엔진으로 강제 읽기
-            for engine in ['openpyxl', 'xlrd', 'calamine']:
-                try:
-                    df = pd.read_excel(excel_path, engine=engine)
-                    dfs[excel_path.name] = df
-                    log_info(f"[엑셀로드] {engine}로 성공: {excel_path.name}")
-                    break
-                except:
-                    continue
-        else:
-            # 디렉토리: 각 파일별로 다중 엔진 시도
-            for file in Path(excel_path).rglob("*.xls*"):
-                for engine in ['openpyxl', 'xlrd', 'calamine']:
-                    try:
-                        df = pd.read_excel(file, engine=engine)
-                        dfs[file.name] = df
-                        log_debug(f"[엑셀로드] {engine}로 성공: {file.name}")
-                        break
-                    except Exception as e:
-                        if engine == 'calamine':  # 마지막 엔진도 실패
-                            log_error(f"[엑셀로드] 모든 엔진 실패: {file.name}")
+        # 엑셀 파일 목록
+        excel_files = [excel_path] if excel_path.is_file() else sorted(Path(excel_path).rglob("*.xls*"))
 
-        if not dfs:
+        # 병렬 모드: 파일(또는 행 청크)을 프로세스 풀로 분배하고 완료 순서대로 저장
+        if workers > 1:
+            saved = deidentify_files_parallel(excel_files, plan, str(output_path), prefix="deid",
+                                              workers=workers, chunk_rows=chunk_rows)
+            if not saved:
+                log_error("[엑셀비식별화] 처리된 파일이 없습니다")
+                raise typer.Exit(1)
+            log_info(f"[excel_deidentifier] 완료 - 출력: {output_path}, 파일: {saved}개")
+            return
+
+        # 가명 캐시 (.env의 FF3_CACHE_PATH 설정 시에만 사용, 병렬 모드는 워커별로 생성)
+        cache_alphanumeric = get_pseudonym_cache("alphanumeric")
+        cache_numeric = get_pseudonym_cache("numeric")
+
+        # 단일 프로세스: 파일 하나씩 로드 → 비식별화 → 저장 (동시에 한 파일만 메모리에 유지)
+        # --chunk-rows 지정 시 행 청크 단위로 스트리밍하여 파일당 상수 메모리로 처리
+        output_path.mkdir(parents=True, exist_ok=True)
+        saved = 0
+        for file in excel_files:
+            try:
+                if chunk_rows:
+                    output_file = output_path / build_output_filename(file.name, prefix="deid")
+                    with ExcelStreamWriter(output_file) as writer:
+                        for chunk in iter_excel_chunks(file, chunk_rows):
+                            writer.append(deidentify_columns(chunk, plan, cipher_alphanumeric, cipher_numeric,
+                                                             cache_alphanumeric, cache_numeric))
+                else:
+                    df = deidentify_columns(read_excel_file(file), plan, cipher_alphanumeric, cipher_numeric,
+                                            cache_alphanumeric, cache_numeric)
+                    save_excels(str(output_path), {file.name: df}, prefix="deid")
+                saved += 1
+                log_debug(f"[엑셀비식별화] 처리 완료: {file.name}")
+            except Exception as e:
+                log_error(f"[엑셀비식별화] 실패: {file.name} - {e}")
+
+        for cache in (cache_alphanumeric, cache_numeric):
+            if cache is not None:
+                cache.close()
+
+        if not saved:
             log_error("[엑셀로드] 읽을 수 있는 파일이 없습니다")
             raise typer.Exit(1)
 
-        log_info(f"[엑셀로드] 로드 완료: {len(dfs)}개 파일")
-        
-        # 비식별화 처리
-        for filename, df in dfs.items():
-            dfs[filename] = deidentify_columns(df, targets, cipher_alphanumeric, cipher_numeric)
-            log_debug(f"[엑셀비식별화] 처리 완료: {filename}")
-        
-        # 결과 저장
-        output_path.mkdir(parents=True, exist_ok=True)
-        save_excels(str(output_path), dfs, prefix="deid")
-        
-        log_info(f"[excel_deidentifier] 완료 - 출력: {output_path}, 파일: {len(dfs)}개")
+        log_info(f"[excel_deidentifier] 완료 - 출력: {output_path}, 파일: {saved}개")
         
     except Exception as e:
         log_error(f"[excel_deidentifier] 실패: {e}")
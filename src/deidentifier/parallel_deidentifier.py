@@ -0,0 +1,119 @@
+"""
+파일명: src/deidentifier/parallel_deidentifier.py
+목적: 엑셀 디렉토리 비식별화의 다중 프로세스 병렬 처리
+기능:
+  - 파일 단위(xlsx 및 parquet/feather 중간산출물, 또는 대용량 파일은 행 청크 단위)로 작업을 프로세스 풀에 분배
+  - 각 워커는 초기화 시 DeidPlan(pickle로 전달)을 받고, get_cipher로 자체 FF3 암호화 객체(및 가명 캐시)를 생성
+  - 완료된 파일부터 즉시 저장 (as_completed)
+  - serial_number 익명화는 전역 일련번호 중복을 막기 위해 부모 프로세스에서 순차 적용
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from common.excel_io import read_frame_file, save_excels
+from common.get_cipher import get_cipher
+from common.logger import log_debug, log_error, log_info
+from common.pseudonym_cache import get_pseudonym_cache
+from deidentifier.deid_plan import DeidPlan
+from deidentifier.deid_utils import deidentify_columns
+
+# 워커 프로세스별 상태 (초기화 시 1회 생성)
+_worker = {}
+
+
+def _init_worker(plan: DeidPlan) -> None:
+    _worker["plan"] = plan
+    _worker["cipher_alphanumeric"] = get_cipher("alphanumeric")
+    _worker["cipher_numeric"] = get_cipher("numeric")
+    _worker["cache_alphanumeric"] = get_pseudonym_cache("alphanumeric")
+    _worker["cache_numeric"] = get_pseudonym_cache("numeric")
+    log_debug(f"[parallel_deidentifier] 워커 초기화 완료: 타겟 {len(plan)}개")
+
+
+def _deidentify(df: pd.DataFrame) -> pd.DataFrame:
+    return deidentify_columns(
+        df, _worker["plan"],
+        _worker["cipher_alphanumeric"], _worker["cipher_numeric"],
+        _worker["cache_alphanumeric"], _worker["cache_numeric"],
+    )
+
+
+def _deidentify_file_task(file: str) -> pd.DataFrame:
+    return _deidentify(read_frame_file(file))
+
+
+def _deidentify_chunk_task(df: pd.DataFrame) -> pd.DataFrame:
+    return _deidentify(df)
+
+
+def deidentify_files_parallel(files: List[Path], targets: Union[dict, DeidPlan], output_dir: str, prefix: Optional[str] = None,
+                              workers: int = 2, chunk_rows: Optional[int] = None) -> int:
+    """엑셀 파일 목록을 프로세스 풀로 비식별화하고 완료 순서대로 저장합니다.
+
+    매개변수:
+        files (List[Path]): 비식별화할 파일 목록 (xls/xlsx, parquet, feather)
+        targets (dict | DeidPlan): deidentification.yml의 targets 설정 또는 DeidPlan (워커에는 계획을 pickle로 전달)
+        output_dir (str): 결과 저장 디렉토리
+        prefix (Optional[str]): 저장 파일명 접두사 (예: "deid_")
+        workers (int): 프로세스 수
+        chunk_rows (Optional[int]): 지정 시 이 행 수보다 큰 파일은 행 청크로 나누어 분배
+
+    반환값:
+        int: 저장에 성공한 파일 수
+
+    주의사항:
+        - chunk_rows 지정 시 청크 분할을 위해 부모 프로세스가 파일을 먼저 읽습니다
+        - serial_number 타겟은 부모에서 파일 완료 순서대로 일련번호를 부여합니다
+    """
+    plan = targets if isinstance(targets, DeidPlan) else DeidPlan.from_targets(targets)
+    parallel_plan, serial_plan = plan.split_serial()
+    log_info(f"[parallel_deidentifier] 시작: 파일 {len(files)}개, 워커 {workers}개, 청크 {chunk_rows or '-'}행")
+
+    saved = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(parallel_plan,)) as executor:
+        futures = {}
+        # 파일별 청크 결과 보관: {파일명: [청크 DataFrame 또는 None, ...]}
+        pending: Dict[str, List[Optional[pd.DataFrame]]] = {}
+
+        for file in files:
+            if chunk_rows is None:
+                futures[executor.submit(_deidentify_file_task, str(file))] = (file.name, 0)
+                pending[file.name] = [None]
+                continue
+            try:
+                df = read_frame_file(file)
+            except Exception as e:
+                log_error(f"[parallel_deidentifier] 파일 로드 실패: {file.name} - {e}")
+                continue
+            chunks = [df.iloc[start:start + chunk_rows] for start in range(0, max(len(df), 1), chunk_rows)]
+            pending[file.name] = [None] * len(chunks)
+            for index, chunk in enumerate(chunks):
+                futures[executor.submit(_deidentify_chunk_task, chunk)] = (file.name, index)
+
+        for future in as_completed(futures):
+            filename, index = futures[future]
+            if filename not in pending:
+                continue  # 다른 청크가 이미 실패한 파일
+            try:
+                pending[filename][index] = future.result()
+            except Exception as e:
+                log_error(f"[parallel_deidentifier] 비식별화 실패: {filename} - {e}")
+                del pending[filename]
+                continue
+
+            if any(part is None for part in pending[filename]):
+                continue
+            df = pd.concat(pending.pop(filename))
+            if len(serial_plan):
+                df = deidentify_columns(df, serial_plan, None, None)
+            save_excels(output_dir, {filename: df}, prefix=prefix)
+            saved += 1
+            log_debug(f"[parallel_deidentifier] 저장 완료: {filename} ({saved}/{len(files)})")
+
+    log_info(f"[parallel_deidentifier] 완료: {saved}/{len(files)}개 파일")
+    return saved
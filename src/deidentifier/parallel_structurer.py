@@ -0,0 +1,76 @@
+"""
+파일명: src/deidentifier/parallel_structurer.py
+목적: 병리보고서 구조화(ReportStructurer)의 다중 프로세스 병렬 처리
+기능:
+  - 데이터프레임들의 보고서 컬럼을 행 샤드로 나누어 프로세스 풀에 분배
+  - 각 워커는 초기화 시 ReportStructurer를 한 번 만들어 정규식을 워커당 1회만 컴파일
+  - 샤드 결과를 원래 행 순서대로 이어 붙여 단일 프로세스 처리와 같은 결과를 만듦
+주의사항:
+  - 워커에는 보고서 컬럼(문자열 목록)만 보내고, 결과 컬럼은 부모에서 데이터프레임에 기록합니다
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from common.logger import log_debug, log_info
+from deidentifier.report_structurer import ReportStructurer
+
+# 워커 프로세스별 상태 (초기화 시 1회 생성)
+_worker = {}
+
+
+def _init_worker(non_targets: dict, targets: dict) -> None:
+    _worker["structurer"] = ReportStructurer(non_targets, targets)
+    log_debug("[parallel_structurer] 워커 초기화 완료")
+
+
+def _structure_shard_task(texts: list) -> Tuple[list, Dict[str, list]]:
+    return _worker["structurer"].structure_texts(texts)
+
+
+def structure_frames_parallel(dfs: Dict[str, pd.DataFrame], report_column: str, non_targets: dict, targets: dict,
+                              workers: int = 2, shard_rows: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """여러 데이터프레임의 보고서 컬럼을 행 샤드 단위로 병렬 구조화합니다. (제자리 변경 후 dfs 반환)
+
+    매개변수:
+        dfs (Dict[str, pd.DataFrame]): {파일명: 데이터프레임}
+        report_column (str): 보고서 컬럼명
+        non_targets (dict), targets (dict): deidentification.yml의 구조화 설정
+        workers (int): 프로세스 수
+        shard_rows (Optional[int]): 샤드당 행 수 (기본: 전체 행 수를 워커 수의 4배로 나눈 값, 최소 1000)
+
+    반환값:
+        Dict[str, pd.DataFrame]: ReportStructurer.structure_frame과 같은 결과
+    """
+    structurer = ReportStructurer(non_targets, targets)  # 설정 검증 및 결과 기록용
+    total_rows = sum(len(df) for df in dfs.values())
+    if shard_rows is None:
+        shard_rows = max(1000, -(-total_rows // (workers * 4)))
+    log_info(f"[parallel_structurer] 시작: 파일 {len(dfs)}개, {total_rows}행, 워커 {workers}개, 샤드 {shard_rows}행")
+
+    shards: List[Tuple[str, list]] = []
+    for fname, df in dfs.items():
+        texts = df[report_column].tolist()
+        for start in range(0, len(texts), shard_rows):
+            shards.append((fname, texts[start:start + shard_rows]))
+
+    results: Dict[str, List[Tuple[list, Dict[str, list]]]] = {fname: [] for fname in dfs}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(non_targets, targets)) as executor:
+        # map은 제출 순서대로 결과를 돌려주므로 샤드 순서가 유지됨
+        for (fname, _), result in zip(shards, executor.map(_structure_shard_task, [texts for _, texts in shards])):
+            results[fname].append(result)
+
+    for fname, df in dfs.items():
+        residuals: list = []
+        columns: Dict[str, list] = {key: [] for key in structurer.target_keys}
+        for shard_residuals, shard_columns in results[fname]:
+            residuals.extend(shard_residuals)
+            for key in structurer.target_keys:
+                columns[key].extend(shard_columns[key])
+        structurer.assign(df, report_column, residuals, columns)
+
+    log_info(f"[parallel_structurer] 완료: 샤드 {len(shards)}개")
+    return dfs
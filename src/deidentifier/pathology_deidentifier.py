@@ -5,33 +5,54 @@
   - 데이터프레임을 인자로 받아서 컬럼별로 정책에 따라 비식별화
   - 데이터프레임의 pathology_report 컬럼은 텍스트내부의 개인정보를 비식별화
   - config/deidentification.yml의 설정에서 검출정규식/비식별화정책/가명화정책/익명화정책을 참조
+  - structured_dir의 중간산출물은 paths.intermediate_format(xlsx|parquet|feather)으로 읽음
+  - 구조화 단계 산출물(structured_*)만 입력으로 사용 (같은 폴더의 다른 파일은 비식별화/전달하지 않음)
   - 비식별화가 완료되면 deid_파일명.xlsx로 저장
+  - --workers N 지정 시 파일(또는 --chunk-rows 단위 행 청크)을 프로세스 풀로 병렬 처리
 변경이력:
   - 2025-10-02: 병리보고서를 미리 컬럼으로 추출하였기에 보고서자체에서 파싱하는 함수는 불용처리 (BenKorea)
   - 2025-09-25: 데이터프레임으로 읽어오는 것을 범용함수로 변경 (BenKorea)
   - 2025-09-18: 최초 구현 (BenKorea)
 """
 
+import argparse
 import os
+from pathlib import Path
 
 import pandas as pd
 import yaml
 
-from common.excel_io import read_excels, save_excels
+from common.excel_io import ExcelStreamWriter, build_output_filename, iter_frame_chunks, iter_frames, list_frame_files, save_excels
 from common.get_cipher import get_cipher
 from common.load_config import load_config
+from common.pseudonym_cache import get_pseudonym_cache
 from common.logger import log_debug
+from deidentifier.deid_plan import DeidPlan
 from deidentifier.deid_utils import *
+from deidentifier.parallel_deidentifier import deidentify_files_parallel
+
+STRUCTURED_PREFIX = "structured_"  # preliminary_pathology_metafier.py가 저장하는 구조화 산출물 접두사
+
+
+def list_structured_files(structured_dir: str, intermediate_format: str) -> list:
+    """structured_dir 바로 아래의 구조화 산출물(structured_*) 목록을 반환합니다."""
+    return list_frame_files(structured_dir, intermediate_format, prefix=STRUCTURED_PREFIX)
 
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="병리보고서 비식별화")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="병렬 처리 프로세스 수 (기본 1: 단일 프로세스)")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="행 청크 크기 (병렬: 청크 분배, 단일: 스트리밍 읽기/쓰기)")
+    args = parser.parse_args()
+
     config_pathology_report = load_config(yml_path="config/deidentification.yml", section="pathology_report")
 
     # 경로 설정
     paths = config_pathology_report.get("paths", {})
     input_dir = paths.get("input_dir", "")
     structured_dir = paths.get("structured_dir", "")
+    intermediate_format = paths.get("intermediate_format", "xlsx")
     output_dir = paths.get("output_dir", "")
     
     # 컬럼 매핑
@@ -43,36 +64,62 @@ if __name__ == "__main__":
     
     log_debug(f"[load_config] structured_dir: {structured_dir}, output_dir: {output_dir}")
     log_debug(f"[load_config] targets: {len(targets)}개")
+    plan = DeidPlan.from_targets(targets)  # 정책 검증·정규식 컴파일 1회
 
     cipher_alphanumeric = get_cipher(alphabet_type="alphanumeric")
     cipher_numeric = get_cipher(alphabet_type="numeric")  # 숫자 전용 alphabet
 
-    
-    dfs = read_excels(structured_dir)
-    deid_dfs = {}  # 최종 비식별화 결과
-    
-    for fname, df in dfs.items():
-        log_debug(f"[처리 시작] 파일: {fname}")
-        
-        
-        df = deidentify_columns(
-            df = df,
-            targets = targets,
-            cipher_alphanumeric = cipher_alphanumeric,
-            cipher_numeric = cipher_numeric
+    if args.workers > 1:
+        # 워커마다 get_cipher로 암호화 객체를 만들고, 완료된 파일부터 저장
+        deidentify_files_parallel(
+            files = list_structured_files(structured_dir, intermediate_format),
+            targets = plan,
+            output_dir = output_dir,
+            prefix = "deid_",
+            workers = args.workers,
+            chunk_rows = args.chunk_rows
         )
+        raise SystemExit(0)
+
+    # 가명 캐시 (.env의 FF3_CACHE_PATH 설정 시에만 사용, FF3_KEY 교체 시 자동 폐기)
+    cache_alphanumeric = get_pseudonym_cache(alphabet_type="alphanumeric")
+    cache_numeric = get_pseudonym_cache(alphabet_type="numeric")
+    
+    # 파일 하나씩 읽어 비식별화 후 바로 저장 (동시에 한 파일만 메모리에 유지)
+    if args.chunk_rows:
+        # 행 청크 스트리밍: parquet batch 또는 openpyxl read-only로 읽고 write-only xlsx로 이어 써서 파일당 상수 메모리
+        for file in list_structured_files(structured_dir, intermediate_format):
+            log_debug(f"[처리 시작] 파일: {file.name} (청크 {args.chunk_rows}행)")
+            with ExcelStreamWriter(Path(output_dir) / build_output_filename(file.name, prefix="deid_")) as writer:
+                for chunk in iter_frame_chunks(file, args.chunk_rows):
+                    writer.append(deidentify_columns(chunk, plan, cipher_alphanumeric, cipher_numeric,
+                                                     cache_alphanumeric, cache_numeric))
+    else:
+        for fname, df in iter_frames(structured_dir, intermediate_format, prefix=STRUCTURED_PREFIX):
+            log_debug(f"[처리 시작] 파일: {fname}")
+
+            df = deidentify_columns(
+                df = df,
+                targets = plan,
+                cipher_alphanumeric = cipher_alphanumeric,
+                cipher_numeric = cipher_numeric,
+                cache_alphanumeric = cache_alphanumeric,
+                cache_numeric = cache_numeric
+            )
 
-        # # 2.2 리포트 컬럼 내부 텍스트 비식별화
-        # df = deidentify_report_column(
-        #     df = df,  # 이전 단계 결과를 사용
-        #     report_column = report_column,
-        #     targets = targets,
-        #     cipher_alphanumeric = cipher_alphanumeric,
-        #     cipher_numeric = cipher_numeric,
-        # )
+            # # 2.2 리포트 컬럼 내부 텍스트 비식별화
+            # df = deidentify_report_column(
+            #     df = df,  # 이전 단계 결과를 사용
+            #     report_column = report_column,
+            #     targets = targets,
+            #     cipher_alphanumeric = cipher_alphanumeric,
+            #     cipher_numeric = cipher_numeric,
+            # )
 
-        dfs[fname] = df  # 원래 파일에 컬럼 추가
+            save_excels(output_dir=output_dir, 
+                        dataframes_dict={fname: df}, 
+                        prefix="deid_")
 
-    save_excels(output_dir=output_dir, 
-                dataframes_dict=dfs, 
-                prefix="deid_")
\ No newline at end of file
+    for cache in (cache_alphanumeric, cache_numeric):
+        if cache is not None:
+            cache.close()
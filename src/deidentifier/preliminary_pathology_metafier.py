@@ -4,30 +4,47 @@
 기능: 
   - 데이터프레임을 인자로 받아서 병리보고서 컬럼을 구조화
   - config/deidentification.yml의 설정에서 구조화 규칙 참조
-  - 구조화가 완료되면 structured_파일명.xlsx로 저장
+  - 구조화가 완료되면 structured_파일명으로 저장 (paths.intermediate_format: xlsx|parquet|feather)
+  - 추출 검증 불일치 행은 paths.validation_dir의 validation_파일명.parquet (xlsx 설정 시 .csv)로 저장
+    (원문 식별정보가 들어 있으므로 비식별화 단계가 읽는 structured_dir에는 저장하지 않음)
+  - --engine compiled(기본): ReportStructurer로 보고서마다 한 번 순회하며 모든 키를 처리
+    --engine sequential: 키마다 컬럼 전체에 remove_non_targets / extract_targets 적용 (기존 방식)
+  - --workers N 지정 시 compiled 엔진을 행 샤드(--shard-rows) 단위로 프로세스 풀에서 병렬 처리
 변경이력:
   - 2025-09-29: 최초 구현 (BenKorea)
 """
 
+import argparse
 import os
 
 import pandas as pd
 import yaml
 
-from common.excel_io import read_excels, save_excels
+from common.excel_io import read_excels, save_frames
 from common.load_config import load_config
 from common.logger import log_debug
 from deidentifier.deid_utils import *
+from deidentifier.parallel_structurer import structure_frames_parallel
+from deidentifier.report_structurer import ReportStructurer
 
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="병리보고서 구조화")
+    parser.add_argument("--engine", choices=["compiled", "sequential"], default="compiled",
+                        help="compiled: 보고서당 1회 순회(기본), sequential: 키마다 컬럼 전체 처리")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="병렬 처리 프로세스 수 (기본 1: 단일 프로세스, compiled 엔진만)")
+    parser.add_argument("--shard-rows", type=int, default=None, help="병렬 처리 시 샤드당 행 수 (기본: 자동)")
+    args = parser.parse_args()
+
     config_pathology_report = load_config(yml_path="config/deidentification.yml", section="pathology_report")
 
     # 경로 설정
     paths = config_pathology_report.get("paths", {})
     input_dir = paths.get("input_dir", "")
     structured_dir = paths.get("structured_dir", "")
+    intermediate_format = paths.get("intermediate_format", "xlsx")
+    validation_dir = paths.get("validation_dir", "data/validation/pathology_report")
 
     # 컬럼 매핑
     existing_column_mapping = config_pathology_report.get("existing_column_mapping", {})
@@ -42,32 +59,48 @@ if __name__ == "__main__":
     targets_keys = list(targets.keys())
         
 
+    structurer = ReportStructurer(non_targets, targets) if args.engine == "compiled" else None
+
     dfs = read_excels(input_dir)
+    if structurer is not None and args.workers > 1:
+        # 행 샤드를 프로세스 풀에서 병렬 구조화 (정규식은 워커당 1회 컴파일)
+        structure_frames_parallel(dfs, report_column, non_targets, targets,
+                                  workers=args.workers, shard_rows=args.shard_rows)
+    elif structurer is not None:
+        # 보고서마다 한 번 순회하며 non_targets 삭제와 targets 추출을 계획 순서대로 적용
+        for df in dfs.values():
+            structurer.structure_frame(df, report_column)
+
     for fname, df in dfs.items():
-        for key in non_targets_keys:
-            non_target_conf = non_targets.get(key, {})
-            remove_non_targets(
-                df=df,
-                report_column=report_column,
-                target_key=key,
-                target_conf=non_target_conf
-            )
-
-        for key in targets_keys:
-            target_conf = targets.get(key, {})
-            extract_targets(
-                df=df,
-                report_column=report_column,
-                target_key=key,
-                target_conf=target_conf
-            )
-            dfs[fname] = df
+        if structurer is None:
+            for key in non_targets_keys:
+                non_target_conf = non_targets.get(key, {})
+                remove_non_targets(
+                    df=df,
+                    report_column=report_column,
+                    target_key=key,
+                    target_conf=non_target_conf
+                )
+
+            for key in targets_keys:
+                target_conf = targets.get(key, {})
+                extract_targets(
+                    df=df,
+                    report_column=report_column,
+                    target_key=key,
+                    target_conf=target_conf
+                )
+                dfs[fname] = df
             
         print("\n****************************************************************************************************************")  # 단순 줄바꿈 출력
-        log_debug(f"[main] 삭제 후 전문:\n{df[report_column]}")
+        log_debug(lambda: f"[main] 삭제 후 전문:\n{df[report_column]}")
         
-        validation_extraction(df=df, report_column=report_column, existing_column_mapping=existing_column_mapping)
+        # 남은 전문/불일치 행은 validation_dir/validation_파일명.(parquet|csv)로 저장
+        report_ext = "csv" if intermediate_format == "xlsx" else "parquet"
+        validation_extraction(df=df, report_column=report_column, existing_column_mapping=existing_column_mapping,
+                              mismatch_report_path=os.path.join(validation_dir, f"validation_{os.path.splitext(fname)[0]}.{report_ext}"))
 
-    save_excels(output_dir=structured_dir, 
+    save_frames(output_dir=structured_dir, 
                 dataframes_dict=dfs, 
-                prefix="structured_")
\ No newline at end of file
+                prefix="structured_",
+                fmt=intermediate_format)
\ No newline at end of file
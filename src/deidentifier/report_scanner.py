@@ -0,0 +1,102 @@
+"""
+파일명: src/deidentifier/report_scanner.py
+목적: 보고서 텍스트 비식별화용 컴파일된 타겟 계획 (compiled 엔진)
+기능:
+  - DeidPlan(또는 targets 설정)의 규칙을 타겟별 처리 단계(ScanStep)로 한 번만 준비 (정규식은 DeidPlan에서 1회 컴파일)
+  - 보고서마다 한 번만 순회하며 모든 단계를 targets 순서대로 적용 (sequential 엔진은 단계마다 컬럼 전체를 순회)
+  - 단계의 치환은 sequential 엔진과 같은 replace_with_* 함수를 사용하므로 두 엔진의 결과가 동일
+주의사항:
+  - 타겟 정규식을 하나의 교대(alternation)로 합치면 겹치는 매치(예: 같은 "/ 숫자"를 노리는 age와 room)의
+    우선순위가 targets 순서와 달라지므로, 보고서 안에서는 타겟 순서대로 하나씩 적용합니다
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from common.logger import log_debug
+from deidentifier.deid_plan import DeidPlan
+from deidentifier.deid_utils import (
+    replace_with_masked_id,
+    replace_with_pseudonymized_age,
+    replace_with_pseudonymized_date,
+    replace_with_pseudonymized_id,
+    replace_with_serialized_id,
+)
+
+
+class ScanStep(NamedTuple):
+    key: str
+    pattern: "re.Pattern"
+    replace: Callable[[str], str]   # 보고서 한 건의 텍스트 → 이 타겟을 비식별화한 텍스트
+    extract: bool                   # True: 치환 후 첫 매치 값을 extracted_{key}로 기록 (값 치환 타겟)
+
+
+def first_match(pattern: "re.Pattern", text: Any) -> Optional[Any]:
+    """replace_with_* 함수와 같은 기준(re.findall의 첫 결과)으로 첫 매치 값을 반환합니다."""
+    if not isinstance(text, str):
+        return None
+    matches = pattern.findall(text)
+    return matches[0] if matches else None
+
+
+class CompiledReportScanner:
+    """DeidPlan의 규칙을 타겟 순서대로의 처리 단계로 준비하여 보고서를 한 번에 비식별화하는 스캐너.
+
+    매개변수:
+        targets (DeidPlan | dict): DeidPlan 또는 deidentification.yml의 targets 설정 (dict면 계획으로 변환)
+        cipher_alphanumeric, cipher_numeric: get_cipher()로 생성된 FF3 암호화 객체
+        cache_alphanumeric, cache_numeric: PseudonymCache (선택)
+        existing_columns (Iterable[str]): 데이터프레임 컬럼명. serial_number 타겟이
+            이미 컬럼으로 존재하면 sequential 엔진과 같이 masking으로 처리
+
+    사용예시:
+        >>> scanner = CompiledReportScanner(targets, cipher_alphanumeric, cipher_numeric)
+        >>> scanner.scan("등록번호: 12345678 환 자 명: 홍길동")
+        '등록번호: 84729361 환 자 명: OOOO'
+    """
+
+    def __init__(self, targets: Any, cipher_alphanumeric: Any, cipher_numeric: Any,
+                 cache_alphanumeric: Any = None, cache_numeric: Any = None,
+                 existing_columns: Iterable[str] = ()):
+        plan = targets if isinstance(targets, DeidPlan) else DeidPlan.from_targets(targets)
+        existing_columns = set(existing_columns)
+        ciphers = {"alphanumeric": cipher_alphanumeric, "numeric": cipher_numeric}
+        caches = {"alphanumeric": cache_alphanumeric, "numeric": cache_numeric}
+        self.steps: List[ScanStep] = []
+
+        for rule in plan.rules:
+            pattern = rule.pattern
+            if pattern is None:
+                log_debug(f"[CompiledReportScanner] 경고: regular_expression이 없는 타겟 '{rule.key}'. 처리를 건너뜁니다.")
+                continue
+            extract = True
+            if rule.alphabet is not None:
+                cipher, cache = ciphers[rule.alphabet], caches[rule.alphabet]
+                replace = lambda text, p=pattern, c=cipher, k=cache: replace_with_pseudonymized_id(text, p, c, k)
+            elif rule.policy in ("year_to_january_first", "month_to_first_day"):
+                replace = lambda text, p=pattern, policy=rule.policy: replace_with_pseudonymized_date(text, p, policy)
+            elif rule.policy in ("age_to_5year_group", "age_to_10year_group"):
+                replace = lambda text, p=pattern, policy=rule.policy: replace_with_pseudonymized_age(text, p, policy)
+            elif rule.is_serial and rule.key not in existing_columns:
+                replace = lambda text, p=pattern: replace_with_serialized_id(text, p)
+            else:  # masking 또는 이미 컬럼으로 존재하는 serial_number
+                replace = lambda text, p=pattern, value=rule.anonymization_value: replace_with_masked_id(text, p, value)
+                extract = False
+            self.steps.append(ScanStep(rule.key, pattern, replace, extract))
+
+        self.extract_keys = [step.key for step in self.steps if step.extract]
+        log_debug(f"[CompiledReportScanner] 준비 완료: 타겟 {len(self.steps)}개")
+
+    def scan_with_values(self, text: Any) -> Tuple[Any, Dict[str, Any]]:
+        """보고서 한 건에 모든 단계를 순서대로 적용하여 (비식별화된 텍스트, {key: 치환 직후 첫 매치 값})을 반환합니다."""
+        values: Dict[str, Any] = {}
+        if not isinstance(text, str) or not text:
+            return text, {key: None for key in self.extract_keys}
+        for step in self.steps:
+            text = step.replace(text)
+            if step.extract:
+                values[step.key] = first_match(step.pattern, text)
+        return text, values
+
+    def scan(self, text: Any) -> Any:
+        """보고서 한 건을 비식별화한 텍스트를 반환합니다."""
+        return self.scan_with_values(text)[0]
@@ -0,0 +1,109 @@
+"""
+파일명: src/deidentifier/report_structurer.py
+목적: 병리보고서 구조화용 단일 행 패스 엔진 (compiled 엔진)
+기능:
+  - deidentification.yml의 non_targets(삭제)와 targets(추출 후 삭제) 정규식을 순서대로 한 번만 컴파일한 실행 계획으로 만듦
+  - 보고서마다 계획을 끝까지 적용하여 extracted_* 값과 남은 전문을 한 번에 산출 (행 단위 1회 순회)
+  - 결과는 remove_non_targets / extract_targets를 키마다 컬럼 전체에 적용한 순차 처리와 동일
+주의사항:
+  - 앞 단계 삭제 결과에 뒤 정규식이 매치되는 설정이 있으므로(예: duplicated_block 삭제 후 footer)
+    모든 정규식을 하나의 교대(alternation)로 합쳐 원문을 한 번만 훑는 방식은 쓰지 않고, 보고서별로 계획 순서를 유지합니다
+  - targets 정규식은 캡처 그룹이 정확히 하나여야 합니다 (아니면 ValueError)
+  - specimen 값에 "육"이 포함되면 전문에서 "검 체 :"만 삭제합니다 (extract_targets와 동일)
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from common.logger import log_debug
+
+_SPECIMEN_LABEL = re.compile(r'검\s*체\s*:')
+
+
+class _PlanStep(NamedTuple):
+    key: str
+    pattern: "re.Pattern"
+    extract: bool   # True: targets (첫 매치 값 추출 후 삭제), False: non_targets (삭제만)
+
+
+class ReportStructurer:
+    """non_targets/targets 설정을 순서 있는 실행 계획으로 컴파일한 구조화 엔진.
+
+    매개변수:
+        non_targets (dict): deidentification.yml의 non_targets 설정
+        targets (dict): deidentification.yml의 targets 설정
+
+    사용예시:
+        >>> structurer = ReportStructurer(non_targets, targets)
+        >>> residual, values = structurer.structure(report_text)
+        >>> df = structurer.structure_frame(df, report_column="pathology_report")
+    """
+
+    def __init__(self, non_targets: Dict[str, dict], targets: Dict[str, dict]):
+        self.steps: List[_PlanStep] = []
+        for key, conf in (non_targets or {}).items():
+            self.steps.append(_PlanStep(key, re.compile(conf.get("regular_expression", ""), re.M), False))
+        for key, conf in (targets or {}).items():
+            pattern = re.compile(conf.get("regular_expression", ""), re.M)
+            if pattern.groups != 1:
+                raise ValueError(
+                    f"[ReportStructurer] '{key}' 정규식은 반드시 캡처 그룹 하나만 포함해야 합니다. "
+                    f"현재 그룹 수={pattern.groups}, regex={pattern.pattern}"
+                )
+            self.steps.append(_PlanStep(key, pattern, True))
+        self.target_keys = [step.key for step in self.steps if step.extract]
+        log_debug(f"[ReportStructurer] 컴파일 완료: non_targets {len(self.steps) - len(self.target_keys)}개, targets {len(self.target_keys)}개")
+
+    @staticmethod
+    def _first_value(pattern: "re.Pattern", text: str) -> Optional[str]:
+        # extractall + groupby.first()와 동일: extractall은 빈 캡처를 NaN으로 바꾸므로 값이 비어 있지 않은 첫 매치
+        for match in pattern.finditer(text):
+            if match.group(1):
+                return match.group(1)
+        return None
+
+    def structure(self, text: str) -> Tuple[str, Dict[str, Optional[str]]]:
+        """보고서 한 건에 계획을 순서대로 적용하여 (남은 전문, {target_key: 추출값})을 반환합니다."""
+        values: Dict[str, Optional[str]] = {}
+        if not isinstance(text, str):
+            return text, {key: None for key in self.target_keys}
+        for step in self.steps:
+            if not step.extract:
+                text = step.pattern.sub("", text)
+                continue
+            value = self._first_value(step.pattern, text)
+            values[step.key] = value
+            if step.key == "specimen" and value is not None and "육" in value:
+                text = _SPECIMEN_LABEL.sub("", text)
+            else:
+                text = step.pattern.sub("", text)
+        return text, values
+
+    def structure_texts(self, texts: Iterable) -> Tuple[list, Dict[str, list]]:
+        """보고서 목록을 한 번씩 순회하여 (남은 전문 목록, {target_key: 추출값 목록})을 반환합니다."""
+        residuals = []
+        columns: Dict[str, list] = {key: [] for key in self.target_keys}
+        for text in texts:
+            residual, values = self.structure(text)
+            residuals.append(residual)
+            for key in self.target_keys:
+                columns[key].append(values[key])
+        return residuals, columns
+
+    def assign(self, df: pd.DataFrame, report_column: str, residuals: list, columns: Dict[str, list]) -> pd.DataFrame:
+        """structure_texts 결과를 df에 기록합니다. (report_column 교체, extracted_* 컬럼 추가)"""
+        df[report_column] = pd.Series(residuals, index=df.index, dtype=object)
+        for key in self.target_keys:
+            df[f"extracted_{key}"] = pd.Series(columns[key], index=df.index, dtype=object)
+            log_debug(lambda: f"[ReportStructurer] {key} 추출: {len(df)}행 중 {df[f'extracted_{key}'].notna().sum()}행")
+        return df
+
+    def structure_frame(self, df: pd.DataFrame, report_column: str) -> pd.DataFrame:
+        """report_column의 모든 보고서를 한 번씩 순회하며 구조화합니다. (제자리 변경 후 df 반환)
+
+        extracted_{target_key} 컬럼을 targets 순서대로 추가하고, report_column은 남은 전문으로 바꿉니다.
+        """
+        residuals, columns = self.structure_texts(df[report_column].tolist())
+        return self.assign(df, report_column, residuals, columns)
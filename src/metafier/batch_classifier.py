@@ -0,0 +1,70 @@
+"""
+파일명: src/metafier/batch_classifier.py
+목적: 여러 판독문을 한 번의 LLM 요청으로 분류하는 배치 프롬프트 생성/응답 검증
+기능:
+  - 판독문마다 ID를 붙여 하나의 구조화된 프롬프트로 묶음
+  - 응답의 JSON 배열([{"id": ..., "label": ...}])을 파싱하고 ID 집합·라벨 값을 검증
+  - 검증 실패 시 None을 반환하여 호출측이 판독문별 개별 호출로 대체(fallback)하도록 함
+"""
+
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from common.logger import log_debug
+
+METASTASIS_LABELS = ("높음", "낮음", "불명확")
+
+BATCH_PROMPT_HEADER = (
+    "다음은 ID가 붙은 PET 판독문 {count}건입니다. 각 판독문의 원격전이 가능성을 "
+    "'높음/낮음/불명확' 중 하나로 판단하세요.\n"
+    "설명 없이 JSON 배열만 출력하세요. 형식: "
+    '[{{"id": "R1", "label": "높음"}}, ...]  (모든 ID를 정확히 한 번씩 포함)\n\n'
+)
+
+_JSON_ARRAY = re.compile(r"\[.*\]", re.DOTALL)
+
+
+def build_batch_prompt(items: Sequence[Tuple[str, str]]) -> str:
+    """(ID, 판독문) 목록으로 배치 분류 프롬프트를 만듭니다."""
+    body = "".join(f"### ID: {item_id}\n{report}\n\n" for item_id, report in items)
+    return BATCH_PROMPT_HEADER.format(count=len(items)) + body
+
+
+def parse_batch_labels(response: str, ids: Sequence[str],
+                       labels: Sequence[str] = METASTASIS_LABELS) -> Optional[Dict[str, str]]:
+    """배치 응답에서 {ID: 라벨}을 추출합니다.
+
+    반환값:
+        Dict[str, str]: 모든 ID가 정확히 한 번씩, 허용된 라벨로 들어 있을 때만 반환
+        None: JSON이 아니거나 ID 누락/중복/불일치, 허용되지 않은 라벨이 있는 경우
+    """
+    match = _JSON_ARRAY.search(response or "")
+    if not match:
+        log_debug("[parse_batch_labels] JSON 배열을 찾을 수 없음")
+        return None
+    try:
+        parsed = json.loads(match.group(0))
+    except ValueError as e:
+        log_debug(f"[parse_batch_labels] JSON 파싱 실패: {e}")
+        return None
+
+    result: Dict[str, str] = {}
+    for entry in parsed if isinstance(parsed, list) else []:
+        if not isinstance(entry, dict):
+            return None
+        item_id, label = str(entry.get("id", "")).strip(), str(entry.get("label", "")).strip()
+        if item_id in result or label not in labels:
+            log_debug(f"[parse_batch_labels] 잘못된 항목: {entry}")
+            return None
+        result[item_id] = label
+
+    if set(result) != set(ids):
+        log_debug(f"[parse_batch_labels] ID 불일치: 기대 {len(ids)}건, 응답 {len(result)}건")
+        return None
+    return result
+
+
+def chunk_items(items: List, size: int) -> List[List]:
+    """목록을 size개씩 나눕니다."""
+    return [items[start:start + size] for start in range(0, len(items), max(1, size))]
@@ -0,0 +1,95 @@
+"""
+파일명: src/metafier/bundle_checkpoint.py
+목적: 번들 단위 LLM 처리의 체크포인트 매니페스트
+기능:
+  - 번들별 입력 해시(프롬프트 + 번들 내용), 상태(done/failed/split), 결과 파일 경로를 JSON으로 기록
+  - 번들 하나가 끝날 때마다 원자적으로 저장 (임시 파일 → os.replace)
+  - --resume 실행 시 입력이 같고 결과 파일이 남아 있는 완료 번들은 건너뜀
+  - 나눈 번들(split)이나 누락 판독문을 다시 보낸 후속 번들은 (번호, 파일 목록)을 기록하여 재시작 시 이어서 처리
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from common.logger import log_debug, log_warn
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def bundle_input_hash(prompt_instruction: str, bundle_content: str) -> str:
+    """프롬프트와 번들 내용으로 입력 해시를 만듭니다. 둘 중 하나라도 바뀌면 재처리 대상입니다."""
+    digest = hashlib.sha256()
+    digest.update(prompt_instruction.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(bundle_content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class BundleManifest:
+    """결과 폴더의 manifest.json을 읽고 쓰는 체크포인트 기록기.
+
+    매개변수:
+        path (str | Path): 매니페스트 파일 경로 (보통 결과 폴더/manifest.json)
+
+    사용예시:
+        >>> manifest = BundleManifest(Path(results_dir) / MANIFEST_FILENAME)
+        >>> if not manifest.is_done(n, input_hash):
+        ...     manifest.mark(n, files, input_hash, "done", result_path)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.bundles = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.bundles = json.load(f).get("bundles", {})
+            except (OSError, ValueError) as e:
+                log_warn(f"[BundleManifest] 매니페스트를 읽을 수 없어 새로 시작합니다: {self.path} - {e}")
+        log_debug(f"[BundleManifest] 로드: {self.path} (번들 {len(self.bundles)}개)")
+
+    def is_done(self, bundle_number: int, input_hash: str) -> bool:
+        """같은 입력으로 완료되었고 결과 파일이 남아 있으면 True."""
+        entry = self.bundles.get(str(bundle_number))
+        return bool(
+            entry
+            and entry.get("status") == "done"
+            and entry.get("input_hash") == input_hash
+            and entry.get("result_path")
+            and os.path.exists(entry["result_path"])
+        )
+
+    def children_of(self, bundle_number: int, input_hash: str) -> Optional[List[list]]:
+        """나뉘었거나(split) 완료된 번들의 후속 번들 [[번호, [파일명, ...]], ...]을 반환합니다. 없으면 None."""
+        entry = self.bundles.get(str(bundle_number))
+        if not entry or entry.get("input_hash") != input_hash:
+            return None
+        if entry.get("status") == "split" or self.is_done(bundle_number, input_hash):
+            return entry.get("children")
+        return None
+
+    def mark(self, bundle_number: int, files: List[str], input_hash: str, status: str,
+             result_path: Optional[str] = None, error: Optional[str] = None,
+             children: Optional[List[list]] = None) -> None:
+        """번들 상태(done | failed | split)를 기록하고 매니페스트를 즉시 저장합니다."""
+        self.bundles[str(bundle_number)] = {
+            "files": files,
+            "input_hash": input_hash,
+            "status": status,
+            "result_path": result_path,
+            "error": error,
+            "children": children,
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"bundles": self.bundles}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
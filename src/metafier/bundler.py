@@ -0,0 +1,74 @@
+"""
+파일명: src/metafier/bundler.py
+목적: 판독문 번들을 토큰 예산에 맞춰 구성하는 번들러
+기능:
+  - 판독문별 토큰 수를 추정하여 입력/출력 토큰 예산 안에서 번들을 채움
+  - 자연 정렬 순서를 유지하는 순차 채우기(next-fit) 방식 → 결과 병합 순서가 결정적
+  - 예산보다 큰 판독문은 단독 번들로 처리
+  - 쓸 만한 결과 행이 돌아오지 않은 번들을 절반으로 나누는 split_bundle
+"""
+
+from typing import List, Optional, Tuple
+
+from common.logger import log_debug
+from metafier.llm_executor import estimate_tokens
+
+Report = Tuple[str, str]  # (파일명, 판독문)
+
+
+def format_report(filename: str, text: str) -> str:
+    """번들 안에 들어갈 판독문 한 건의 형식 (파일명 머리글 + 구분선)"""
+    return f"Filename: {filename}\n" + text + "\n\n---\n\n"
+
+
+def build_bundle_content(reports: List[Report]) -> str:
+    """번들의 판독문들을 하나의 LLM 입력 문자열로 합칩니다."""
+    return "".join(format_report(filename, text) for filename, text in reports)
+
+
+def pack_bundles(reports: List[Report], max_input_tokens: int = 30000, max_output_tokens: int = 8000,
+                 output_tokens_per_report: int = 200, prompt_tokens: int = 0,
+                 max_reports: Optional[int] = None) -> List[List[Report]]:
+    """판독문들을 입력/출력 토큰 예산에 맞춰 번들로 나눕니다.
+
+    매개변수:
+        reports (List[Report]): (파일명, 판독문) 목록 (자연 정렬된 순서)
+        max_input_tokens (int): 번들당 입력 토큰 한도 (프롬프트 포함)
+        max_output_tokens (int): 번들당 출력 토큰 한도 (모델 출력 한도보다 여유 있게)
+        output_tokens_per_report (int): 판독문 1건이 결과 표에서 차지할 예상 토큰 수
+        prompt_tokens (int): 매 번들에 붙는 프롬프트 지시문의 토큰 수
+        max_reports (Optional[int]): 번들당 최대 판독문 수 (None이면 제한 없음)
+
+    반환값:
+        List[List[Report]]: 번들 목록. 순서는 입력 순서를 그대로 유지
+    """
+    input_budget = max(1, max_input_tokens - prompt_tokens)
+    bundles: List[List[Report]] = []
+    current: List[Report] = []
+    current_tokens = 0
+
+    for filename, text in reports:
+        tokens = estimate_tokens(format_report(filename, text))
+        full = current and (
+            current_tokens + tokens > input_budget
+            or (len(current) + 1) * output_tokens_per_report > max_output_tokens
+            or (max_reports is not None and len(current) >= max_reports)
+        )
+        if full:
+            bundles.append(current)
+            current, current_tokens = [], 0
+        current.append((filename, text))
+        current_tokens += tokens
+    if current:
+        bundles.append(current)
+
+    log_debug(f"[pack_bundles] 판독문 {len(reports)}건 → 번들 {len(bundles)}개 (입력 {input_budget}, 출력 {max_output_tokens} 토큰)")
+    return bundles
+
+
+def split_bundle(reports: List[Report]) -> List[List[Report]]:
+    """번들을 앞/뒤 절반으로 나눕니다. 판독문이 1건이면 나누지 않습니다."""
+    if len(reports) < 2:
+        return [reports]
+    middle = (len(reports) + 1) // 2
+    return [reports[:middle], reports[middle:]]
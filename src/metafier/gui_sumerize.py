@@ -7,17 +7,25 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.runnables import RunnableSequence
 import re
 import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLineEdit, QTextEdit, QFileDialog, QLabel, QSizePolicy, QSpinBox, QMessageBox, QComboBox
 )
 from PySide6.QtCore import QThread, Signal, Qt
 
+from metafier.bundler import build_bundle_content
+from metafier.llm_cache import get_llm_cache
+from metafier.table_parser import file_positions, parse_markdown_table, reconcile_rows
+
 # --- Backend Logic (Copied from your previous script, ideally in a separate file) ---
 # This part should ideally be in a separate module (e.g., backend_processor.py)
 # and imported. For demonstration, it's included here.
 
 SEPERATOR = '|'
+ROW_ORDER_COLUMN = "__file_position__" # Temporary sort key used while merging result CSVs
+MODEL_NAME = "gemini-2.0-flash"
+TEMPERATURE = 0.0
 # Load environment variables
 load_dotenv()
 google_api_key = os.getenv('GEMINI_API_KEY')
@@ -28,7 +36,8 @@ class BackendWorker(QThread):
     error = Signal(str)
     progress = Signal(str) # Signal to update the log/status window
 
-    def __init__(self, prompt_instruction, input_folder, bundle_size, bundled_folder, result_folder, merge_results):
+    def __init__(self, prompt_instruction, input_folder, bundle_size, bundled_folder, result_folder, merge_results,
+                 parallelism=1):
         super().__init__()
         self.prompt_instruction = prompt_instruction
         self.input_folder = input_folder
@@ -36,6 +45,7 @@ class BackendWorker(QThread):
         self.bundled_folder = bundled_folder
         self.result_folder = result_folder
         self.merge_results = merge_results # New parameter for merging
+        self.parallelism = max(1, parallelism) # Number of bundles sent to the LLM concurrently
 
     def run(self):
         try:
@@ -53,6 +63,40 @@ class BackendWorker(QThread):
         except IOError as e:
             raise IOError(f"Error reading prompt file '{filepath}': {e}")
 
+    def _process_bundle(self, llmchain, llm_cache, prompt, bundle_count, current_bundle_files, bundle_content,
+                        results_files_dir):
+        """Runs one bundle through the LLM (or cache) and saves its table.
+
+        Returns (CSV path or None, filenames with no row in the table).
+        """
+        self.progress.emit(f"Bundle {bundle_count} started: {', '.join(current_bundle_files)}")
+
+        llm_output_text = llm_cache.get(MODEL_NAME, TEMPERATURE, prompt.template, bundle_content) if llm_cache else None
+        if llm_output_text is not None:
+            self.progress.emit(f"Cached LLM result reused for bundle {bundle_count} (no API call).")
+        else:
+            result = llmchain.invoke({"file_content": bundle_content})
+            llm_output_text = result.content
+            if llm_cache:
+                llm_cache.put(MODEL_NAME, TEMPERATURE, prompt.template, bundle_content, llm_output_text)
+
+        try:
+            df = parse_markdown_table(llm_output_text)
+            if df.empty:
+                self.progress.emit(f"Could not find table rows in LLM output for bundle {bundle_count}.")
+                return None, []
+
+            # Keep rows that belong to this bundle and report the files that did not come back
+            df, missing_files = reconcile_rows(df, current_bundle_files)
+            output_csv_filename = os.path.join(results_files_dir, f"result_{bundle_count}.csv")
+            df.to_csv(output_csv_filename, index=False, encoding='utf-8-sig', sep=SEPERATOR)
+            self.progress.emit(f"Results saved to {output_csv_filename}")
+            return output_csv_filename, missing_files or []
+
+        except Exception as e:
+            self.progress.emit(f"Error parsing LLM output for bundle {bundle_count}: {e}")
+            return None, []
+
     def _process_llm_parsing_reports(self):
         reports_folder = self.input_folder
         size_of_a_bundle = self.bundle_size
@@ -80,7 +124,8 @@ class BackendWorker(QThread):
         os.makedirs(results_files_dir, exist_ok=True)
         self.progress.emit(f"Result CSV files will be saved in: {os.path.abspath(results_files_dir)}")
 
-        llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", google_api_key=google_api_key, temperature=0.0)
+        llm = ChatGoogleGenerativeAI(model=MODEL_NAME, google_api_key=google_api_key, temperature=TEMPERATURE)
+        llm_cache = get_llm_cache() # None unless LLM_CACHE_PATH is set
 
         prompt = PromptTemplate(
             input_variables=["file_content"],
@@ -88,93 +133,91 @@ class BackendWorker(QThread):
         )
         llmchain = prompt | llm
 
-        bundle_count = 0
-        individual_csv_files = [] # To store paths of generated CSVs for merging
-
+        # Build and save all bundles first, in natural-sort order
+        report_texts = {}
+        bundles = []
         for i in range(0, len(report_files), size_of_a_bundle):
-            bundle_count += 1
+            bundle_count = len(bundles) + 1
             current_bundle_files = report_files[i:i + size_of_a_bundle]
-            bundle_content = ""
-            filename_list = ", ".join(current_bundle_files)
-
-            self.progress.emit(f"\n--- Processing Bundle {bundle_count} ---")
-            self.progress.emit(f"Files in this bundle: {filename_list}")
 
             for filename in current_bundle_files:
                 filepath = os.path.join(reports_folder, filename)
                 with open(filepath, "r", encoding="utf-8") as f:
-                    bundle_content += f"Filename: {filename}\n" + f.read() + "\n\n---\n\n"
+                    report_texts[filename] = f.read()
+            bundle_content = build_bundle_content([(f, report_texts[f]) for f in current_bundle_files])
 
             bundle_output_filepath = os.path.join(bundled_files_dir, f"bundle_{bundle_count}.txt")
             with open(bundle_output_filepath, "w", encoding="utf-8") as bundle_file:
                 bundle_file.write(bundle_content)
-            self.progress.emit(f"Bundle content saved to {bundle_output_filepath}")
-
-            result = llmchain.invoke({"file_content": bundle_content})
-            llm_output_text = result.content
-
-            try:
-                lines = llm_output_text.strip().split('\n')
-                cleaned_lines = [line.strip() for line in lines if line.strip() and not line.strip().startswith('```')]
-
-                if len(cleaned_lines) < 2:
-                    self.progress.emit(f"LLM did not return enough lines to form a table for bundle {bundle_count}.")
-                    continue
-
-                header_line = ""
-                separator_line = ""
-                data_start_index = -1
-
-                for idx, line in enumerate(cleaned_lines):
-                    if '|' in line and '---' not in line:
-                        header_line = line
-                        if idx + 1 < len(cleaned_lines) and '---' in cleaned_lines[idx+1]:
-                            separator_line = cleaned_lines[idx+1]
-                            data_start_index = idx + 2
-                            break
-
-                if not header_line or not separator_line or data_start_index == -1:
-                    self.progress.emit(f"Could not identify table header or data start in LLM output for bundle {bundle_count}.")
-                    continue
-
-                columns = [col.strip() for col in header_line.strip('|').split('|')]
-                data = []
-                for j in range(data_start_index, len(cleaned_lines)):
-                    current_line = cleaned_lines[j]
-                    if current_line.strip():
-                        row_values = [val.strip() for val in current_line.strip('|').split('|')]
-                        if len(row_values) == len(columns):
-                            data.append(row_values)
-                        else:
-                            self.progress.emit(f"Skipping malformed row (column count mismatch) for bundle {bundle_count}: {current_line}")
-
-                df = pd.DataFrame(data, columns=columns)
-                output_csv_filename = os.path.join(results_files_dir, f"result_{bundle_count}.csv")
-                df.to_csv(output_csv_filename, index=False, encoding='utf-8-sig', sep=SEPERATOR)
-                self.progress.emit(f"Results saved to {output_csv_filename}")
-                individual_csv_files.append(output_csv_filename) # Add to list for merging
-
-            except Exception as e:
-                self.progress.emit(f"Error parsing LLM output for bundle {bundle_count}: {e}")
+            bundles.append((bundle_count, current_bundle_files, bundle_content))
+
+        self.progress.emit(f"{len(bundles)} bundles prepared; sending up to {self.parallelism} bundles at a time.")
+
+        # Dispatch bundles concurrently and report each one as it completes.
+        # Reports missing from a bundle's table are re-queued as a smaller bundle.
+        file_position = {filename: position for position, filename in enumerate(report_files)}
+        result_csv_files = {} # {bundle_count: (natural-sort position of its first file, csv path)}
+        next_bundle_number = len(bundles) + 1
+        finished = 0
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            pending = {} # {future: (bundle_count, files)}
+
+            def submit(bundle_count, current_bundle_files, bundle_content):
+                future = executor.submit(self._process_bundle, llmchain, llm_cache, prompt, bundle_count,
+                                         current_bundle_files, bundle_content, results_files_dir)
+                pending[future] = (bundle_count, current_bundle_files)
+
+            for bundle in bundles:
+                submit(*bundle)
+            while pending:
+                done_futures, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    bundle_count, current_bundle_files = pending.pop(future)
+                    try:
+                        output_csv_filename, missing_files = future.result()
+                    except Exception as e:
+                        self.progress.emit(f"Error processing bundle {bundle_count}: {e}")
+                        output_csv_filename, missing_files = None, []
+                    if output_csv_filename:
+                        result_csv_files[bundle_count] = (file_position[current_bundle_files[0]], output_csv_filename)
+                    finished += 1
+                    self.progress.emit(f"--- Bundle {bundle_count} finished ({finished} done, {len(pending)} running) ---")
+
+                    if missing_files and len(missing_files) < len(current_bundle_files):
+                        retry_content = build_bundle_content([(f, report_texts[f]) for f in missing_files])
+                        self.progress.emit(f"Bundle {bundle_count}: {len(missing_files)} reports missing from the table; "
+                                           f"re-queued as bundle {next_bundle_number}: {', '.join(missing_files)}")
+                        submit(next_bundle_number, missing_files, retry_content)
+                        next_bundle_number += 1
+
+        individual_csv_files = sorted(result_csv_files.values()) # [(position of the bundle's first file, csv path)]
 
         # --- Result Merging Logic ---
         if self.merge_results and individual_csv_files:
             self.progress.emit("\n--- Merging individual result CSVs ---")
             merged_df = pd.DataFrame()
-            for csv_file in individual_csv_files:
+            for first_position, csv_file in individual_csv_files:
                 try:
                     df_temp = pd.read_csv(csv_file, sep=SEPERATOR, encoding='utf-8-sig')
+                    # Order rows by their own file's natural-sort position: a re-queued bundle's rows
+                    # belong among its parent bundle's rows, not after them
+                    positions = file_positions(df_temp, report_files)
+                    if positions is None:
+                        positions = pd.Series(first_position, index=df_temp.index)
+                    df_temp[ROW_ORDER_COLUMN] = positions.fillna(first_position)
                     merged_df = pd.concat([merged_df, df_temp], ignore_index=True)
                 except Exception as e:
                     self.progress.emit(f"Warning: Could not read {csv_file} for merging: {e}")
 
             if not merged_df.empty:
+                merged_df = (merged_df.sort_values(ROW_ORDER_COLUMN, kind="stable")
+                             .drop(columns=ROW_ORDER_COLUMN).reset_index(drop=True))
                 merged_output_filepath = os.path.join(os.getcwd(), "merged_results.csv")
                 merged_df.to_csv(merged_output_filepath, index=False, encoding='utf-8-sig', sep=SEPERATOR)
                 self.progress.emit(f"All results merged into: {os.path.abspath(merged_output_filepath)}")
 
                 # Optionally, clean up individual CSVs after merging
-                # for csv_file in individual_csv_files:
+                # for _, csv_file in individual_csv_files:
                 #     try:
                 #         os.remove(csv_file)
                 #         self.progress.emit(f"Removed individual file: {os.path.basename(csv_file)}")
@@ -225,6 +268,13 @@ class ReportProcessorGUI(QWidget):
         self.bundle_size_spinbox.setRange(1, 1000)
         self.bundle_size_spinbox.setValue(10)
 
+        # Parallel bundles (concurrent LLM calls)
+        parallel_label = QLabel("Parallel:")
+        self.parallel_spinbox = QSpinBox()
+        self.parallel_spinbox.setRange(1, 32)
+        self.parallel_spinbox.setValue(4)
+        self.parallel_spinbox.setToolTip("Number of bundles sent to the LLM at the same time")
+
         # Result Merging
         result_merging_label = QLabel("Result Merging:")
         self.merge_results_combobox = QComboBox()
@@ -233,6 +283,8 @@ class ReportProcessorGUI(QWidget):
 
         bundle_config_layout.addWidget(bundle_size_label)
         bundle_config_layout.addWidget(self.bundle_size_spinbox)
+        bundle_config_layout.addWidget(parallel_label)
+        bundle_config_layout.addWidget(self.parallel_spinbox)
         bundle_config_layout.addStretch(1) # Adds flexible space
         bundle_config_layout.addWidget(result_merging_label)
         bundle_config_layout.addWidget(self.merge_results_combobox)
@@ -362,6 +414,7 @@ class ReportProcessorGUI(QWidget):
         prompt_instruction = self.prompt_text_edit.toPlainText().strip()
         input_folder = self.input_folder_display.text().strip()
         bundle_size = self.bundle_size_spinbox.value()
+        parallelism = self.parallel_spinbox.value()
         bundled_folder = self.bundled_folder_display.text().strip()
         result_folder = self.result_folder_display.text().strip()
         merge_results = (self.merge_results_combobox.currentText() == "Yes") # Get merging preference
@@ -386,7 +439,8 @@ class ReportProcessorGUI(QWidget):
 
         # Create and start the worker thread with the new merge_results parameter
         self.worker_thread = BackendWorker(
-            prompt_instruction, input_folder, bundle_size, bundled_folder, result_folder, merge_results
+            prompt_instruction, input_folder, bundle_size, bundled_folder, result_folder, merge_results,
+            parallelism
         )
         self.worker_thread.finished.connect(self.handle_finished)
         self.worker_thread.error.connect(self.handle_error)
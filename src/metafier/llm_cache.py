@@ -0,0 +1,122 @@
+"""
+파일명: src/metafier/llm_cache.py
+목적: LLM 응답의 내용 주소 기반(content-addressed) 로컬 캐시
+기능:
+  - 캐시 키 = SHA-256(모델, temperature, 프롬프트 템플릿, 입력 내용)
+  - SQLite 단일 파일 저장 (WAL, 스레드 간 공유 가능)
+  - 전체 응답 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+  - .env의 LLM_CACHE_PATH가 설정된 경우에만 get_llm_cache()가 캐시를 생성
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from common.logger import log_debug, log_info
+
+
+def make_cache_key(model: str, temperature: float, template: str, content: str) -> str:
+    """모델·temperature·프롬프트 템플릿·입력 내용으로 캐시 키(hex)를 만듭니다."""
+    payload = json.dumps([model, float(temperature), template, content], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """LLM 응답 문자열을 SQLite에 저장하는 크기 제한 캐시.
+
+    매개변수:
+        db_path (str | Path): SQLite 파일 경로 (상위 디렉토리는 자동 생성)
+        max_bytes (int): 저장할 응답의 총 크기(UTF-8 바이트) 한도
+
+    사용예시:
+        >>> cache = LLMResponseCache("data/cache/llm_responses.db")
+        >>> response = cache.get(model, 0.0, template, content)
+        >>> if response is None:
+        ...     response = llm.invoke(prompt).content
+        ...     cache.put(model, 0.0, template, content, response)
+    """
+
+    def __init__(self, db_path, max_bytes: int = 512 * 1024 * 1024):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        log_debug(f"[LLMResponseCache] 캐시 열기: {self.db_path} ({self._total} bytes)")
+
+    def get(self, model: str, temperature: float, template: str, content: str) -> Optional[str]:
+        """캐시된 응답을 반환합니다. 없으면 None."""
+        key = make_cache_key(model, temperature, template, content)
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        log_debug(f"[LLMResponseCache] 적중: {key[:12]}")
+        return row[0]
+
+    def put(self, model: str, temperature: float, template: str, content: str, response: str) -> None:
+        """응답을 저장하고 크기 한도를 넘으면 오래된 항목을 삭제합니다."""
+        key = make_cache_key(model, temperature, template, content)
+        size = len(response.encode("utf-8"))
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time()),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict(key)
+
+    def _evict(self, keep_key: str) -> None:
+        evicted = 0
+        while self._total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses WHERE key != ? ORDER BY last_access LIMIT 100", (keep_key,)
+            ).fetchall()
+            if not rows:
+                break  # 방금 저장한 항목 하나만 남은 경우
+            for key, size in rows:
+                if self._total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total -= size
+                evicted += 1
+        log_info(f"[LLMResponseCache] 크기 한도 초과: {evicted}건 삭제 ({self._total} bytes)")
+
+    def close(self) -> None:
+        """SQLite 연결을 닫습니다."""
+        self._conn.close()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """.env 설정으로 LLMResponseCache를 생성합니다. LLM_CACHE_PATH 미설정 시 None."""
+    load_dotenv()
+    cache_path = os.getenv("LLM_CACHE_PATH")
+    if not cache_path:
+        log_debug("[get_llm_cache] LLM_CACHE_PATH 미설정: 캐시 사용 안 함")
+        return None
+    max_mb = int(os.getenv("LLM_CACHE_MAX_MB", "512"))
+    log_debug(f"[get_llm_cache] path = {cache_path}, max = {max_mb}MB")
+    return LLMResponseCache(cache_path, max_bytes=max_mb * 1024 * 1024)
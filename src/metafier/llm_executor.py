@@ -0,0 +1,115 @@
+"""
+파일명: src/metafier/llm_executor.py
+목적: LLM(Gemini) 호출의 비동기 동시 실행기
+기능:
+  - asyncio 기반 동시 호출 (동시 실행 수 제한)
+  - RPM(분당 요청 수) / TPM(분당 토큰 수) 할당량에 맞춘 토큰 버킷 속도 제한
+  - 429(RESOURCE_EXHAUSTED) 응답 시 지수 백오프 후 재시도
+  - 완료되는 순서대로 콜백으로 결과 전달 (호출측에서 즉시 데이터프레임에 기록)
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from common.logger import log_debug, log_warn
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수를 대략 추정합니다. (한글·영문 혼합 기준 약 3자당 1토큰, 최소 1)"""
+    return max(1, len(str(text)) // 3)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED 계열 예외인지 판별합니다."""
+    text = f"{type(error).__name__} {error}"
+    return "429" in text or "ResourceExhausted" in text or "RESOURCE_EXHAUSTED" in text
+
+
+class TokenBucket:
+    """분당 capacity만큼 채워지는 토큰 버킷. capacity가 None이면 제한하지 않습니다."""
+
+    def __init__(self, capacity: Optional[int]):
+        self.capacity = capacity
+        self.tokens = float(capacity or 0)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+    async def acquire(self, amount: int = 1) -> None:
+        if not self.capacity:
+            return
+        amount = min(amount, self.capacity)  # 한 요청이 버킷보다 크면 가득 찰 때까지만 대기
+        async with self.lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) * 60.0 / self.capacity)
+                self._refill()
+            self.tokens -= amount
+
+
+class RateLimiter:
+    """RPM/TPM 두 개의 토큰 버킷을 함께 적용하는 속도 제한기."""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    async def acquire(self, tokens: int) -> None:
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+
+async def run_prompts_async(llm: Any, jobs: Iterable[Tuple[Any, str]],
+                            on_result: Callable[[Any, Optional[str], Optional[Exception]], None],
+                            concurrency: int = 8, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                            max_retries: int = 5, backoff_seconds: float = 2.0) -> None:
+    """(키, 프롬프트) 작업들을 동시에 실행하고 완료 순서대로 on_result(키, 응답, 예외)를 호출합니다.
+
+    매개변수:
+        llm: ainvoke(prompt)를 지원하는 LangChain 채팅 모델
+        jobs (Iterable[Tuple[Any, str]]): (결과 키, 프롬프트) 목록
+        on_result (Callable): 성공 시 on_result(키, 응답문자열, None), 실패 시 on_result(키, None, 예외)
+        concurrency (int): 동시에 진행할 최대 요청 수
+        rpm (Optional[int]): 분당 요청 수 한도 (None이면 제한 없음)
+        tpm (Optional[int]): 분당 입력 토큰 수 한도 (None이면 제한 없음, estimate_tokens로 추정)
+        max_retries (int): 429 응답 시 최대 재시도 횟수
+        backoff_seconds (float): 첫 재시도 대기 시간(초). 재시도마다 2배씩 증가
+
+    주의사항:
+        - on_result는 이벤트 루프 스레드에서 호출되므로 데이터프레임에 바로 기록해도 안전합니다
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    limiter = RateLimiter(rpm, tpm)
+
+    async def run_one(key: Any, prompt: str) -> None:
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                await limiter.acquire(estimate_tokens(prompt))
+                try:
+                    result = await llm.ainvoke(prompt)
+                except Exception as e:
+                    if is_rate_limit_error(e) and attempt < max_retries:
+                        delay = backoff_seconds * (2 ** attempt) * (1 + random.random() * 0.1)
+                        log_warn(f"[run_prompts_async] 429 응답 [{key}]: {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})")
+                        await asyncio.sleep(delay)
+                        continue
+                    on_result(key, None, e)
+                    return
+                on_result(key, str(result.content).strip(), None)
+                return
+
+    tasks = [asyncio.create_task(run_one(key, prompt)) for key, prompt in jobs]
+    log_debug(f"[run_prompts_async] 시작: {len(tasks)}건, 동시 {concurrency}, RPM {rpm or '-'}, TPM {tpm or '-'}")
+    await asyncio.gather(*tasks)
+
+
+def run_prompts(llm: Any, jobs: Iterable[Tuple[Any, str]],
+                on_result: Callable[[Any, Optional[str], Optional[Exception]], None], **kwargs: Any) -> None:
+    """run_prompts_async의 동기 래퍼 (CLI 명령에서 사용)"""
+    asyncio.run(run_prompts_async(llm, jobs, on_result, **kwargs))
@@ -2,21 +2,26 @@
 파일명: src/metafier/metafier_cli.py  
 목적: 병리 또는 PET 판독보고서 LLM 처리기 (CLI 버전)
 설명: Gemini 2.0 Flash를 이용 배치 처리 및 정형화 - Typer CLI
+      (analyze-metastasis는 llm_executor로 RPM/TPM 한도 내 비동기 동시 호출)
 변경이력:
   - 2025-10-12: 전역변수 문제 해결 - 파일 기반 상태 저장 (BenKorea)
 """
 
 import os
-import pickle
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import pandas as pd
 import typer
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from common.excel_io import read_excel_file
 from common.logger import log_debug, log_error, log_info, log_warn
+from metafier.batch_classifier import BATCH_PROMPT_HEADER, build_batch_prompt, chunk_items, parse_batch_labels
+from metafier.llm_cache import get_llm_cache
+from metafier.llm_executor import run_prompts
+from metafier.state_store import ColumnarStateStore
 
 # 환경변수 로딩
 load_dotenv()
@@ -24,24 +29,28 @@ google_api_key = os.getenv('GEMINI_API_KEY')
 
 app = typer.Typer(help="AI4RM Metafier - PET 판독 분석기")
 
-# 임시 상태 파일 경로
-TEMP_STATE_FILE = Path.cwd() / ".pet_data_state.pkl"
+# 임시 상태 디렉토리 (컬럼별 Feather 파일 + manifest.json)
+TEMP_STATE_DIR = Path.cwd() / ".pet_data_state"
+state_store = ColumnarStateStore(TEMP_STATE_DIR)
 
-def save_pet_state(pet_df: pd.DataFrame) -> None:
-    """PET 데이터 상태 저장"""
+# 원격전이 분석 LLM 설정 (응답 캐시 키에도 사용)
+METASTASIS_MODEL = "gemini-2.0-flash-exp"
+METASTASIS_TEMPERATURE = 0.0
+METASTASIS_PROMPT = "다음 PET 판독문에서 원격전이 가능성을 '높음/낮음/불명확' 중 하나로 답하세요:\n\n{report}"
+
+def save_pet_state(pet_df: pd.DataFrame, columns: Optional[List[str]] = None) -> None:
+    """PET 데이터 상태 저장 (columns 지정 시 해당 컬럼 파일만 새로 씀)"""
     try:
-        with open(TEMP_STATE_FILE, 'wb') as f:
-            pickle.dump(pet_df, f)
-        log_debug(f"[상태저장] PET 데이터 상태 저장: {len(pet_df)}행")
+        written = state_store.save(pet_df, columns=columns)
+        log_debug(f"[상태저장] PET 데이터 상태 저장: {len(pet_df)}행, 컬럼 {len(written)}개 기록")
     except Exception as e:
         log_error(f"[상태저장] 저장 실패: {e}")
 
 def load_pet_state() -> Optional[pd.DataFrame]:
     """PET 데이터 상태 로드"""
     try:
-        if TEMP_STATE_FILE.exists():
-            with open(TEMP_STATE_FILE, 'rb') as f:
-                pet_df = pickle.load(f)
+        pet_df = state_store.load()
+        if pet_df is not None:
             log_debug(f"[상태로드] PET 데이터 상태 로드: {len(pet_df)}행")
             return pet_df
         else:
@@ -54,23 +63,14 @@ def load_pet_state() -> Optional[pd.DataFrame]:
 def clear_pet_state() -> None:
     """PET 데이터 상태 파일 삭제"""
     try:
-        if TEMP_STATE_FILE.exists():
-            TEMP_STATE_FILE.unlink()
+        if state_store.exists():
+            state_store.clear()
             log_debug("[상태삭제] PET 데이터 상태 파일 삭제")
     except Exception as e:
         log_warn(f"[상태삭제] 삭제 실패: {e}")
 
-@app.command()
-def load_pet(
-    excel_folder: Path = typer.Argument(..., help="PET 엑셀 파일들 폴더"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o", help="저장 경로")
-) -> None:
-    """엑셀 파일들을 PET 데이터프레임으로 통합"""
-    
-    log_info(f"[load_pet] PET 엑셀 로딩 시작: {excel_folder}")
-    
-    # 이전 상태 초기화
-    clear_pet_state()
+def _load_pet_df(excel_folder: Path) -> pd.DataFrame:
+    """엑셀 파일(또는 폴더)을 읽어 하나의 PET 데이터프레임으로 통합합니다. (상태 저장 없음)"""
     
     # 엑셀 로드 (강력한 호환성)
     dfs = {}
@@ -78,17 +78,12 @@ def load_pet(
     if excel_folder.is_file():
         # 단일 파일 처리
         log_info(f"[load_pet] 단일 파일 모드: {excel_folder}")
-        for engine in ['openpyxl', 'xlrd', 'calamine']:
-            try:
-                df = pd.read_excel(excel_folder, engine=engine)
-                dfs[excel_folder.name] = df
-                log_info(f"[load_pet] {engine}로 성공: {excel_folder.name} ({len(df)}행)")
-                break
-            except Exception as e:
-                log_debug(f"[load_pet] {engine} 실패: {excel_folder.name} - {e}")
-                continue
-        else:
-            log_error(f"[load_pet] 모든 엔진 실패: {excel_folder.name}")
+        try:
+            df = read_excel_file(excel_folder)
+            dfs[excel_folder.name] = df
+            log_info(f"[load_pet] 로드 성공: {excel_folder.name} ({len(df)}행)")
+        except ValueError as e:
+            log_error(f"[load_pet] 모든 엔진 실패: {excel_folder.name} - {e}")
             raise typer.Exit(1)
     
     elif excel_folder.is_dir():
@@ -104,20 +99,12 @@ def load_pet(
         log_info(f"[load_pet] 발견된 엑셀 파일: {len(excel_files)}개")
         
         for file in excel_files:
-            file_loaded = False
-            for engine in ['openpyxl', 'xlrd', 'calamine']:
-                try:
-                    df = pd.read_excel(file, engine=engine)
-                    dfs[file.name] = df
-                    log_debug(f"[load_pet] {engine}로 성공: {file.name} ({len(df)}행)")
-                    file_loaded = True
-                    break
-                except Exception as e:
-                    log_debug(f"[load_pet] {engine} 실패: {file.name} - {e}")
-                    continue
-            
-            if not file_loaded:
-                log_error(f"[load_pet] 모든 엔진 실패: {file.name}")
+            try:
+                df = read_excel_file(file)
+                dfs[file.name] = df
+                log_debug(f"[load_pet] 로드 성공: {file.name} ({len(df)}행)")
+            except ValueError as e:
+                log_error(f"[load_pet] 모든 엔진 실패: {file.name} - {e}")
     
     else:
         log_error(f"[load_pet] 잘못된 경로: {excel_folder}")
@@ -140,42 +127,10 @@ def load_pet(
     
     pet_df = pd.concat(all_dfs, ignore_index=True)
     log_info(f"[load_pet] DataFrame 통합 완료: {len(pet_df)}행 {len(pet_df.columns)}컬럼")
-    
-    # 상태 저장
-    save_pet_state(pet_df)
-    
-    # 결과 출력
-    print(f"✅ PET 데이터 로딩 완료!")
-    print(f"📊 총 레코드: {len(pet_df)}건")
-    print(f"📋 컬럼: {list(pet_df.columns)}")
-    print(f"📁 원본 파일: {len(dfs)}개")
-    print(f"💾 상태 저장: {TEMP_STATE_FILE}")
-    
-    # 저장 (선택사항)
-    if output:
-        try:
-            pet_df.to_excel(output, index=False)
-            log_info(f"[load_pet] 데이터 저장 완료: {output}")
-            print(f"💾 엑셀 저장: {output}")
-        except Exception as e:
-            log_error(f"[load_pet] 저장 실패: {e}")
-            print(f"❌ 저장 실패: {e}")
+    return pet_df
 
-@app.command()
-def add_staging(
-    column: str = typer.Option("판독소견", "--column", "-c", help="검색할 컬럼명"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o", help="저장 경로")
-) -> None:
-    """staging 키워드로 scan_purpose 컬럼 파생"""
-    
-    # 상태 로드
-    pet_df = load_pet_state()
-    
-    if pet_df is None:
-        log_error("[add_staging] PET 데이터가 로딩되지 않음. load-pet 명령을 먼저 실행하세요")
-        print("❌ PET 데이터 없음. load-pet 명령 먼저 실행")
-        print(f"💡 해결방법: python src/metafier/metafier_cli.py load-pet 폴더경로")
-        raise typer.Exit(1)
+def _add_staging_df(pet_df: pd.DataFrame, column: str = "판독소견") -> int:
+    """staging 키워드로 scan_purpose 컬럼을 파생합니다. (제자리 변경, staging 건수 반환)"""
     
     # 컬럼 존재 확인
     if column not in pet_df.columns:
@@ -196,41 +151,14 @@ def add_staging(
     
     staging_count = staging_mask.sum()
     log_info(f"[add_staging] staging 케이스 발견: {staging_count}건")
-    
-    # 상태 저장
-    save_pet_state(pet_df)
-    
-    print(f"✅ scan_purpose 컬럼 추가 완료!")
-    print(f"📊 staging 케이스: {staging_count}건")
-    print(f"💾 상태 업데이트: {TEMP_STATE_FILE}")
-    
-    # 저장 (선택사항)
-    if output:
-        try:
-            pet_df.to_excel(output, index=False)
-            log_info(f"[add_staging] staging 결과 저장: {output}")
-            print(f"💾 엑셀 저장: {output}")
-        except Exception as e:
-            log_error(f"[add_staging] 저장 실패: {e}")
-            print(f"❌ 저장 실패: {e}")
+    return staging_count
 
-@app.command()
-def analyze_metastasis(
-    limit: int = typer.Option(10, "--limit", "-l", help="분석할 레코드 수"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o", help="저장 경로"),
-    show_full: bool = typer.Option(False, "--full", "-f", help="판독소견 전체 출력")
-) -> None:
-    """staging 케이스 원격전이 분석 (Gemini API)"""
-    
-    # 상태 로드
-    pet_df = load_pet_state()
-    
-    if pet_df is None:
-        log_error("[analyze_metastasis] PET 데이터가 로딩되지 않음")
-        print("❌ PET 데이터 없음. load-pet → add-staging 순서로 실행")
-        print(f"💡 1단계: python src/metafier/metafier_cli.py load-pet 폴더경로")
-        print(f"💡 2단계: python src/metafier/metafier_cli.py add-staging")
-        raise typer.Exit(1)
+def _analyze_metastasis_df(pet_df: pd.DataFrame, limit: int = 10, show_full: bool = False,
+                           concurrency: int = 8, rpm: Optional[int] = 60,
+                           tpm: Optional[int] = None, batch_size: int = 1) -> Optional[List[dict]]:
+    """staging 케이스의 원격전이 가능성을 Gemini로 분석하여 원격전이 컬럼에 기록합니다.
+    (제자리 변경, 순번 순 분석 결과 목록 반환. staging 케이스가 없으면 None)
+    batch_size > 1이면 N건씩 한 요청으로 분류하고, 응답 검증에 실패한 배치만 개별 호출합니다."""
     
     # scan_purpose 컬럼 확인
     if 'scan_purpose' not in pet_df.columns:
@@ -245,7 +173,7 @@ def analyze_metastasis(
     if len(staging_df) == 0:
         log_warn("[analyze_metastasis] staging 케이스가 없음")
         print("⚠️ staging 케이스 없음. add-staging 명령 먼저 실행")
-        return
+        return None
     
     # 분석 대상 제한
     analysis_df = staging_df.head(limit)
@@ -260,9 +188,9 @@ def analyze_metastasis(
     # LLM 초기화
     try:
         llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-exp",
+            model=METASTASIS_MODEL,
             google_api_key=google_api_key,
-            temperature=0.0
+            temperature=METASTASIS_TEMPERATURE
         )
     except Exception as e:
         log_error(f"[analyze_metastasis] LLM 초기화 실패: {e}")
@@ -273,10 +201,13 @@ def analyze_metastasis(
     if '원격전이' not in pet_df.columns:
         pet_df['원격전이'] = ''
     
-    # 분석 결과 저장용 리스트
-    analysis_results = []
+    # 분석 결과 저장용 {순번: 결과} (응답이 도착하는 순서대로 채워짐)
+    analysis_results = {}
+    jobs = []
+    cached = []
+    llm_cache = get_llm_cache()  # LLM_CACHE_PATH 미설정 시 None
     
-    # 각 레코드 분석
+    # 판독문 없는 레코드는 바로 처리하고, 나머지는 LLM 작업으로 등록
     for i, (idx, row) in enumerate(analysis_df.iterrows(), 1):
         report = row['판독소견']
         patient_id = row.get('환자번호', f'ID_{idx}')
@@ -286,30 +217,38 @@ def analyze_metastasis(
             pet_df.at[idx, '원격전이'] = metastasis_risk
             print(f"  {i}/{len(analysis_df)}: {metastasis_risk}")
             
-            analysis_results.append({
+            analysis_results[i] = {
                 '순번': i,
                 '환자번호': patient_id,
                 '원격전이': metastasis_risk,
                 '판독소견': '판독문 없음'
-            })
+            }
             continue
         
-        try:
-            # Gemini API 호출
-            prompt = f"다음 PET 판독문에서 원격전이 가능성을 '높음/낮음/불명확' 중 하나로 답하세요:\n\n{report}"
-            result = llm.invoke(prompt)
-            
+        key = (i, idx, patient_id, report)
+        response = llm_cache.get(METASTASIS_MODEL, METASTASIS_TEMPERATURE, METASTASIS_PROMPT, str(report)) if llm_cache else None
+        if response is None and llm_cache and batch_size > 1:
+            response = llm_cache.get(METASTASIS_MODEL, METASTASIS_TEMPERATURE, BATCH_PROMPT_HEADER, str(report))
+        if response is not None:
+            cached.append((key, response))
+        else:
+            jobs.append((key, METASTASIS_PROMPT.format(report=report)))
+    
+    def on_result(key, response, error):
+        i, idx, patient_id, report = key
+        
+        if error is not None:
+            log_warn(f"[analyze_metastasis] API 호출 실패 [{idx}]: {error}")
+            metastasis_risk = 'API오류'
+            display_report = f'API 오류: {str(error)[:50]}...'
+        else:
             # 결과 파싱
-            response = result.content.strip()
             if '높음' in response:
                 metastasis_risk = '높음'
             elif '낮음' in response:
                 metastasis_risk = '낮음'
             else:
                 metastasis_risk = '불명확'
-            
-            pet_df.at[idx, '원격전이'] = metastasis_risk
-            print(f"  {i}/{len(analysis_df)}: {metastasis_risk}")
             log_debug(f"[analyze_metastasis] 분석 완료 [{idx}]: {metastasis_risk}")
             
             # 분석 결과 저장 - 전체/요약 선택
@@ -317,29 +256,63 @@ def analyze_metastasis(
                 display_report = str(report)  # 전체 판독소견
             else:
                 display_report = report[:100] + '...' if len(str(report)) > 100 else str(report)
-            
-            analysis_results.append({
-                '순번': i,
-                '환자번호': patient_id,
-                '원격전이': metastasis_risk,
-                '판독소견': display_report
-            })
-            
-        except Exception as e:
-            log_warn(f"[analyze_metastasis] API 호출 실패 [{idx}]: {e}")
-            metastasis_risk = 'API오류'
-            pet_df.at[idx, '원격전이'] = metastasis_risk
-            print(f"  {i}/{len(analysis_df)}: {metastasis_risk}")
-            
-            analysis_results.append({
-                '순번': i,
-                '환자번호': patient_id,
-                '원격전이': metastasis_risk,
-                '판독소견': f'API 오류: {str(e)[:50]}...'
-            })
-    
-    # 상태 저장
-    save_pet_state(pet_df)
+        
+        pet_df.at[idx, '원격전이'] = metastasis_risk
+        print(f"  {i}/{len(analysis_df)}: {metastasis_risk}")
+        
+        analysis_results[i] = {
+            '순번': i,
+            '환자번호': patient_id,
+            '원격전이': metastasis_risk,
+            '판독소견': display_report
+        }
+    
+    # 캐시 적중분은 API 호출 없이 처리
+    for key, response in cached:
+        on_result(key, response, None)
+    if cached:
+        log_info(f"[analyze_metastasis] 응답 캐시 적중: {len(cached)}건")
+    
+    def on_api_result(key, response, error):
+        if error is None and llm_cache:
+            llm_cache.put(METASTASIS_MODEL, METASTASIS_TEMPERATURE, METASTASIS_PROMPT, str(key[3]), response)
+        on_result(key, response, error)
+    
+    if batch_size > 1 and len(jobs) > 1:
+        # 배치 모드: N건을 ID와 함께 한 요청으로 분류, 검증에 실패한 배치는 아래 개별 호출로 대체
+        batches = chunk_items(jobs, batch_size)
+        fallback_jobs = []
+        
+        def on_batch_result(batch_number, response, error):
+            batch = batches[batch_number]
+            ids = [f"R{key[0]}" for key, _ in batch]
+            labels = parse_batch_labels(response, ids) if error is None else None
+            if labels is None:
+                log_warn(f"[analyze_metastasis] 배치 {batch_number + 1} 응답 검증 실패 ({len(batch)}건): 개별 호출로 대체 - {error or '형식 불일치'}")
+                fallback_jobs.extend(batch)
+                return
+            for (key, _), item_id in zip(batch, ids):
+                if llm_cache:
+                    llm_cache.put(METASTASIS_MODEL, METASTASIS_TEMPERATURE, BATCH_PROMPT_HEADER, str(key[3]), labels[item_id])
+                on_result(key, labels[item_id], None)
+        
+        batch_jobs = [
+            (batch_number, build_batch_prompt([(f"R{key[0]}", str(key[3])) for key, _ in batch]))
+            for batch_number, batch in enumerate(batches)
+        ]
+        log_info(f"[analyze_metastasis] 배치 분류: {len(jobs)}건 → 요청 {len(batch_jobs)}건 (배치 {batch_size}건)")
+        run_prompts(llm, batch_jobs, on_batch_result, concurrency=concurrency, rpm=rpm, tpm=tpm)
+        jobs = fallback_jobs
+    
+    # Gemini API 동시 호출 (RPM/TPM 한도 내에서)
+    run_prompts(llm, jobs, on_api_result, concurrency=concurrency, rpm=rpm, tpm=tpm)
+    if llm_cache:
+        llm_cache.close()
+    analysis_results = [analysis_results[i] for i in sorted(analysis_results)]
+    return analysis_results
+
+def _print_metastasis_results(pet_df: pd.DataFrame, analysis_results: List[dict], show_full: bool) -> None:
+    """원격전이 분석 요약과 레코드별 결과를 출력합니다."""
     
     # 결과 요약
     result_counts = pet_df['원격전이'].value_counts()
@@ -352,7 +325,7 @@ def analyze_metastasis(
     
     # 분석된 레코드 상세 출력
     display_mode = "전체" if show_full else "요약"
-    print(f"\n📋 분석된 {len(analysis_df)}건 상세 결과 ({display_mode}):")
+    print(f"\n📋 분석된 {len(analysis_results)}건 상세 결과 ({display_mode}):")
     print("=" * 100)
     
     for result in analysis_results:
@@ -366,15 +339,115 @@ def analyze_metastasis(
                 print(f"  {line}")
         
         print("=" * 100)
+
+@app.command()
+def load_pet(
+    excel_folder: Path = typer.Argument(..., help="PET 엑셀 파일들 폴더"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="저장 경로")
+) -> None:
+    """엑셀 파일들을 PET 데이터프레임으로 통합"""
+    
+    log_info(f"[load_pet] PET 엑셀 로딩 시작: {excel_folder}")
+    
+    # 이전 상태 초기화
+    clear_pet_state()
+    
+    pet_df = _load_pet_df(excel_folder)
+    
+    # 상태 저장
+    save_pet_state(pet_df)
+    
+    # 결과 출력
+    print(f"✅ PET 데이터 로딩 완료!")
+    print(f"📊 총 레코드: {len(pet_df)}건")
+    print(f"📋 컬럼: {list(pet_df.columns)}")
+    print(f"📁 원본 파일: {pet_df['source_file'].nunique()}개")
+    print(f"💾 상태 저장: {TEMP_STATE_DIR}")
+    
+    # 저장 (선택사항)
+    if output:
+        try:
+            pet_df.to_excel(output, index=False)
+            log_info(f"[load_pet] 데이터 저장 완료: {output}")
+            print(f"💾 엑셀 저장: {output}")
+        except Exception as e:
+            log_error(f"[load_pet] 저장 실패: {e}")
+            print(f"❌ 저장 실패: {e}")
+
+@app.command()
+def add_staging(
+    column: str = typer.Option("판독소견", "--column", "-c", help="검색할 컬럼명"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="저장 경로")
+) -> None:
+    """staging 키워드로 scan_purpose 컬럼 파생"""
+    
+    # 상태 로드
+    pet_df = load_pet_state()
+    
+    if pet_df is None:
+        log_error("[add_staging] PET 데이터가 로딩되지 않음. load-pet 명령을 먼저 실행하세요")
+        print("❌ PET 데이터 없음. load-pet 명령 먼저 실행")
+        print(f"💡 해결방법: python src/metafier/metafier_cli.py load-pet 폴더경로")
+        raise typer.Exit(1)
+    
+    staging_count = _add_staging_df(pet_df, column)
+    
+    # 상태 저장 (scan_purpose 컬럼만 기록)
+    save_pet_state(pet_df, columns=['scan_purpose'])
+    
+    print(f"✅ scan_purpose 컬럼 추가 완료!")
+    print(f"📊 staging 케이스: {staging_count}건")
+    print(f"💾 상태 업데이트: {TEMP_STATE_DIR}")
+    
+    # 저장 (선택사항)
+    if output:
+        try:
+            pet_df.to_excel(output, index=False)
+            log_info(f"[add_staging] staging 결과 저장: {output}")
+            print(f"💾 엑셀 저장: {output}")
+        except Exception as e:
+            log_error(f"[add_staging] 저장 실패: {e}")
+            print(f"❌ 저장 실패: {e}")
+
+@app.command()
+def analyze_metastasis(
+    limit: int = typer.Option(10, "--limit", "-l", help="분석할 레코드 수"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="저장 경로"),
+    show_full: bool = typer.Option(False, "--full", "-f", help="판독소견 전체 출력"),
+    concurrency: int = typer.Option(8, "--concurrency", "-n", help="동시 API 요청 수"),
+    rpm: Optional[int] = typer.Option(60, "--rpm", help="분당 요청 수 한도 (0이면 제한 없음)"),
+    tpm: Optional[int] = typer.Option(None, "--tpm", help="분당 입력 토큰 수 한도 (미지정 시 제한 없음)"),
+    batch_size: int = typer.Option(1, "--batch-size", "-b", help="한 요청에 묶어 분류할 판독문 수 (1이면 개별 호출)")
+) -> None:
+    """staging 케이스 원격전이 분석 (Gemini API, 비동기 동시 호출)"""
     
-    print(f"💾 상태 업데이트: {TEMP_STATE_FILE}")
+    # 상태 로드
+    pet_df = load_pet_state()
+    
+    if pet_df is None:
+        log_error("[analyze_metastasis] PET 데이터가 로딩되지 않음")
+        print("❌ PET 데이터 없음. load-pet → add-staging 순서로 실행")
+        print(f"💡 1단계: python src/metafier/metafier_cli.py load-pet 폴더경로")
+        print(f"💡 2단계: python src/metafier/metafier_cli.py add-staging")
+        raise typer.Exit(1)
+    
+    analysis_results = _analyze_metastasis_df(pet_df, limit, show_full, concurrency, rpm, tpm, batch_size)
+    if analysis_results is None:
+        return
+    
+    # 상태 저장 (원격전이 컬럼만 기록)
+    save_pet_state(pet_df, columns=['원격전이'])
+    
+    _print_metastasis_results(pet_df, analysis_results, show_full)
+    
+    print(f"💾 상태 업데이트: {TEMP_STATE_DIR}")
     
     if show_full:
         print(f"💡 판독소견 전체 출력 모드입니다. 요약 모드는 --full 옵션 없이 실행하세요.")
     else:
         print(f"💡 판독소견 전체 보기: --full 또는 -f 옵션 추가")
     
-    log_info(f"[analyze_metastasis] 원격전이 분석 완료: {len(analysis_df)}건")
+    log_info(f"[analyze_metastasis] 원격전이 분석 완료: {len(analysis_results)}건")
     
     # 저장 (선택사항)
     if output:
@@ -390,9 +463,14 @@ def analyze_metastasis(
 def pipeline(
     excel_folder: Path = typer.Argument(..., help="PET 엑셀 파일들 폴더"),
     limit: int = typer.Option(10, "--limit", "-l", help="분석할 staging 케이스 수"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o", help="최종 저장 경로")
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="최종 저장 경로"),
+    concurrency: int = typer.Option(8, "--concurrency", "-n", help="동시 API 요청 수"),
+    rpm: Optional[int] = typer.Option(60, "--rpm", help="분당 요청 수 한도 (0이면 제한 없음)"),
+    tpm: Optional[int] = typer.Option(None, "--tpm", help="분당 입력 토큰 수 한도 (미지정 시 제한 없음)"),
+    batch_size: int = typer.Option(1, "--batch-size", "-b", help="한 요청에 묶어 분류할 판독문 수 (1이면 개별 호출)"),
+    checkpoint: bool = typer.Option(False, "--checkpoint", help="단계마다 상태 저장 (미지정 시 마지막에 한 번만 저장)")
 ) -> None:
-    """전체 파이프라인 실행: 로딩 → staging 추가 → 원격전이 분석"""
+    """전체 파이프라인 실행: 로딩 → staging 추가 → 원격전이 분석 (데이터프레임을 메모리로 전달)"""
     
     log_info("[pipeline] PET 분석 파이프라인 시작")
     
@@ -402,22 +480,42 @@ def pipeline(
     try:
         # 1단계: 데이터 로딩
         print("📁 1단계: PET 데이터 로딩...")
-        ctx = typer.Context(load_pet)
-        ctx.invoke(load_pet, excel_folder=excel_folder)
+        clear_pet_state()
+        pet_df = _load_pet_df(excel_folder)
+        print(f"✅ PET 데이터 로딩 완료: {len(pet_df)}건")
+        if checkpoint:
+            save_pet_state(pet_df)
         
         # 2단계: staging 파생
         print("\n🔍 2단계: staging 케이스 식별...")
-        ctx = typer.Context(add_staging)
-        ctx.invoke(add_staging)
+        staging_count = _add_staging_df(pet_df)
+        print(f"✅ staging 케이스: {staging_count}건")
+        if checkpoint:
+            save_pet_state(pet_df, columns=['scan_purpose'])
         
         # 3단계: 원격전이 분석
         print(f"\n🤖 3단계: 원격전이 분석 (최대 {limit}건)...")
-        ctx = typer.Context(analyze_metastasis)
-        ctx.invoke(analyze_metastasis, limit=limit, output=output)
+        analysis_results = _analyze_metastasis_df(pet_df, limit, False, concurrency, rpm, tpm, batch_size)
+        if analysis_results is not None:
+            _print_metastasis_results(pet_df, analysis_results, False)
+        
+        # 상태 저장: 체크포인트 모드는 마지막 단계 컬럼만, 아니면 여기서 한 번에 전체 저장
+        if not checkpoint:
+            save_pet_state(pet_df)
+        elif analysis_results is not None:
+            save_pet_state(pet_df, columns=['원격전이'])
+        print(f"💾 상태 저장: {TEMP_STATE_DIR}")
+        
+        if output:
+            pet_df.to_excel(output, index=False)
+            log_info(f"[pipeline] 최종 결과 저장: {output}")
+            print(f"💾 엑셀 저장: {output}")
         
         print("\n🎉 파이프라인 완료!")
         log_info("[pipeline] PET 분석 파이프라인 완료")
         
+    except typer.Exit:
+        raise
     except Exception as e:
         log_error(f"[pipeline] 파이프라인 실행 중 오류: {e}")
         print(f"❌ 파이프라인 오류: {e}")
@@ -428,7 +526,7 @@ def clear_state() -> None:
     """임시 상태 파일 삭제"""
     
     clear_pet_state()
-    print(f"✅ 상태 파일 삭제 완료: {TEMP_STATE_FILE}")
+    print(f"✅ 상태 파일 삭제 완료: {TEMP_STATE_DIR}")
     log_info("[clear_state] 상태 파일 삭제 완료")
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""
+파일명: src/metafier/state_store.py
+목적: metafier_cli 명령 간 PET 데이터프레임 상태를 컬럼 단위로 저장하는 저장소
+기능:
+  - 컬럼마다 Feather(Arrow IPC, 비압축) 파일 1개 + manifest.json(행 수, 컬럼 순서, 파일명)
+  - 로드 시 memory-map으로 열어 필요한 컬럼만 읽음
+  - 파생 컬럼 추가/변경 시 해당 컬럼 파일만 새로 쓰고 기존 컬럼은 건드리지 않음
+주의사항:
+  - 행 순서(RangeIndex) 기준으로 저장하므로 컬럼 추가 시 행 수가 같아야 합니다
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from common.excel_io import to_arrow_safe
+from common.logger import log_debug
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+class ColumnarStateStore:
+    """컬럼별 Feather 파일로 데이터프레임을 저장/로드하는 상태 저장소.
+
+    매개변수:
+        directory (str | Path): 상태 디렉토리 (예: .pet_data_state/)
+
+    사용예시:
+        >>> store = ColumnarStateStore(".pet_data_state")
+        >>> store.save(pet_df)                            # 전체 저장
+        >>> store.save(pet_df, columns=["scan_purpose"])  # 변경된 컬럼만 저장
+        >>> pet_df = store.load()
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / MANIFEST_FILENAME
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def _read_manifest(self) -> dict:
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: dict) -> None:
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _write_column(self, series: pd.Series, filename: str) -> None:
+        frame = to_arrow_safe(series.to_frame(name=str(series.name)).reset_index(drop=True))
+        tmp_path = self.directory / (filename + ".tmp")
+        # 비압축으로 저장해야 로드 시 memory-map 제로카피가 가능
+        feather.write_feather(frame, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, self.directory / filename)
+
+    def save(self, df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> List[str]:
+        """데이터프레임을 저장합니다.
+
+        매개변수:
+            df (pd.DataFrame): 저장할 데이터프레임
+            columns (Optional[Iterable[str]]): 지정 시 해당 컬럼만 새로 씀(추가 또는 변경).
+                미지정이거나 저장된 상태가 없거나 행 수가 다르면 전체를 새로 씀
+
+        반환값:
+            List[str]: 실제로 기록한 컬럼명 목록
+        """
+        if columns is not None and self.exists():
+            manifest = self._read_manifest()
+            if manifest["rows"] == len(df):
+                entries = {entry["name"]: entry for entry in manifest["columns"]}
+                columns = list(columns)
+                for name in columns:
+                    if name not in entries:
+                        entries[name] = {"name": name, "file": f"c{manifest['next_file']:05d}.feather"}
+                        manifest["next_file"] += 1
+                    self._write_column(df[name], entries[name]["file"])
+                manifest["columns"] = [entries[name] for name in df.columns if name in entries]
+                self._write_manifest(manifest)
+                log_debug(f"[ColumnarStateStore] 컬럼 저장: {columns}")
+                return columns
+            log_debug(f"[ColumnarStateStore] 행 수 변경({manifest['rows']} → {len(df)}): 전체 저장")
+
+        self.clear()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for number, name in enumerate(df.columns):
+            entry = {"name": name, "file": f"c{number:05d}.feather"}
+            self._write_column(df[name], entry["file"])
+            entries.append(entry)
+        self._write_manifest({"rows": len(df), "columns": entries, "next_file": len(entries)})
+        log_debug(f"[ColumnarStateStore] 전체 저장: {len(df)}행 {len(entries)}컬럼")
+        return list(df.columns)
+
+    def load(self, columns: Optional[Iterable[str]] = None) -> Optional[pd.DataFrame]:
+        """저장된 상태를 memory-map으로 읽어 데이터프레임으로 반환합니다. 없으면 None."""
+        if not self.exists():
+            return None
+        manifest = self._read_manifest()
+        wanted = set(columns) if columns is not None else None
+        data = {}
+        for entry in manifest["columns"]:
+            if wanted is not None and entry["name"] not in wanted:
+                continue
+            with pa.memory_map(str(self.directory / entry["file"]), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            data[entry["name"]] = table.column(0).to_pandas()
+        df = pd.DataFrame(data, index=pd.RangeIndex(manifest["rows"]))
+        log_debug(f"[ColumnarStateStore] 로드: {len(df)}행 {len(df.columns)}컬럼")
+        return df
+
+    def clear(self) -> None:
+        """상태 디렉토리를 삭제합니다."""
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
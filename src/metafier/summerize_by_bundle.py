@@ -10,8 +10,17 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.runnables import RunnableSequence
 import re
 import argparse
+from collections import deque
+
+from metafier.bundler import build_bundle_content, pack_bundles, split_bundle
+from metafier.bundle_checkpoint import MANIFEST_FILENAME, BundleManifest, bundle_input_hash
+from metafier.llm_cache import get_llm_cache
+from metafier.llm_executor import estimate_tokens
+from metafier.table_parser import MarkdownTableParser, reconcile_rows
 
 SEPERATOR = '|'
+MODEL_NAME = "gemini-2.0-flash"
+TEMPERATURE = 0.0
 # Load environment variables
 load_dotenv()
 google_api_key = os.getenv('GEMINI_API_KEY')
@@ -40,17 +49,28 @@ def read_prompt_from_file(filepath: str) -> str:
 
 
 def process_llm_parsing_reports(input_folder: str, size_of_a_bundle: int, prompt_instruction: str = "",
-                                bundled_files_dir: str = "Bundled_Files", results_files_dir: str = "Result_Files"):
+                                bundled_files_dir: str = "Bundled_Files", results_files_dir: str = "Result_Files",
+                                resume: bool = False, max_input_tokens: int = 30000, max_output_tokens: int = 8000,
+                                output_tokens_per_report: int = 200):
     """
     Processes pathology reports from a folder, bundles them, extracts key information,
     and outputs to CSV and console, including the original filename.
 
     Args:
         input_folder (str): The path to the folder containing pathology reports.
-        size_of_a_bundle (int): The number of reports to bundle together for processing.
+        size_of_a_bundle (int): The maximum number of reports in one bundle. Bundles are packed by
+            estimated tokens, so a bundle of long reports holds fewer files.
         prompt_instruction (str): The instruction for the LLM to extract information.
         bundled_files_dir (str): Directory to save bundled text files.
         results_files_dir (str): Directory to save result CSV files.
+        resume (bool): Skip bundles recorded as done in the results directory's manifest.json
+            (same prompt and bundle content, result CSV still present) and retry only failed or missing ones.
+        max_input_tokens (int): Input token budget per bundle, including the prompt instruction.
+        max_output_tokens (int): Output token budget per bundle (keep below the model's output limit).
+        output_tokens_per_report (int): Expected output tokens for one report's table row.
+
+    Output rows are matched to the bundle's filenames. Reports without a row are re-queued
+    as a smaller bundle, and a bundle with no usable rows at all is split in half and retried.
     """
     if not os.path.isdir(input_folder):
         print(f"Error: Folder '{input_folder}' not found.")
@@ -76,7 +96,9 @@ def process_llm_parsing_reports(input_folder: str, size_of_a_bundle: int, prompt
     print(f"Result CSV files will be saved in: {os.path.abspath(results_files_dir)}")
 
     # Initialize the LLM
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", google_api_key=google_api_key, temperature=0.0)
+    llm = ChatGoogleGenerativeAI(model=MODEL_NAME, google_api_key=google_api_key, temperature=TEMPERATURE)
+    # Local response cache (None unless LLM_CACHE_PATH is set): unchanged bundles cost no API call on re-runs
+    llm_cache = get_llm_cache()
 
     prompt = PromptTemplate(
         input_variables=["file_content"],
@@ -85,17 +107,47 @@ def process_llm_parsing_reports(input_folder: str, size_of_a_bundle: int, prompt
     # Use RunnableSequence to chain the prompt and llm together
     llmchain = prompt | llm
 
-    bundle_count = 0
-    for i in range(0, len(report_files), size_of_a_bundle):
-        bundle_count += 1
-        current_bundle_files = report_files[i:i + size_of_a_bundle]
-        bundle_content = ""
+    # Checkpoint manifest: records each bundle's input hash, status and result path
+    manifest = BundleManifest(os.path.join(results_files_dir, MANIFEST_FILENAME))
+
+    # Read all reports and pack them into bundles within the token budgets
+    reports = []
+    for filename in report_files:
+        filepath = os.path.join(input_folder, filename) # Use input_folder here
+        with open(filepath, "r", encoding="utf-8") as f:
+            reports.append((filename, f.read()))
+    bundles = pack_bundles(reports, max_input_tokens, max_output_tokens, output_tokens_per_report,
+                           prompt_tokens=estimate_tokens(prompt_instruction), max_reports=size_of_a_bundle)
+    print(f"{len(reports)} reports packed into {len(bundles)} bundles.")
+
+    # Work queue of (bundle number, reports); split or re-queued bundles are pushed back to the front
+    queue = deque(enumerate(bundles, 1))
+    next_bundle_number = len(bundles) + 1
+    report_texts = dict(reports)
+
+    def requeue(children):
+        """children: [[bundle number, [filenames]], ...] as recorded in the manifest"""
+        queue.extendleft(reversed([(number, [(f, report_texts[f]) for f in files]) for number, files in children]))
+
+    while queue:
+        bundle_count, bundle = queue.popleft()
+        current_bundle_files = [filename for filename, _ in bundle]
         filename_list = ", ".join(current_bundle_files)
-        for filename in current_bundle_files:
-            filepath = os.path.join(input_folder, filename) # Use input_folder here
-            with open(filepath, "r", encoding="utf-8") as f:
-                # Add filename to the beginning of the report content
-                bundle_content += f"Filename: {filename}\n" + f.read() + "\n\n---\n\n"
+        # Add filename to the beginning of each report's content
+        bundle_content = build_bundle_content(bundle)
+
+        input_hash = bundle_input_hash(prompt_instruction, bundle_content)
+        if resume:
+            done = manifest.is_done(bundle_count, input_hash)
+            children = manifest.children_of(bundle_count, input_hash)
+            if done or children:
+                if done:
+                    print(f"\n--- Skipping Bundle {bundle_count} (already completed) ---")
+                if children:
+                    print(f"\n--- Bundle {bundle_count} has follow-up bundles {[n for n, _ in children]}; resuming those ---")
+                    requeue(children)
+                    next_bundle_number = max(next_bundle_number, max(n for n, _ in children) + 1)
+                continue
 
         print(f"\n--- Processing Bundle {bundle_count} ---")
         print(f"Files in this bundle: {filename_list}")
@@ -106,70 +158,79 @@ def process_llm_parsing_reports(input_folder: str, size_of_a_bundle: int, prompt
             bundle_file.write(bundle_content)
         print(f"Bundle content saved to {bundle_output_filepath}")
 
-        # Invoke the LLM chain and get the result
-        result = llmchain.invoke({"file_content": bundle_content})
-
-        llm_output_text = result.content # Access the 'content' attribute from the result object
+        # Reuse the cached response for the same model/prompt/bundle, otherwise stream the LLM chain.
+        # Table rows are parsed as the response streams in, so a response cut off mid-way still keeps its rows.
+        table_parser = MarkdownTableParser()
+        llm_output_text = llm_cache.get(MODEL_NAME, TEMPERATURE, prompt.template, bundle_content) if llm_cache else None
+        if llm_output_text is not None:
+            print("Cached LLM result found for this bundle (no API call).")
+            table_parser.feed(llm_output_text)
+        else:
+            chunks = []
+            try:
+                for chunk in llmchain.stream({"file_content": bundle_content}):
+                    chunks.append(chunk.content)
+                    table_parser.feed(chunk.content)
+                llm_output_text = "".join(chunks)
+                if llm_cache:
+                    llm_cache.put(MODEL_NAME, TEMPERATURE, prompt.template, bundle_content, llm_output_text)
+            except Exception as e:
+                llm_output_text = "".join(chunks)
+                if not table_parser.rows:
+                    # Record the failure and move on; --resume retries only the failed bundles
+                    print(f"LLM call failed for bundle {bundle_count}: {e}")
+                    manifest.mark(bundle_count, current_bundle_files, input_hash, "failed", error=str(e))
+                    continue
+                print(f"LLM response for bundle {bundle_count} was cut off ({e}); keeping {len(table_parser.rows)} parsed rows.")
+        table_parser.close()
 
         print("\n--- Raw LLM Result ---")
         print(llm_output_text)
 
-        # Attempt to parse the LLM's table output into a DataFrame
+        # Check the parsed table against the bundle's files
         try:
-            # Split the output into lines and clean them
-            lines = llm_output_text.strip().split('\n')
-            # Filter out empty lines and potential markdown code block fences (like '```')
-            cleaned_lines = [line.strip() for line in lines if line.strip() and not line.strip().startswith('```')]
-
-            if len(cleaned_lines) < 2:
-                print("LLM did not return enough lines to form a table.")
+            df = table_parser.to_dataframe()
+            if df.empty:
+                df, missing_files = df, list(current_bundle_files)
+            else:
+                df, missing_files = reconcile_rows(df, current_bundle_files)
+                if missing_files is None and len(df) < len(current_bundle_files):
+                    # No filename column to reconcile by: fall back to the row count
+                    missing_files = list(current_bundle_files)
+
+            if missing_files and len(missing_files) == len(current_bundle_files):
+                if len(current_bundle_files) == 1:
+                    print("LLM did not return a table row for this report.")
+                    manifest.mark(bundle_count, current_bundle_files, input_hash, "failed", error="no table rows")
+                    continue
+                # Nothing usable (usually a truncated or malformed response): split the bundle and retry the halves
+                children = [[next_bundle_number + k, [f for f, _ in half]] for k, half in enumerate(split_bundle(bundle))]
+                next_bundle_number += len(children)
+                print(f"No usable rows for {len(current_bundle_files)} files; splitting bundle {bundle_count} into bundles {[n for n, _ in children]}.")
+                manifest.mark(bundle_count, current_bundle_files, input_hash, "split", children=children)
+                requeue(children)
                 continue
 
-            # Find the header and separator lines more robustly
-            header_line = ""
-            separator_line = ""
-            data_start_index = -1
-
-            for idx, line in enumerate(cleaned_lines):
-                if '|' in line and '---' not in line:  # This is likely the header line
-                    header_line = line
-                    if idx + 1 < len(cleaned_lines) and '---' in cleaned_lines[idx+1]: # The next line should be the separator
-                        separator_line = cleaned_lines[idx+1] # This line is often '---|---|---'
-                        data_start_index = idx + 2 # Data starts after header and separator
-                        break
-
-            if not header_line or not separator_line or data_start_index == -1:
-                print("Could not identify table header or data start in LLM output.")
-                continue
-
-            # Extract column names from the header line
-            # Remove leading/trailing '|' and split by '|', then strip spaces
-            columns = [col.strip() for col in header_line.strip('|').split('|')]
-
-            data = []
-            for j in range(data_start_index, len(cleaned_lines)):
-                current_line = cleaned_lines[j]
-                if current_line.strip(): # Ensure the line is not empty
-                    # Remove leading/trailing '|' and split by '|', then strip spaces
-                    row_values = [val.strip() for val in current_line.strip('|').split('|')]
-
-                    if len(row_values) == len(columns):
-                        data.append(row_values)
-                    else:
-                        print(f"Skipping malformed row (column count mismatch): {current_line}")
-                        print(f"Expected {len(columns)} columns, got {len(row_values)}")
-
-            df = pd.DataFrame(data, columns=columns)
-
             # Save to CSV in the specified results directory
             output_csv_filename = os.path.join(results_files_dir, f"result_{bundle_count}.csv")
             df.to_csv(output_csv_filename, index=False, encoding='utf-8-sig', sep=SEPERATOR)
             print(f"\nResults saved to {output_csv_filename}")
+
+            # Re-queue only the reports that did not come back, as a smaller bundle
+            children = None
+            if missing_files:
+                children = [[next_bundle_number, missing_files]]
+                next_bundle_number += 1
+                print(f"Missing rows for {len(missing_files)} files; re-queued as bundle {children[0][0]}: {', '.join(missing_files)}")
+            manifest.mark(bundle_count, current_bundle_files, input_hash, "done", output_csv_filename, children=children)
+            if children:
+                requeue(children)
             print("\n--- Extracted Data (DataFrame) ---")
             print(df.to_string(index=False))
         except Exception as e:
             print(f"Error parsing LLM output for bundle {bundle_count}: {e}")
             print("LLM output:\n", llm_output_text) # Print the raw LLM output for debugging
+            manifest.mark(bundle_count, current_bundle_files, input_hash, "failed", error=str(e))
         # input("Press Enter to continue to the next bundle...")
 
 # --- Main execution block ---
@@ -179,11 +240,17 @@ if __name__ == "__main__":
     parser.add_argument("-i", "--input_folder", default="Input_Files", # Changed from -d to -i, and default from Haewon_Reports to Input_Files
                         help="Path to the directory containing pathology reports (default: Input_Files).")
     parser.add_argument("-s", "--bundle_size", type=int, default=10,
-                        help="Number of reports to bundle together for processing (default: 10).")
+                        help="Maximum number of reports in one bundle (default: 10).")
+    parser.add_argument("--max-input-tokens", type=int, default=30000,
+                        help="Input token budget per bundle, including the prompt (default: 30000).")
+    parser.add_argument("--max-output-tokens", type=int, default=8000,
+                        help="Output token budget per bundle (default: 8000).")
     parser.add_argument("-b", "--bundled_folder", default="Bundled_Files",
                         help="Directory to save bundled text files (default: Bundled_Files).")
     parser.add_argument("-r", "--result_folder", default="Result_Files",
                         help="Directory to save result CSV files (default: Result_Files).")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip bundles already completed in Result_Files/manifest.json and retry only failed or missing ones.")
 
     args = parser.parse_args()
 
@@ -197,7 +264,9 @@ if __name__ == "__main__":
 
             # Run the processing with the dynamic prompt and specified folders
             process_llm_parsing_reports(args.input_folder, args.bundle_size, # Passed args.input_folder
-                                        dynamic_prompt_instruction, args.bundled_folder, args.result_folder)
+                                        dynamic_prompt_instruction, args.bundled_folder, args.result_folder,
+                                        resume=args.resume, max_input_tokens=args.max_input_tokens,
+                                        max_output_tokens=args.max_output_tokens)
         except (FileNotFoundError, IOError) as e:
             print(e)
         except Exception as e:
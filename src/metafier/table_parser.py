@@ -0,0 +1,163 @@
+"""
+파일명: src/metafier/table_parser.py
+목적: LLM이 출력한 마크다운 표를 관대하게(tolerant) 파싱하고 번들 파일 목록과 대조
+기능:
+  - 스트리밍 파싱: 응답 조각을 feed()로 넣으면 완성된 행부터 반환
+  - 구분선(---) 누락, 코드펜스(```), 표 앞뒤 설명문, 반복된 머리글 허용
+  - 셀 안의 파이프: \\| 이스케이프는 복원, 열 수보다 많은 셀은 마지막 열에 합침, 부족하면 빈 값으로 채움
+  - reconcile_rows: 결과 행의 파일명을 번들 파일 목록과 대조하여 누락된 판독문만 골라냄
+  - file_positions: 결과 행마다 파일 목록 내 위치를 구함 (재시도 번들이 섞인 결과를 파일 순서로 병합할 때 사용)
+"""
+
+import os
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+_UNESCAPED_PIPE = re.compile(r"(?<!\\)\|")
+_SEPARATOR_CELL = re.compile(r"^:?-{3,}:?$")
+_FILENAME_HEADERS = ("filename", "file name", "file", "파일명", "파일")
+
+
+def split_cells(line: str) -> List[str]:
+    """표 한 줄을 셀 목록으로 나눕니다. 바깥쪽 파이프는 제거하고 \\| 는 | 로 복원합니다."""
+    line = line.strip()
+    cells = _UNESCAPED_PIPE.split(line)
+    if line.startswith("|"):
+        cells = cells[1:]
+    if line.endswith("|") and not line.endswith("\\|") and cells:
+        cells = cells[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in cells]
+
+
+def is_separator(cells: Sequence[str]) -> bool:
+    """머리글 아래 구분선(|---|:---:|) 여부"""
+    return bool(cells) and all(_SEPARATOR_CELL.match(cell.replace(" ", "")) for cell in cells)
+
+
+class MarkdownTableParser:
+    """마크다운 표 스트리밍 파서.
+
+    사용예시:
+        >>> parser = MarkdownTableParser()
+        >>> for chunk in llmchain.stream({"file_content": content}):
+        ...     parser.feed(chunk.content)
+        >>> parser.close()
+        >>> df = parser.to_dataframe()
+    """
+
+    def __init__(self):
+        self.columns: Optional[List[str]] = None
+        self.rows: List[List[str]] = []
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[List[str]]:
+        """응답 조각을 추가하고, 이번에 완성된 행 목록을 반환합니다."""
+        self._buffer += chunk or ""
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._process(lines)
+
+    def close(self) -> List[List[str]]:
+        """남은 버퍼(마지막 줄)를 처리합니다."""
+        lines, self._buffer = [self._buffer], ""
+        return self._process(lines)
+
+    def _process(self, lines: List[str]) -> List[List[str]]:
+        new_rows = []
+        for line in lines:
+            row = self._process_line(line)
+            if row is not None:
+                self.rows.append(row)
+                new_rows.append(row)
+        return new_rows
+
+    def _process_line(self, line: str) -> Optional[List[str]]:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("```") or "|" not in stripped:
+            return None  # 빈 줄, 코드펜스, 표 밖의 설명문
+        cells = split_cells(stripped)
+        if is_separator(cells):
+            return None
+        if self.columns is None:
+            self.columns = cells  # 구분선이 없어도 첫 표 줄을 머리글로 사용
+            return None
+        if cells == self.columns:
+            return None  # 반복된 머리글
+
+        width = len(self.columns)
+        if len(cells) > width:
+            # 셀 안에 이스케이프되지 않은 파이프가 있던 경우: 넘친 셀을 마지막 열에 합침
+            cells = cells[:width - 1] + [" | ".join(cells[width - 1:])]
+        elif len(cells) < width:
+            cells = cells + [""] * (width - len(cells))
+        return cells
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(self.rows, columns=self.columns or [])
+
+
+def parse_markdown_table(text: str) -> pd.DataFrame:
+    """완성된 LLM 응답 전체를 한 번에 파싱합니다."""
+    parser = MarkdownTableParser()
+    parser.feed(text)
+    parser.close()
+    return parser.to_dataframe()
+
+
+def _normalize_filename(value: str) -> str:
+    return os.path.basename(str(value).strip().strip("`*'\"").strip())
+
+
+def find_filename_column(df: pd.DataFrame, filenames: Sequence[str]) -> Optional[str]:
+    """파일명이 들어 있는 열을 찾습니다. 머리글 이름을 우선하고, 없으면 값이 가장 많이 일치하는 열."""
+    for column in df.columns:
+        if str(column).strip().lower() in _FILENAME_HEADERS:
+            return column
+    names = set(filenames) | {os.path.splitext(f)[0] for f in filenames}
+    best, best_hits = None, 0
+    for column in df.columns:
+        hits = df[column].map(_normalize_filename).isin(names).sum()
+        if hits > best_hits:
+            best, best_hits = column, hits
+    return best
+
+
+def _match_rows(df: pd.DataFrame, filenames: Sequence[str]) -> Optional[pd.Series]:
+    """행마다 대응하는 filenames의 파일명 (없으면 NaN). 파일명 열을 찾지 못하면 None."""
+    column = find_filename_column(df, filenames)
+    if column is None:
+        return None
+    by_name = {}
+    for filename in filenames:
+        by_name[filename] = filename
+        by_name.setdefault(os.path.splitext(filename)[0], filename)
+    return df[column].map(lambda value: by_name.get(_normalize_filename(value)))
+
+
+def reconcile_rows(df: pd.DataFrame, filenames: Sequence[str]) -> Tuple[pd.DataFrame, Optional[List[str]]]:
+    """결과 행을 번들 파일 목록과 대조합니다.
+
+    반환값:
+        (번들 파일에 해당하는 행만 남긴 DataFrame, 결과가 없는 파일명 목록)
+        파일명 열을 찾지 못하면 (df, None) — 호출측에서 행 수로 판단해야 함
+
+    주의사항:
+        - 파일명은 확장자 유무(report_1 / report_1.txt)와 경로를 무시하고 비교합니다
+        - 한 파일에 여러 행(예: 검체 여러 개)이 있으면 모두 유지합니다
+    """
+    matched = _match_rows(df, filenames)
+    if matched is None:
+        return df, None
+    found = set(matched.dropna())
+    missing = [filename for filename in filenames if filename not in found]
+    return df[matched.notna()].reset_index(drop=True), missing
+
+
+def file_positions(df: pd.DataFrame, filenames: Sequence[str]) -> Optional[pd.Series]:
+    """행마다 해당 파일의 filenames 내 위치를 반환합니다. (대응 파일이 없으면 NaN, 파일명 열이 없으면 None)"""
+    matched = _match_rows(df, filenames)
+    if matched is None:
+        return None
+    position = {filename: index for index, filename in enumerate(filenames)}
+    return matched.map(position)
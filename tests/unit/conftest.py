@@ -0,0 +1,171 @@
+"""
+파일명: tests/unit/conftest.py
+목적: 단위 테스트 공용 픽스처
+주요 기능:
+- database: psycopg2 대신 가짜 드라이버 모듈을 주입한 common.database (DB 서버 없이 실행)
+"""
+
+import importlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+
+class FakeError(Exception):
+    pass
+
+
+class FakeComposable:
+    """psycopg2.sql 조합 객체 대체: 조합된 SQL 문자열을 그대로 보관"""
+
+    def __init__(self, text):
+        self.text = text
+
+    def as_string(self, conn):
+        return self.text
+
+
+class FakeSQL(FakeComposable):
+    def format(self, *args):
+        return FakeComposable(self.text.format(*[arg.text for arg in args]))
+
+    def join(self, items):
+        return FakeComposable(self.text.join(item.text for item in items))
+
+
+def fake_identifier(*names):
+    return FakeComposable(".".join(f'"{name}"' for name in names))
+
+
+def fake_literal(value):
+    return FakeComposable(f"'{value}'")
+
+
+class FakeCursor:
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.rowcount = 0
+        self.itersize = 2000
+        self.description = None
+        self._rows = iter(())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.fail:
+            raise FakeError("server closed the connection")
+        time.sleep(self.conn.delay)
+        self.conn.queries.append(query.as_string(self.conn) if isinstance(query, FakeComposable) else query)
+        self.rowcount = self.conn.execute_rowcount
+        self._rows = iter(self.conn.result_rows)
+
+    def copy_expert(self, query, buffer):
+        self.conn.copies.append((query, buffer.getvalue()))
+
+    def __iter__(self):
+        return self._rows
+
+    def fetchmany(self, size):
+        rows = [row for _, row in zip(range(size), self._rows)]
+        self.conn.fetch_sizes.append(len(rows))
+        self.description = [(column,) for column in self.conn.result_columns]
+        return rows
+
+    def executemany(self, query, data_list):
+        self.rowcount = len(data_list)
+
+    def fetchall(self):
+        return [(1,)]
+
+
+class FakeConnection:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.closed = 0
+        self.fail = False
+        self.queries = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.cursors = []
+        self.fetch_sizes = []
+        self.result_rows = []
+        self.result_columns = []
+        self.copies = []
+        self.execute_rowcount = 0
+
+    def cursor(self, name=None):
+        cursor = FakeCursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    """ThreadedConnectionPool 대체: maxconn개를 넘겨 빌리면 PoolError처럼 즉시 예외"""
+
+    def __init__(self, minconn, maxconn, **params):
+        self.maxconn = maxconn
+        self.closed = False
+        self.idle = []
+        self.created = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.delay = 0.0  # 새 연결의 쿼리 실행 지연 (동시성 테스트용)
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        with self._lock:
+            if self.in_use >= self.maxconn:
+                raise FakeError("connection pool exhausted")
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            if self.idle:
+                return self.idle.pop()
+            self.created += 1
+            return FakeConnection(self.delay)
+
+    def putconn(self, conn, close=False):
+        with self._lock:
+            self.in_use -= 1
+            if close:
+                conn.closed = 1
+            else:
+                self.idle.append(conn)
+
+    def closeall(self):
+        self.closed = True
+
+
+@pytest.fixture
+def database(monkeypatch):
+    fake = types.ModuleType("psycopg2")
+    fake.Error = FakeError
+    fake_pool = types.ModuleType("psycopg2.pool")
+    fake_pool.ThreadedConnectionPool = FakePool
+    fake.pool = fake_pool
+    fake.sql = types.ModuleType("psycopg2.sql")
+    fake.sql.SQL = FakeSQL
+    fake.sql.Identifier = fake_identifier
+    fake.sql.Literal = fake_literal
+    monkeypatch.setitem(sys.modules, "psycopg2", fake)
+    monkeypatch.setitem(sys.modules, "psycopg2.pool", fake_pool)
+    monkeypatch.setitem(sys.modules, "psycopg2.sql", fake.sql)
+    monkeypatch.delitem(sys.modules, "common.database", raising=False)
+    monkeypatch.setenv("DB_POOL_PING_SECONDS", "30")
+    module = importlib.import_module("common.database")
+    yield module
+    module.close_pool()
+    sys.modules.pop("common.database", None)
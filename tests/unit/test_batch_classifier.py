@@ -0,0 +1,43 @@
+"""
+파일명: tests/unit/test_batch_classifier.py
+목적: 배치 분류 프롬프트 생성과 응답 검증(parse_batch_labels) 동작 검증
+주요 기능:
+- ID가 붙은 판독문들이 하나의 프롬프트로 묶이는지 확인
+- 올바른 JSON 배열만 {ID: 라벨}로 반환하고 누락/중복/불일치/잘못된 라벨은 None을 반환하는지 확인
+"""
+
+from metafier.batch_classifier import build_batch_prompt, chunk_items, parse_batch_labels
+
+IDS = ["R1", "R2"]
+
+
+def test_build_batch_prompt_includes_ids_and_reports():
+    prompt = build_batch_prompt([("R1", "폐 결절"), ("R2", "골 전이 의심")])
+    assert "2건" in prompt
+    assert "### ID: R1\n폐 결절" in prompt
+    assert "### ID: R2\n골 전이 의심" in prompt
+    assert prompt.index("R1\n") < prompt.index("R2\n")
+
+
+def test_parse_valid_response_with_code_fence():
+    response = '```json\n[{"id": "R2", "label": "높음"}, {"id": "R1", "label": "낮음"}]\n```'
+    assert parse_batch_labels(response, IDS) == {"R1": "낮음", "R2": "높음"}
+
+
+def test_parse_rejects_missing_extra_or_duplicate_ids():
+    assert parse_batch_labels('[{"id": "R1", "label": "낮음"}]', IDS) is None
+    assert parse_batch_labels(
+        '[{"id": "R1", "label": "낮음"}, {"id": "R2", "label": "낮음"}, {"id": "R3", "label": "높음"}]', IDS) is None
+    assert parse_batch_labels('[{"id": "R1", "label": "낮음"}, {"id": "R1", "label": "높음"}]', IDS) is None
+
+
+def test_parse_rejects_bad_label_and_non_json():
+    assert parse_batch_labels('[{"id": "R1", "label": "낮음"}, {"id": "R2", "label": "아마도"}]', IDS) is None
+    assert parse_batch_labels("R1: 낮음, R2: 높음", IDS) is None
+    assert parse_batch_labels("[R1, R2]", IDS) is None
+    assert parse_batch_labels(None, IDS) is None
+
+
+def test_chunk_items():
+    assert chunk_items([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    assert chunk_items([], 3) == []
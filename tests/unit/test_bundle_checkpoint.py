@@ -0,0 +1,36 @@
+"""
+파일명: tests/unit/test_bundle_checkpoint.py
+목적: BundleManifest(번들 처리 체크포인트)의 동작 검증
+주요 기능:
+- 완료 번들은 입력 해시가 같고 결과 파일이 있을 때만 건너뛰는지 확인
+- 실패 기록 및 재시작 후 매니페스트 유지 확인
+"""
+
+from metafier.bundle_checkpoint import BundleManifest, bundle_input_hash
+
+
+def test_done_requires_same_hash_and_result_file(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    result_path = tmp_path / "result_1.csv"
+    result_path.write_text("a|b\n")
+    input_hash = bundle_input_hash("prompt", "Filename: 1.txt\nreport")
+
+    manifest = BundleManifest(manifest_path)
+    manifest.mark(1, ["1.txt"], input_hash, "done", str(result_path))
+    manifest.mark(2, ["2.txt"], "other", "failed", error="429")
+
+    reopened = BundleManifest(manifest_path)
+    assert reopened.is_done(1, input_hash)
+    assert not reopened.is_done(1, bundle_input_hash("changed prompt", "Filename: 1.txt\nreport"))
+    assert not reopened.is_done(2, "other")
+    assert not reopened.is_done(3, input_hash)
+    assert reopened.bundles["2"]["error"] == "429"
+
+    result_path.unlink()
+    assert not reopened.is_done(1, input_hash)
+
+
+def test_corrupt_manifest_starts_empty(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text("{not json")
+    assert BundleManifest(manifest_path).bundles == {}
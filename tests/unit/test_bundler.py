@@ -0,0 +1,50 @@
+"""
+파일명: tests/unit/test_bundler.py
+목적: 토큰 예산 기반 번들러(pack_bundles, split_bundle)의 동작 검증
+주요 기능:
+- 입력/출력 토큰 예산과 최대 판독문 수 안에서 순서를 유지하며 번들을 채우는지 확인
+- 예산보다 큰 판독문은 단독 번들이 되는지 확인
+"""
+
+from metafier.bundler import build_bundle_content, pack_bundles, split_bundle
+
+
+def reports(*lengths):
+    return [(f"report_{i}.txt", "가" * length) for i, length in enumerate(lengths, 1)]
+
+
+def names(bundles):
+    return [[filename for filename, _ in bundle] for bundle in bundles]
+
+
+def test_packs_by_input_tokens_preserving_order():
+    # 판독문 300자 ≒ 약 105토큰(머리글 포함)
+    bundles = pack_bundles(reports(300, 300, 300, 30, 30), max_input_tokens=250, max_output_tokens=10000)
+    assert names(bundles) == [
+        ["report_1.txt", "report_2.txt"],
+        ["report_3.txt", "report_4.txt", "report_5.txt"],
+    ]
+
+
+def test_output_budget_and_max_reports_limit_bundle():
+    items = reports(*[10] * 7)
+    assert [len(b) for b in pack_bundles(items, max_output_tokens=600, output_tokens_per_report=200)] == [3, 3, 1]
+    assert [len(b) for b in pack_bundles(items, max_reports=4)] == [4, 3]
+
+
+def test_oversized_report_gets_own_bundle():
+    bundles = pack_bundles(reports(30, 3000, 30), max_input_tokens=500)
+    assert names(bundles) == [["report_1.txt"], ["report_2.txt"], ["report_3.txt"]]
+
+
+def test_prompt_tokens_reduce_budget():
+    items = reports(300, 300)
+    assert len(pack_bundles(items, max_input_tokens=250)) == 1
+    assert len(pack_bundles(items, max_input_tokens=250, prompt_tokens=100)) == 2
+
+
+def test_split_bundle_and_content():
+    items = reports(1, 2, 3)
+    assert names(split_bundle(items)) == [["report_1.txt", "report_2.txt"], ["report_3.txt"]]
+    assert split_bundle(items[:1]) == [items[:1]]
+    assert build_bundle_content(items[:1]) == "Filename: report_1.txt\n가\n\n---\n\n"
@@ -0,0 +1,72 @@
+"""
+파일명: tests/unit/test_cipher_registry.py
+목적: get_cipher 암호화 객체 캐시(재사용, 키 교체 시 재생성) 동작 검증
+주요 기능:
+- 같은 alphabet 종류는 같은 FF3 객체를 재사용하는지 확인
+- 환경변수만 바뀌어서는 재생성되지 않고 rotate_cipher_key() 호출 시 새 키로 재생성되는지 확인
+- 환경변수가 바뀐 뒤 처음 만드는 다른 alphabet 객체도 고정된 키를 쓰는지 확인
+- 가명 캐시도 환경변수가 아닌 고정된 키(지문)로 열리는지 확인
+"""
+
+import pytest
+
+from common import get_cipher as cipher_module
+from common import pseudonym_cache
+
+KEY = "0123456789abcdef0123456789abcdef"
+OTHER_KEY = "fedcba9876543210fedcba9876543210"
+
+
+@pytest.fixture
+def ff3_env(monkeypatch):
+    monkeypatch.setenv("FF3_KEY", KEY)
+    monkeypatch.setenv("FF3_TWEAK", "abcdef12345678")
+    monkeypatch.setenv("FF3_NUMERIC", "0123456789")
+    monkeypatch.setenv("FF3_ALPHANUMERIC", "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+    # rotate_cipher_key()의 .env 재로딩이 테스트 환경변수를 덮어쓰지 않도록
+    monkeypatch.setattr(cipher_module, "load_dotenv", lambda *args, **kwargs: None)
+    cipher_module.clear_cipher_cache()
+    yield monkeypatch
+    cipher_module.clear_cipher_cache()
+
+
+def test_cipher_is_reused_per_alphabet(ff3_env):
+    numeric = cipher_module.get_cipher("numeric")
+    assert cipher_module.get_cipher("numeric") is numeric
+    assert cipher_module.get_cipher("alphanumeric") is not numeric
+
+
+def test_rebuilds_only_on_rotation(ff3_env):
+    cipher = cipher_module.get_cipher("numeric")
+    encrypted = cipher.encrypt("12345678")
+
+    ff3_env.setenv("FF3_KEY", OTHER_KEY)
+    assert cipher_module.get_cipher("numeric") is cipher
+
+    fingerprint = cipher_module.rotate_cipher_key()
+    assert fingerprint == cipher_module.get_key_fingerprint(OTHER_KEY)
+    rotated = cipher_module.get_cipher("numeric")
+    assert rotated is not cipher
+    assert rotated.encrypt("12345678") != encrypted
+
+
+def test_other_alphabet_uses_pinned_key(ff3_env):
+    cipher_module.get_cipher("numeric")
+    ff3_env.setenv("FF3_KEY", OTHER_KEY)
+    alphanumeric = cipher_module.get_cipher("alphanumeric")
+
+    cipher_module.clear_cipher_cache()
+    ff3_env.setenv("FF3_KEY", KEY)
+    original = cipher_module.get_cipher("alphanumeric")
+    assert alphanumeric.encrypt("AB12cd34") == original.encrypt("AB12cd34")
+
+
+def test_pseudonym_cache_uses_pinned_key(ff3_env, tmp_path):
+    ff3_env.setattr(pseudonym_cache, "load_dotenv", lambda *args, **kwargs: None)
+    ff3_env.setenv("FF3_CACHE_PATH", str(tmp_path / "pseudonyms.db"))
+    cipher_module.get_cipher("numeric")
+    ff3_env.setenv("FF3_KEY", OTHER_KEY)
+
+    cache = pseudonym_cache.get_pseudonym_cache("numeric")
+    assert cache.key_fingerprint == cipher_module.get_active_fingerprint() == cipher_module.get_key_fingerprint(KEY)
+    cache.close()
@@ -0,0 +1,89 @@
+"""
+파일명: tests/unit/test_database_copy.py
+목적: copy_dataframe의 COPY용 CSV 청크 변환, 컬럼 타입 매핑, 실행 SQL 검증
+주요 기능:
+- chunk_rows 단위로 나뉘어 전체 행이 빠짐없이 기록되는지 확인
+- 결측값은 \\N, 빈 문자열은 빈 문자열로 구분되어 기록되는지 확인
+- 일반 적재와 upsert(스테이징 테이블 + ON CONFLICT) 경로의 실행 SQL, 청크 수, 커밋 횟수 확인
+- 결측값이 있는 정수 컬럼은 1.0이 아닌 1로 전송되고 BIGINT로 생성되는지, upsert 테이블 생성 시 UNIQUE 제약이 붙는지 확인
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def test_iter_csv_chunks_splits_rows(database):
+    df = pd.DataFrame({"id": range(5), "name": list("abcde")})
+    chunks = [buffer.getvalue() for buffer in database.iter_csv_chunks(df, chunk_rows=2)]
+    assert len(chunks) == 3
+    assert "".join(chunks).splitlines() == ["0,a", "1,b", "2,c", "3,d", "4,e"]
+
+
+def test_iter_csv_chunks_distinguishes_null_and_empty(database):
+    df = pd.DataFrame({"a": ["x", None, ""], "b": [1.5, np.nan, 2.0]})
+    lines = next(database.iter_csv_chunks(df)).getvalue().splitlines()
+    assert lines == ["x,1.5", "\\N,\\N", ",2.0"]
+
+
+def test_pg_type_mapping(database):
+    df = pd.DataFrame({
+        "i": [1], "f": [1.0], "b": [True], "t": pd.to_datetime(["2025-01-01"]), "s": ["x"],
+    })
+    assert [database._pg_type(df[c].dtype) for c in df.columns] == [
+        "BIGINT", "DOUBLE PRECISION", "BOOLEAN", "TIMESTAMP", "TEXT",
+    ]
+
+
+def borrow(database):
+    with database.pooled_connection() as conn:
+        pass
+    conn.queries.clear()  # 새 연결의 상태 확인(SELECT 1) 기록 제외
+    return conn
+
+
+def test_copy_dataframe_plain(database):
+    conn = borrow(database)
+    df = pd.DataFrame({"id": range(5), "name": list("abcde")})
+
+    assert database.copy_dataframe(df, "public.reports", create_table=True, chunk_rows=2) == 5
+
+    assert conn.queries == ['CREATE TABLE IF NOT EXISTS "public"."reports" ("id" BIGINT, "name" TEXT)']
+    copy_sql = 'COPY "public"."reports" ("id", "name") FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+    assert [query for query, _ in conn.copies] == [copy_sql] * 3
+    assert "".join(data for _, data in conn.copies).splitlines() == ["0,a", "1,b", "2,c", "3,d", "4,e"]
+    assert conn.commits == 1
+
+
+@pytest.mark.parametrize("columns, conflict_action", [
+    (["id", "name"], 'DO UPDATE SET "name" = EXCLUDED."name"'),
+    (["id"], "DO NOTHING"),
+])
+def test_copy_dataframe_upsert(database, columns, conflict_action):
+    conn = borrow(database)
+    conn.execute_rowcount = 2
+    df = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+
+    assert database.copy_dataframe(df, "reports", columns=columns, upsert_keys=["id"]) == 2
+
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    assert conn.queries == [
+        'CREATE TEMP TABLE "_stage_reports" (LIKE "reports" INCLUDING DEFAULTS) ON COMMIT DROP',
+        f'INSERT INTO "reports" ({column_list}) SELECT {column_list} FROM "_stage_reports" '
+        f'ON CONFLICT ("id") {conflict_action}',
+    ]
+    assert [query.split(" FROM STDIN")[0] for query, _ in conn.copies] == [f'COPY "_stage_reports" ({column_list})']
+    assert conn.commits == 1
+
+
+def test_copy_dataframe_integer_column_with_nulls(database):
+    conn = borrow(database)
+    conn.execute_rowcount = 2
+    df = pd.DataFrame({"id": [1, 2], "count": [3, None], "score": [0.5, None]})
+    assert df["count"].dtype == "float64"
+
+    database.copy_dataframe(df, "reports", upsert_keys=["id"], create_table=True)
+
+    assert conn.queries[0] == ('CREATE TABLE IF NOT EXISTS "reports" '
+                               '("id" BIGINT, "count" BIGINT, "score" DOUBLE PRECISION, UNIQUE ("id"))')
+    assert conn.copies[0][1].splitlines() == ["1,3,0.5", "2,\\N,\\N"]
@@ -0,0 +1,89 @@
+"""
+파일명: tests/unit/test_database_pool.py
+목적: common.database 연결 풀(pooled_connection)의 빌림/반납 동작 검증
+주요 기능:
+- 같은 연결이 재사용되어 호출마다 새로 연결하지 않는지 확인
+- 예외 시 롤백 후 반납, 끊긴 연결은 폐기하고 새 연결을 빌려주는지 확인
+- 대신 받은 연결도 끊겨 있으면 다시 확인하여 정상 연결을 빌려주는지 확인
+- 풀 크기보다 많은 스레드가 동시에 쿼리해도 반납을 기다려 모두 성공하는지, 대기 시간 초과 시 오류인지 확인
+- psycopg2 대신 가짜 드라이버 모듈을 주입하여 DB 서버 없이 실행
+"""
+
+import gc
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+def test_connections_are_reused(database):
+    assert database.execute_query("SELECT 1", fetch_all=True) == [(1,)]
+    assert database.execute_many("INSERT", [(1,), (2,)]) == 2
+    assert database.get_pool().created == 1
+
+
+def test_exception_rolls_back_and_returns_connection(database):
+    with pytest.raises(ValueError):
+        with database.pooled_connection() as conn:
+            before = conn.rollbacks
+            raise ValueError("boom")
+    assert conn.rollbacks == before + 1
+    assert database.get_pool().idle == [conn]
+
+
+def test_stale_connection_is_replaced(database, monkeypatch):
+    with database.pooled_connection() as first:
+        pass
+    first.fail = True
+    monkeypatch.setenv("DB_POOL_PING_SECONDS", "0")
+    with database.pooled_connection() as second:
+        pass
+    assert second is not first
+    assert first.closed
+
+
+def test_replacement_connection_is_rechecked(database, monkeypatch):
+    with database.pooled_connection() as first:
+        with database.pooled_connection() as second:
+            pass
+    first.fail = second.fail = True
+    monkeypatch.setenv("DB_POOL_PING_SECONDS", "0")
+    with database.pooled_connection() as third:
+        pass
+    assert third not in (first, second)
+    assert first.closed and second.closed
+    assert database.get_pool().created == 3
+
+
+def test_last_used_does_not_outlive_connection(database):
+    with database.pooled_connection() as conn:
+        pass
+    assert conn in database._last_used
+    database.get_pool().idle.clear()
+    del conn
+    gc.collect()  # 가짜 연결은 커서와 순환 참조
+    assert len(database._last_used) == 0
+
+
+def test_more_threads_than_maxconn_wait_for_a_connection(database, monkeypatch):
+    monkeypatch.setenv("DB_POOL_MAXCONN", "2")
+    database.close_pool()
+    db_pool = database.get_pool()
+    db_pool.delay = 0.02
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: database.execute_query("SELECT 1", fetch_all=True), range(16)))
+
+    assert results == [[(1,)]] * 16
+    assert db_pool.peak_in_use == 2
+    assert db_pool.in_use == 0
+
+
+def test_waiting_for_a_connection_times_out(database, monkeypatch):
+    monkeypatch.setenv("DB_POOL_MAXCONN", "1")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0.05")
+    database.close_pool()
+    with database.pooled_connection():
+        with pytest.raises(database.psycopg2.Error):
+            with database.pooled_connection():
+                pass
+    assert database.get_pool().in_use == 0
@@ -0,0 +1,34 @@
+"""
+파일명: tests/unit/test_database_stream.py
+목적: 서버측 커서 스트리밍 조회(iter_query, iter_query_frames) 동작 검증
+주요 기능:
+- named cursor와 itersize를 사용하는지 확인
+- 결과가 chunk_rows 단위 DataFrame으로 나뉘고, 중간에 멈춰도 연결이 풀에 반납되는지 확인
+"""
+
+
+def test_iter_query_uses_named_cursor(database):
+    with database.pooled_connection() as conn:
+        conn.result_rows = [(1, "a"), (2, "b"), (3, "c")]
+    assert list(database.iter_query("SELECT id, name FROM t", itersize=500)) == conn.result_rows
+    cursor = conn.cursors[-1]
+    assert cursor.name and cursor.itersize == 500
+
+
+def test_iter_query_frames_chunks(database):
+    with database.pooled_connection() as conn:
+        conn.result_rows = [(i, f"r{i}") for i in range(5)]
+        conn.result_columns = ["id", "report"]
+    frames = list(database.iter_query_frames("SELECT id, report FROM t", chunk_rows=2))
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+    assert list(frames[0].columns) == ["id", "report"]
+    assert frames[-1]["report"].tolist() == ["r4"]
+
+
+def test_early_stop_returns_connection(database):
+    with database.pooled_connection() as conn:
+        conn.result_rows = [(i,) for i in range(10)]
+    stream = database.iter_query("SELECT id FROM t")
+    assert next(stream) == (0,)
+    stream.close()
+    assert database.get_pool().idle == [conn]
@@ -0,0 +1,67 @@
+"""
+파일명: tests/unit/test_deid_plan.py
+목적: DeidPlan(검증·컴파일된 비식별화 실행 계획)의 생성, pickle, 적용 결과 검증
+주요 기능:
+- 계획과 targets 딕셔너리로 deidentify_columns를 호출한 결과가 같은지 확인
+- pickle 왕복 후에도 같은 결과를 내는지, serial_number 규칙만 분리되는지 확인
+- 지원하지 않는 정책은 제외하고 잘못된 정규식은 ValueError를 내는지 확인
+"""
+
+import pickle
+
+import pandas as pd
+import pytest
+from ff3 import FF3Cipher
+
+from deidentifier.deid_plan import DeidPlan
+from deidentifier.deid_utils import deidentify_columns
+
+KEY = "0123456789abcdef0123456789abcdef"
+TWEAK = "abcdef12345678"
+NUMERIC = FF3Cipher.withCustomAlphabet(KEY, TWEAK, "0123456789")
+ALPHANUMERIC = FF3Cipher.withCustomAlphabet(KEY, TWEAK, "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+
+TARGETS = {
+    "patient_id": {"deidentification_policy": "pseudonymization", "pseudonymization_policy": "fpe_numeric",
+                   "regular_expression": r"등록번호\s*:\s*(?P<patient_id>\d{8})"},
+    "result_date": {"deidentification_policy": "pseudonymization", "pseudonymization_policy": "month_to_first_day"},
+    "pathology_id": {"deidentification_policy": "anonymization", "anonymization_policy": "serial_number"},
+    "patient_name": {"deidentification_policy": "anonymization", "anonymization_policy": "masking",
+                     "anonymization_value": "OOOO"},
+    "icd_code": {"deidentification_policy": "no_apply"},
+    "unknown": {"deidentification_policy": "pseudonymization", "pseudonymization_policy": "rot13"},
+}
+
+
+def make_df():
+    return pd.DataFrame({
+        "patient_id": ["12345678", "87654321"],
+        "extracted_result_date": ["2025-03-14", "2024-11-30"],
+        "patient_name": ["홍길동", None],
+        "icd_code": ["C34.9", "C50.9"],
+    })
+
+
+def test_plan_matches_dict_targets_and_survives_pickle():
+    plan = pickle.loads(pickle.dumps(DeidPlan.from_targets(TARGETS)))
+    assert [rule.key for rule in plan.rules] == ["patient_id", "result_date", "pathology_id", "patient_name"]
+    assert plan.rules[0].pattern.search("등록번호: 12345678").group("patient_id") == "12345678"
+
+    expected = deidentify_columns(make_df(), TARGETS, ALPHANUMERIC, NUMERIC)
+    result = deidentify_columns(make_df(), plan, ALPHANUMERIC, NUMERIC)
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["extracted_result_date"].tolist() == ["2025-03-01", "2024-11-01"]
+    assert result["patient_name"].tolist() == ["OOOO", None]
+    assert result["icd_code"].tolist() == ["C34.9", "C50.9"]
+
+
+def test_split_serial():
+    parallel_plan, serial_plan = DeidPlan.from_targets(TARGETS).split_serial()
+    assert [rule.key for rule in serial_plan.rules] == ["pathology_id"]
+    assert "pathology_id" not in [rule.key for rule in parallel_plan.rules]
+
+
+def test_invalid_regex_raises():
+    with pytest.raises(ValueError):
+        DeidPlan.from_targets({"bad": {"deidentification_policy": "anonymization", "anonymization_policy": "masking",
+                                       "regular_expression": "(unclosed"}})
@@ -3,15 +3,23 @@
 목적: read_excels 함수의 동작을 단위 테스트로 검증
 주요 기능:
 - 임시 폴더에 엑셀 파일을 생성하고, read_excels가 올바른 DataFrame 딕셔너리를 반환하는지 확인
+- iter_excels / iter_excel_chunks / ExcelStreamWriter 스트리밍 입출력이 일괄 입출력과 같은지 확인
+- save_frames / iter_frames / iter_frame_chunks 중간산출물(parquet, feather) 왕복 확인
+- list_frame_files가 접두사로 시작하는 파일만, 하위 폴더 없이 찾는지 확인
+- sniff_excel_format 매직 바이트 판별 및 엔진 선택 캐시 확인
 변경이력:
   - 2025-09-24: 최초 생성 (BenKorea)
 """
 
 import os
 import pandas as pd
+import common.excel_io as excel_io
+import pytest
 import tempfile
 from pathlib import Path
-from common.excel_io import read_excels
+from common.excel_io import (ExcelStreamWriter, build_output_filename, iter_excel_chunks, iter_excels,
+                             iter_frame_chunks, iter_frames, list_frame_files, read_excel_file, read_excels,
+                             save_frames, sniff_excel_format)
 
 def test_read_excels(tmp_path):
     # 임시 엑셀 파일 생성
@@ -31,7 +39,103 @@ def test_read_excels(tmp_path):
     pd.testing.assert_frame_equal(result['test1.xlsx'], df1)
     pd.testing.assert_frame_equal(result['test2.xls'], df2)
 
+def test_iter_excels(tmp_path):
+    df1 = pd.DataFrame({'a': [1, 2], 'b': [3, 4]})
+    df1.to_excel(tmp_path / 'test1.xlsx', index=False)
+    df1.to_excel(tmp_path / 'test2.xlsx', index=False)
+
+    result = list(iter_excels(str(tmp_path)))
+
+    assert [name for name, _ in result] == ['test1.xlsx', 'test2.xlsx']
+    pd.testing.assert_frame_equal(result[0][1], df1)
+
+@pytest.mark.parametrize("engine", ["openpyxl", "calamine"])
+def test_iter_excel_chunks(tmp_path, engine):
+    df = pd.DataFrame({'id': range(7), 'name': list('abcdefg'), 'score': [0.5, 1.0, None, 2.5, 3.0, 4.0, 5.5]})
+    file = tmp_path / 'big.xlsx'
+    df.to_excel(file, index=False)
+
+    chunks = list(iter_excel_chunks(file, chunk_rows=3, engine=engine))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    merged = pd.concat(chunks)
+    pd.testing.assert_frame_equal(merged, pd.read_excel(file), check_dtype=False)
+
+def test_excel_stream_writer_roundtrip(tmp_path):
+    df = pd.DataFrame({'id': range(5), 'name': ['a', float('nan'), 'c', 'd', 'e']})
+    output = tmp_path / 'out' / build_output_filename('report.xls', prefix='deid_')
+
+    with ExcelStreamWriter(output) as writer:
+        for start in range(0, len(df), 2):
+            writer.append(df.iloc[start:start + 2])
+
+    assert output.name == 'deid_report.xlsx'
+    assert writer.rows_written == 5
+    pd.testing.assert_frame_equal(pd.read_excel(output), df)
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_save_and_iter_frames(tmp_path, fmt):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({'patient_id': ['00000001', None], 'mixed': [1, 'a'], 'score': [0.5, 1.5]})
+
+    save_frames(str(tmp_path), {'report1.xls': df}, prefix='structured_', fmt=fmt)
+    result = list(iter_frames(str(tmp_path), fmt))
+
+    assert [name for name, _ in result] == [f'structured_report1.{fmt}']
+    assert build_output_filename(result[0][0], prefix='deid_') == 'deid_structured_report1.xlsx'
+    loaded = result[0][1]
+    assert loaded['patient_id'].tolist()[0] == '00000001'
+    assert loaded['mixed'].tolist() == ['1', 'a']
+
+    chunks = list(iter_frame_chunks(tmp_path / result[0][0], chunk_rows=1))
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks), loaded)
+
+def test_list_frame_files_prefix_and_depth(tmp_path):
+    for name in ['structured_a.parquet', 'validation_a.parquet', 'nested/structured_b.parquet']:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).touch()
+
+    assert [f.name for f in list_frame_files(str(tmp_path), 'parquet', prefix='structured_')] == ['structured_a.parquet']
+    assert [f.name for f in list_frame_files(str(tmp_path), 'parquet', prefix='structured_', recursive=True)] == [
+        'structured_b.parquet', 'structured_a.parquet']
+
+def test_save_frames_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        save_frames(str(tmp_path), {'a.xlsx': pd.DataFrame()}, fmt='csv')
+
 if __name__ == "__main__":
     import tempfile
     test_read_excels(Path(tempfile.mkdtemp()))
     print("테스트 통과!")
+
+
+def test_sniff_excel_format(tmp_path):
+    xlsx = tmp_path / "a.xlsx"
+    pd.DataFrame({"a": [1]}).to_excel(xlsx, index=False)
+    ole2 = tmp_path / "b.xls"
+    ole2.write_bytes(excel_io.OLE2_MAGIC + b"\x00" * 8)
+    text = tmp_path / "c.xls"
+    text.write_text("<html></html>")
+
+    assert sniff_excel_format(xlsx) == "zip"
+    assert sniff_excel_format(ole2) == "ole2"
+    assert sniff_excel_format(text) == "unknown"
+
+
+def test_read_excel_file_caches_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_io, "_engine_cache", {})
+    monkeypatch.setattr(excel_io, "_HAS_CALAMINE", True)
+    file = tmp_path / "a.xlsx"
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    df.to_excel(file, index=False)
+
+    # zip 형식은 xlrd를 시도하지 않음
+    assert excel_io.candidate_engines("zip") == ["calamine", "openpyxl"]
+
+    pd.testing.assert_frame_equal(read_excel_file(file), df)
+    assert excel_io._engine_cache["zip"] == "calamine"
+
+    # 캐시된 엔진을 가장 먼저 시도
+    excel_io._engine_cache["zip"] = "openpyxl"
+    assert excel_io.candidate_engines("zip") == ["openpyxl", "calamine"]
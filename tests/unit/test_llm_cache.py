@@ -0,0 +1,53 @@
+"""
+파일명: tests/unit/test_llm_cache.py
+목적: LLMResponseCache(LLM 응답 로컬 캐시)의 동작 검증
+주요 기능:
+- 모델/temperature/템플릿/입력 중 하나라도 다르면 별도 항목으로 취급되는지 확인
+- 실행 간 영속성 및 크기 한도 초과 시 LRU 삭제 확인
+"""
+
+from metafier.llm_cache import LLMResponseCache, get_llm_cache, make_cache_key
+
+MODEL = "gemini-2.0-flash"
+TEMPLATE = "{file_content}\n\nSummarize"
+
+
+def test_cache_key_covers_all_inputs():
+    base = make_cache_key(MODEL, 0.0, TEMPLATE, "report")
+    assert base == make_cache_key(MODEL, 0, TEMPLATE, "report")
+    assert base != make_cache_key("other-model", 0.0, TEMPLATE, "report")
+    assert base != make_cache_key(MODEL, 0.5, TEMPLATE, "report")
+    assert base != make_cache_key(MODEL, 0.0, TEMPLATE + "!", "report")
+    assert base != make_cache_key(MODEL, 0.0, TEMPLATE, "report2")
+
+
+def test_persists_across_instances(tmp_path):
+    db_path = tmp_path / "cache" / "llm.db"
+    cache = LLMResponseCache(db_path)
+    assert cache.get(MODEL, 0.0, TEMPLATE, "report") is None
+    cache.put(MODEL, 0.0, TEMPLATE, "report", "| a | b |")
+    cache.close()
+
+    reopened = LLMResponseCache(db_path)
+    assert reopened.get(MODEL, 0.0, TEMPLATE, "report") == "| a | b |"
+    assert reopened.get(MODEL, 0.0, TEMPLATE, "other") is None
+    reopened.close()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.db", max_bytes=25)
+    cache.put(MODEL, 0.0, TEMPLATE, "1", "x" * 10)
+    cache.put(MODEL, 0.0, TEMPLATE, "2", "y" * 10)
+    assert cache.get(MODEL, 0.0, TEMPLATE, "1") == "x" * 10  # 1을 최근 사용으로 갱신
+
+    cache.put(MODEL, 0.0, TEMPLATE, "3", "z" * 10)
+
+    assert cache.get(MODEL, 0.0, TEMPLATE, "2") is None
+    assert cache.get(MODEL, 0.0, TEMPLATE, "1") == "x" * 10
+    assert cache.get(MODEL, 0.0, TEMPLATE, "3") == "z" * 10
+    cache.close()
+
+
+def test_get_llm_cache_disabled_without_path(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    assert get_llm_cache() is None
@@ -0,0 +1,81 @@
+"""
+파일명: tests/unit/test_llm_executor.py
+목적: LLM 비동기 동시 실행기(run_prompts)의 동작 검증
+주요 기능:
+- 동시 실행 수 제한과 완료 순서대로의 결과 전달 확인
+- 429 응답 시 재시도, 그 외 예외는 즉시 실패로 전달되는지 확인
+- 토큰 버킷이 분당 한도를 넘는 요청을 대기시키는지 확인
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from metafier.llm_executor import TokenBucket, is_rate_limit_error, run_prompts
+
+
+class FakeLLM:
+    def __init__(self, fail_times=0, error=None):
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.fail_times = fail_times
+        self.error = error
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01 if prompt != "slow" else 0.05)
+            if self.error is not None and self.calls <= self.fail_times:
+                raise self.error
+            return SimpleNamespace(content=f" {prompt.upper()} ")
+        finally:
+            self.active -= 1
+
+
+def test_run_prompts_concurrency_and_order():
+    llm = FakeLLM()
+    results = []
+    jobs = [("a", "slow")] + [(str(i), f"p{i}") for i in range(5)]
+
+    run_prompts(llm, jobs, lambda key, response, error: results.append((key, response, error)), concurrency=3)
+
+    assert llm.max_active == 3
+    assert len(results) == 6
+    assert results[-1] == ("a", "SLOW", None)  # 느린 요청은 완료 순서대로 마지막에 전달
+    assert dict((k, r) for k, r, _ in results)["2"] == "P2"
+
+
+def test_run_prompts_retries_on_rate_limit():
+    llm = FakeLLM(fail_times=2, error=RuntimeError("429 Resource has been exhausted"))
+    results = []
+
+    run_prompts(llm, [("k", "hi")], lambda *args: results.append(args), backoff_seconds=0.01)
+
+    assert llm.calls == 3
+    assert results == [("k", "HI", None)]
+
+
+def test_run_prompts_reports_other_errors():
+    error = ValueError("bad request")
+    llm = FakeLLM(fail_times=1, error=error)
+    results = []
+
+    run_prompts(llm, [("k", "hi")], lambda *args: results.append(args))
+
+    assert llm.calls == 1
+    assert results == [("k", None, error)]
+    assert not is_rate_limit_error(error)
+
+
+def test_token_bucket_waits_when_exhausted():
+    async def consume():
+        bucket = TokenBucket(600)  # 초당 10토큰
+        start = time.monotonic()
+        await bucket.acquire(600)
+        await bucket.acquire(2)
+        return time.monotonic() - start
+
+    assert asyncio.run(consume()) >= 0.15
@@ -0,0 +1,71 @@
+"""
+파일명: tests/unit/test_logger.py
+목적: common.logger 래퍼의 지연(lazy) 로깅과 replace_with_* 치환 건수 요약 검증
+주요 기능:
+- 레벨이 꺼져 있으면 callable 메시지를 호출하지 않는지, %-style 인자가 기록 시점에 적용되는지 확인
+- 기록 위치(funcName)가 래퍼가 아닌 실제 호출 함수인지 확인
+- replace_with_* 함수가 행마다 로그 대신 치환 건수를 누적하는지 확인
+"""
+
+import logging
+
+import pytest
+
+from common import logger as logger_module
+from deidentifier import deid_utils
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    test_logger = logging.getLogger("ai4rm-test-lazy")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    test_logger.addHandler(handler)
+    monkeypatch.setitem(logger_module._logger_cache, logger_module.PROJECT_NAME, test_logger)
+    yield test_logger, handler
+    test_logger.removeHandler(handler)
+
+
+def test_disabled_level_skips_message_construction(captured):
+    _, handler = captured
+    calls = []
+    logger_module.log_debug(lambda: calls.append(1) or "expensive")
+    logger_module.log_debug("value=%s", object())
+    assert calls == []
+    assert handler.records == []
+    assert not logger_module.is_enabled(logging.DEBUG)
+
+
+def test_lazy_args_and_caller_location(captured):
+    test_logger, handler = captured
+    test_logger.setLevel(logging.DEBUG)
+    logger_module.log_info("%d건 처리 (100%%)", 3)
+    logger_module.log_debug(lambda: "built")
+    assert [record.getMessage() for record in handler.records] == ["3건 처리 (100%)", "built"]
+    assert handler.records[0].funcName == "test_lazy_args_and_caller_location"
+
+
+def test_replace_helpers_count_instead_of_logging(captured):
+    test_logger, handler = captured
+    test_logger.setLevel(logging.DEBUG)
+    deid_utils.replacement_counts.clear()
+    for text in ["환자: 홍길동", "환자: 김철수", "내용 없음"]:
+        deid_utils.replace_with_masked_id(text, r"환자: (?P<name>\S+)", "OOOO")
+    assert handler.records == []
+    assert deid_utils.replacement_counts["replace_with_masked_id"] == 2
+
+    deid_utils.flush_replacement_counts("[test] 'patient_name'")
+    assert [record.getMessage() for record in handler.records] == [
+        "[test] 'patient_name' 치환 건수: {'replace_with_masked_id': 2}"
+    ]
+    assert not deid_utils.replacement_counts
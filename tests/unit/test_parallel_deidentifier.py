@@ -0,0 +1,66 @@
+"""
+파일명: tests/unit/test_parallel_deidentifier.py
+목적: deidentify_files_parallel(다중 프로세스 비식별화) 결과가 단일 프로세스 처리와 일치하는지 검증
+주요 기능:
+- 행 청크 분할 후에도 파일별 행 순서와 FF3 가명화 결과가 유지되는지 확인
+- serial_number 일련번호가 파일 간에 중복되지 않는지 확인
+"""
+
+import pandas as pd
+import pytest
+
+from common.get_cipher import get_cipher
+from deidentifier.deid_utils import pseudonymize_id
+from deidentifier.deid_plan import DeidPlan
+from deidentifier.parallel_deidentifier import deidentify_files_parallel
+
+TARGETS = {
+    "patient_id": {"deidentification_policy": "pseudonymization", "pseudonymization_policy": "fpe_numeric"},
+    "pathology_id": {"deidentification_policy": "anonymization", "anonymization_policy": "serial_number"},
+    "patient_name": {"deidentification_policy": "anonymization", "anonymization_policy": "masking",
+                     "anonymization_value": "OOOO"},
+}
+
+
+@pytest.fixture
+def ff3_env(monkeypatch):
+    monkeypatch.setenv("FF3_KEY", "0123456789abcdef0123456789abcdef")
+    monkeypatch.setenv("FF3_TWEAK", "abcdef12345678")
+    monkeypatch.setenv("FF3_NUMERIC", "0123456789")
+    monkeypatch.setenv("FF3_ALPHANUMERIC", "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+    monkeypatch.delenv("FF3_CACHE_PATH", raising=False)
+
+
+def test_split_serial():
+    parallel_plan, serial_plan = DeidPlan.from_targets(TARGETS).split_serial()
+    assert [rule.key for rule in parallel_plan.rules] == ["patient_id", "patient_name"]
+    assert [rule.key for rule in serial_plan.rules] == ["pathology_id"]
+
+
+def test_deidentify_files_parallel(tmp_path, ff3_env):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    originals = {}
+    for n in range(2):
+        df = pd.DataFrame({
+            "patient_id": [f"{n}000000{i}" for i in range(5)],
+            "pathology_id": [f"S{n}-{i}" for i in range(5)],
+            "patient_name": ["홍길동"] * 5,
+        })
+        df.to_excel(input_dir / f"report{n}.xlsx", index=False)
+        originals[f"report{n}.xlsx"] = df
+
+    files = sorted(input_dir.glob("*.xlsx"))
+    saved = deidentify_files_parallel(files, TARGETS, str(output_dir), prefix="deid_", workers=2, chunk_rows=2)
+
+    assert saved == 2
+    cipher = get_cipher("numeric")
+    serials = []
+    for name, original in originals.items():
+        result = pd.read_excel(output_dir / f"deid_{name}", dtype=str)
+        expected_ids = [pseudonymize_id(x, cipher) for x in original["patient_id"]]
+        assert result["patient_id"].tolist() == expected_ids
+        assert (result["patient_name"] == "OOOO").all()
+        serials.extend(result["pathology_id"].tolist())
+    assert len(set(serials)) == 10
@@ -0,0 +1,89 @@
+"""
+파일명: tests/unit/test_pseudonym_cache.py
+목적: PseudonymCache(FF3 가명 영구 캐시)의 동작 검증
+주요 기능:
+- 실행 간 영속성(SQLite 계층) 및 평문 미저장 확인
+- FF3_KEY 교체 시 이전 캐시 자동 폐기 확인
+- pseudonymize_ids가 캐시 적중분은 암호화하지 않는지 확인
+"""
+
+import pandas as pd
+from ff3 import FF3Cipher
+
+from common.pseudonym_cache import PseudonymCache
+from deidentifier.deid_utils import pseudonymize_id, pseudonymize_ids
+
+KEY = "0123456789abcdef0123456789abcdef"
+OTHER_KEY = "fedcba9876543210fedcba9876543210"
+TWEAK = "abcdef12345678"
+NUMERIC = "0123456789"
+
+
+def test_persists_across_instances(tmp_path):
+    db_path = tmp_path / "cache" / "pseudonyms.db"
+    cache = PseudonymCache(db_path, KEY, TWEAK, NUMERIC)
+    cache.put_many({"12345678": "87654321", "11112222": "33334444"})
+    cache.close()
+
+    reopened = PseudonymCache(db_path, KEY, TWEAK, NUMERIC)
+    assert reopened.get_many(["12345678", "11112222", "99999999"]) == {
+        "12345678": "87654321",
+        "11112222": "33334444",
+    }
+    reopened.close()
+
+    raw = db_path.read_bytes()
+    assert b"12345678" not in raw
+    assert b"87654321" not in raw
+
+
+def test_key_rotation_invalidates(tmp_path):
+    db_path = tmp_path / "pseudonyms.db"
+    cache = PseudonymCache(db_path, KEY, TWEAK, NUMERIC)
+    cache.put("12345678", "87654321")
+    cache.close()
+
+    rotated = PseudonymCache(db_path, OTHER_KEY, TWEAK, NUMERIC)
+    assert rotated.get("12345678") is None
+    rotated.close()
+
+    # 이전 키로 다시 열어도 이미 폐기되어 있어야 함
+    original = PseudonymCache(db_path, KEY, TWEAK, NUMERIC)
+    assert original.get("12345678") is None
+    original.close()
+
+
+def test_namespaces_are_separated_by_alphabet(tmp_path):
+    db_path = tmp_path / "pseudonyms.db"
+    numeric = PseudonymCache(db_path, KEY, TWEAK, NUMERIC)
+    alphanumeric = PseudonymCache(db_path, KEY, TWEAK, NUMERIC + "ABCDEF")
+    numeric.put("12345678", "87654321")
+    assert alphanumeric.get("12345678") is None
+    numeric.close()
+    alphanumeric.close()
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    cache = PseudonymCache(tmp_path / "pseudonyms.db", KEY, TWEAK, NUMERIC, memory_size=2)
+    cache.put_many({"1": "a", "2": "b", "3": "c"})
+    assert list(cache._memory) == ["2", "3"]
+    # 메모리에서 밀려난 항목도 디스크 계층에서 조회됨
+    assert cache.get("1") == "a"
+    cache.close()
+
+
+def test_pseudonymize_ids_uses_cache(tmp_path):
+    cipher = FF3Cipher.withCustomAlphabet(KEY, TWEAK, NUMERIC)
+    cache = PseudonymCache(tmp_path / "pseudonyms.db", KEY, TWEAK, NUMERIC)
+    ids = pd.Series(["12345678", 1234, "12345678"])
+
+    first = pseudonymize_ids(ids, cipher, cache)
+    assert cache.get("1234") == pseudonymize_id(1234, cipher)
+
+    class FailingCipher:
+        def encrypt(self, plaintext):
+            raise AssertionError("캐시 적중 시 암호화가 호출되면 안 됩니다")
+
+    second = pseudonymize_ids(ids, FailingCipher(), cache)
+    pd.testing.assert_series_equal(first, second)
+    cache.close()
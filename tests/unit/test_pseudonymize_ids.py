@@ -0,0 +1,68 @@
+"""
+파일명: tests/unit/test_pseudonymize_ids.py
+목적: pseudonymize_ids(컬럼 일괄 가명화)가 pseudonymize_id 행 단위 결과와 동일한지 검증
+주요 기능:
+- 하이픈 위치 보존, 8자리 0-패딩, 정수 입력이 행 단위 처리와 일치하는지 확인
+- 고유값마다 한 번씩만 암호화하는지 확인
+"""
+
+import pandas as pd
+from ff3 import FF3Cipher
+
+from deidentifier.deid_utils import pseudonymize_id, pseudonymize_ids
+
+KEY = "0123456789abcdef0123456789abcdef"
+TWEAK = "abcdef12345678"
+
+
+class CountingCipher:
+    """encrypt 호출 횟수를 세는 래퍼"""
+
+    def __init__(self, cipher):
+        self.cipher = cipher
+        self.calls = 0
+
+    def encrypt(self, plaintext):
+        self.calls += 1
+        return self.cipher.encrypt(plaintext)
+
+
+def test_matches_row_wise_numeric():
+    cipher = FF3Cipher.withCustomAlphabet(KEY, TWEAK, "0123456789")
+    ids = pd.Series(["12345678", "1234", 1234, "12345678", "123-4567"], index=[10, 11, 12, 13, 14])
+
+    result = pseudonymize_ids(ids, cipher)
+
+    expected = ids.apply(lambda x: pseudonymize_id(x, cipher))
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_matches_row_wise_alphanumeric():
+    cipher = FF3Cipher.withCustomAlphabet(
+        KEY, TWEAK, "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+    )
+    ids = pd.Series(["SA16-3492", "AB12-0001", "SA16-3492"], name="photo_id")
+
+    result = pseudonymize_ids(ids, cipher)
+
+    expected = ids.apply(lambda x: pseudonymize_id(x, cipher))
+    pd.testing.assert_series_equal(result, expected)
+    assert result.iloc[0][4] == "-"
+
+
+def test_encrypts_each_unique_value_once():
+    cipher = CountingCipher(FF3Cipher.withCustomAlphabet(KEY, TWEAK, "0123456789"))
+    ids = pd.Series(["00000001", "00000002"] * 500)
+
+    result = pseudonymize_ids(ids, cipher)
+
+    assert cipher.calls == 2
+    assert len(result) == 1000
+    assert result.iloc[0] == result.iloc[2]
+
+
+def test_empty_series():
+    cipher = CountingCipher(FF3Cipher.withCustomAlphabet(KEY, TWEAK, "0123456789"))
+    result = pseudonymize_ids(pd.Series([], dtype=object), cipher)
+    assert result.empty
+    assert cipher.calls == 0
@@ -0,0 +1,139 @@
+"""
+파일명: tests/unit/test_report_scanner.py
+목적: CompiledReportScanner(compiled 엔진)가 순차 처리(replace_with_*)와 같은 결과를 내는지 검증
+주요 기능:
+- config/deidentification.yml의 실제 targets로 샘플 병리보고서를 두 방식으로 처리하여 비교
+- 겹치는 타겟(같은 "/ 숫자"를 노리는 age와 room)도 targets 순서대로 처리되는지 확인
+- deidentify_report_column의 compiled / sequential 엔진 결과(텍스트, extracted_ 컬럼)가 같은지 확인
+- DeidPlan을 넘기면 규칙의 컴파일된 정규식(rule.pattern)으로 같은 결과를 내는지 확인
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+from ff3 import FF3Cipher
+
+import deidentifier.deid_utils as deid_utils
+from deidentifier.deid_utils import (
+    deidentify_report_column,
+    replace_with_masked_id,
+    replace_with_pseudonymized_age,
+    replace_with_pseudonymized_date,
+    replace_with_pseudonymized_id,
+    replace_with_serialized_id,
+)
+from deidentifier.deid_plan import DeidPlan
+from deidentifier.report_scanner import CompiledReportScanner
+
+KEY = "0123456789abcdef0123456789abcdef"
+TWEAK = "abcdef12345678"
+CIPHER_NUMERIC = FF3Cipher.withCustomAlphabet(KEY, TWEAK, "0123456789")
+CIPHER_ALPHANUMERIC = FF3Cipher.withCustomAlphabet(
+    KEY, TWEAK, "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+)
+
+REPORT = (
+    "조직병리 검사 결과지\n"
+    "등록번호: 01234567  환 자 명: 홍길동  성별/나이: F\n"
+    "병리번호: SA16-34921  접 수 일: 2024-05-17  결 과 일: 2024-05-20\n"
+    "의뢰의사: 김의사  의 뢰 과: 내과  병동/병실: A1  외래/입원: 입원 \n"
+    "SB17-1234   육안사진촬영\n"
+    "담당의사 : 이담당\n"
+    "결과 입력 : 박입력\n"
+    "출력자ID : 482190  PGM_ID : ABCD1234  출력일 : 2024-06-01\n"
+    "병리전문의 : 최병리/정병리"
+)
+
+
+def load_targets():
+    yml_path = Path(__file__).resolve().parents[2] / "config" / "deidentification.yml"
+    with open(yml_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["pathology_report"]["targets"]
+
+
+def sequential(text, targets, existing_columns=()):
+    """deidentify_report_column(sequential)의 텍스트 비식별화 부분을 그대로 재현"""
+    for key, conf in targets.items():
+        regex = conf.get("regular_expression", "")
+        policy = conf.get("deidentification_policy", "no_apply")
+        if policy == "pseudonymization":
+            pseudo_policy = conf.get("pseudonymization_policy", "")
+            if pseudo_policy == "fpe_numeric":
+                text = replace_with_pseudonymized_id(text, regex, CIPHER_NUMERIC)
+            elif pseudo_policy == "fpe_alphanumeric":
+                text = replace_with_pseudonymized_id(text, regex, CIPHER_ALPHANUMERIC)
+            elif pseudo_policy in ("year_to_january_first", "month_to_first_day"):
+                text = replace_with_pseudonymized_date(text, regex, pseudo_policy)
+            elif pseudo_policy in ("age_to_5year_group", "age_to_10year_group"):
+                text = replace_with_pseudonymized_age(text, regex, pseudo_policy)
+        elif policy == "anonymization":
+            anonymization_policy = conf.get("anonymization_policy", "")
+            value = conf.get("anonymization_value", "")
+            if anonymization_policy == "serial_number" and key not in existing_columns:
+                text = replace_with_serialized_id(text, regex)
+            elif anonymization_policy in ("serial_number", "masking"):
+                text = replace_with_masked_id(text, regex, value)
+    return text
+
+
+@pytest.fixture(autouse=True)
+def reset_serial_counter(monkeypatch):
+    monkeypatch.setattr(deid_utils, "_global_serial_counter", 0)
+
+
+@pytest.mark.parametrize("existing_columns", [(), ("pathology_id",)])
+def test_matches_sequential(existing_columns):
+    targets = load_targets()
+    expected = sequential(REPORT, targets, existing_columns)
+    deid_utils._global_serial_counter = 0
+
+    scanner = CompiledReportScanner(targets, CIPHER_ALPHANUMERIC, CIPHER_NUMERIC,
+                                    existing_columns=existing_columns)
+    result = scanner.scan(REPORT)
+
+    assert result == expected
+    assert "01234567" not in result
+    assert "홍길동" not in result
+
+
+def test_no_match_returns_text_unchanged():
+    scanner = CompiledReportScanner(load_targets(), CIPHER_ALPHANUMERIC, CIPHER_NUMERIC)
+    assert scanner.scan("no findings.") == "no findings."
+    assert scanner.scan("") == ""
+
+
+def test_overlapping_targets_follow_target_order():
+    targets = load_targets()
+    report = " / 45 남은 문구"
+    assert sequential(report, targets) != report
+    assert CompiledReportScanner(targets, CIPHER_ALPHANUMERIC, CIPHER_NUMERIC).scan(report) == sequential(report, targets)
+
+
+@pytest.mark.parametrize("existing_columns", [[], ["pathology_id"]])
+def test_compiled_engine_matches_sequential_engine(existing_columns):
+    targets = load_targets()
+    reports = [REPORT, " / 45 남은 문구", "no findings.", "", None]
+
+    def run(engine):
+        deid_utils._global_serial_counter = 0
+        df = pd.DataFrame({"pathology_report": reports, **{column: "x" for column in existing_columns}})
+        return deidentify_report_column(df, "pathology_report", targets, CIPHER_ALPHANUMERIC, CIPHER_NUMERIC,
+                                        engine=engine)
+
+    compiled, expected = run("compiled"), run("sequential")
+    pd.testing.assert_frame_equal(compiled, expected)
+    assert "extracted_patient_id" in compiled.columns
+    deid_utils._global_serial_counter = 0
+    assert compiled["pathology_report"].iloc[0] == sequential(REPORT, targets, existing_columns)
+
+
+def test_scanner_accepts_plan():
+    targets = load_targets()
+    expected = sequential(REPORT, targets)
+    deid_utils._global_serial_counter = 0
+
+    plan = DeidPlan.from_targets(targets)
+    scanner = CompiledReportScanner(plan, CIPHER_ALPHANUMERIC, CIPHER_NUMERIC)
+    assert scanner.scan(REPORT) == expected
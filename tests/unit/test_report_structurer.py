@@ -0,0 +1,92 @@
+"""
+파일명: tests/unit/test_report_structurer.py
+목적: ReportStructurer(단일 행 패스 구조화 엔진)의 결과가 기존 순차 처리와 동일한지 검증
+주요 기능:
+- config/deidentification.yml의 non_targets/targets로 remove_non_targets·extract_targets 결과와 비교
+- specimen "육" 특례(검 체 : 만 삭제)와 캡처 그룹 검증 확인
+- 행 샤드 병렬 처리(structure_frames_parallel) 결과가 단일 프로세스와 같은지 확인
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from deidentifier.deid_utils import extract_targets, remove_non_targets
+from deidentifier.report_structurer import ReportStructurer
+
+CONFIG = yaml.safe_load(
+    (Path(__file__).resolve().parents[2] / "config" / "deidentification.yml").read_text(encoding="utf-8")
+)["pathology_report"]
+
+
+def make_report(specimen):
+    return (
+        "조직병리 검사 결과지\n"
+        "한국원자력의학원 병리과\n"
+        "등록번호: 12345678\n"
+        " 검 체 : " + specimen + "\n"
+        " 상 병 : C34.9 폐암\n"
+        " 검 사 : 조직검사\n"
+        " 검 체 : " + specimen + "\n"
+        " ◎ 육 안 소 견\n"
+        "담당의사 : 홍길동\n"
+        " ◎ 병 리 진 단\n"
+        "Adenocarcinoma SA16-3492   육안사진촬영\n"
+        "결과 입력 출력자ID: 1234567 PGM_ID : ABCD1234\n"
+        "이 결과지는 전자서명법에 의하여 전자서명된 문서입니다.\n"
+        " 1 / 2"
+    )
+
+
+@pytest.fixture
+def reports():
+    return pd.DataFrame({"pathology_report": [make_report("Lung, biopsy"), make_report("육안 소견 참조"), None]})
+
+
+def test_matches_sequential_functions(reports):
+    expected = reports.copy()
+    for key, conf in CONFIG["non_targets"].items():
+        remove_non_targets(expected, "pathology_report", key, conf)
+    for key, conf in CONFIG["targets"].items():
+        extract_targets(expected, "pathology_report", key, conf)
+
+    structurer = ReportStructurer(CONFIG["non_targets"], CONFIG["targets"])
+    result = structurer.structure_frame(reports.copy(), "pathology_report")
+
+    assert list(result.columns) == list(expected.columns)
+    for column in expected.columns:
+        assert result[column].tolist() == expected[column].where(expected[column].notna(), None).tolist(), column
+    assert result.loc[0, "extracted_specimen"] == "Lung, biopsy"
+    assert result.loc[0, "extracted_photo_id"] == "SA16-3492"
+
+
+def test_specimen_with_yuk_keeps_line_content(reports):
+    structurer = ReportStructurer({}, {"specimen": CONFIG["targets"]["specimen"]})
+    residual, values = structurer.structure(make_report("육안 소견 참조"))
+    assert values["specimen"] == "육안 소견 참조"
+    assert "검 체" not in residual
+    assert residual.count("육안 소견 참조") == 2
+
+
+def test_target_requires_single_group():
+    with pytest.raises(ValueError):
+        ReportStructurer({}, {"bad": {"regular_expression": r"(a)(b)"}})
+
+
+def test_parallel_matches_single_process():
+    from deidentifier.parallel_structurer import structure_frames_parallel
+
+    texts = [make_report(f"Lung, biopsy {i}") if i % 3 else make_report("육안 소견 참조") for i in range(25)]
+    texts[7] = None
+    single = ReportStructurer(CONFIG["non_targets"], CONFIG["targets"]).structure_frame(
+        pd.DataFrame({"pathology_report": texts}), "pathology_report")
+    dfs = {
+        "a.xlsx": pd.DataFrame({"pathology_report": texts}),
+        "b.xlsx": pd.DataFrame({"pathology_report": texts[:4]}),
+    }
+    structure_frames_parallel(dfs, "pathology_report", CONFIG["non_targets"], CONFIG["targets"],
+                              workers=2, shard_rows=4)
+    pd.testing.assert_frame_equal(dfs["a.xlsx"], single)
+    pd.testing.assert_frame_equal(dfs["b.xlsx"], single.iloc[:4])
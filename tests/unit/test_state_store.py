@@ -0,0 +1,62 @@
+"""
+파일명: tests/unit/test_state_store.py
+목적: ColumnarStateStore(컬럼 단위 상태 저장소)의 동작 검증
+주요 기능:
+- 전체 저장/로드 왕복 및 컬럼 순서·혼합 타입 처리 확인
+- 컬럼 지정 저장 시 기존 컬럼 파일을 다시 쓰지 않는지 확인
+"""
+
+import pandas as pd
+
+from metafier.state_store import ColumnarStateStore
+
+
+def make_df():
+    return pd.DataFrame({
+        "환자번호": ["001", "002", "003"],
+        "판독소견": ["staging work-up", None, "follow up"],
+        "검사일": [20240101, 20240102, 20240103],
+        "혼합": [1, "a", None],
+    })
+
+
+def test_roundtrip(tmp_path):
+    store = ColumnarStateStore(tmp_path / "state")
+    assert store.load() is None
+
+    store.save(make_df())
+    loaded = store.load()
+
+    assert list(loaded.columns) == ["환자번호", "판독소견", "검사일", "혼합"]
+    assert loaded["판독소견"].tolist() == ["staging work-up", None, "follow up"]
+    assert loaded["검사일"].tolist() == [20240101, 20240102, 20240103]
+    assert loaded["혼합"].tolist() == ["1", "a", None]
+    assert list(store.load(columns=["검사일"]).columns) == ["검사일"]
+
+
+def test_save_columns_only_writes_changed(tmp_path):
+    store = ColumnarStateStore(tmp_path / "state")
+    df = make_df()
+    store.save(df)
+    before = {p.name: p.stat().st_mtime_ns for p in (tmp_path / "state").glob("*.feather")}
+
+    df = store.load()
+    df["scan_purpose"] = ["staging", "", ""]
+    assert store.save(df, columns=["scan_purpose"]) == ["scan_purpose"]
+
+    after = {p.name: p.stat().st_mtime_ns for p in (tmp_path / "state").glob("*.feather")}
+    assert len(after) == len(before) + 1
+    assert all(after[name] == mtime for name, mtime in before.items())
+    assert store.load()["scan_purpose"].tolist() == ["staging", "", ""]
+    assert list(store.load().columns)[-1] == "scan_purpose"
+
+
+def test_row_count_change_rewrites_all(tmp_path):
+    store = ColumnarStateStore(tmp_path / "state")
+    store.save(make_df())
+    shorter = make_df().head(2)
+    store.save(shorter, columns=["환자번호"])
+    assert len(store.load()) == 2
+
+    store.clear()
+    assert not store.exists()
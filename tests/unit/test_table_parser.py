@@ -0,0 +1,83 @@
+"""
+파일명: tests/unit/test_table_parser.py
+목적: LLM 마크다운 표 파서(table_parser)의 동작 검증
+주요 기능:
+- 구분선 누락, 코드펜스, 셀 안 파이프, 열 수 불일치 허용 확인
+- 스트리밍(feed) 파싱이 일괄 파싱과 같은 결과를 내는지 확인
+- 결과 행과 번들 파일 목록 대조(누락 파일 검출) 확인
+- 결과 행마다 파일 목록 내 위치(병합 정렬 키)를 구하는지 확인
+"""
+
+import pandas as pd
+
+from metafier.table_parser import (
+    MarkdownTableParser,
+    file_positions,
+    parse_markdown_table,
+    reconcile_rows,
+    split_cells,
+)
+
+RESPONSE = """Here is the extracted table:
+
+```markdown
+| Filename | Diagnosis | Comment |
+|:---|---|---:|
+| report_1.txt | adenocarcinoma | pT1a \\| N0 |
+| report_2.txt | squamous cell carcinoma | margin | involved |
+| report_3.txt | benign
+```
+"""
+
+
+def test_parse_tolerates_pipes_and_column_mismatch():
+    df = parse_markdown_table(RESPONSE)
+    assert list(df.columns) == ["Filename", "Diagnosis", "Comment"]
+    assert df["Comment"].tolist() == ["pT1a | N0", "margin | involved", ""]
+    assert df["Filename"].tolist() == ["report_1.txt", "report_2.txt", "report_3.txt"]
+
+
+def test_missing_separator_and_repeated_header():
+    text = "Filename | Diagnosis\nreport_1 | a\nFilename | Diagnosis\nreport_2 | b"
+    df = parse_markdown_table(text)
+    assert df.values.tolist() == [["report_1", "a"], ["report_2", "b"]]
+
+
+def test_streaming_matches_batch():
+    parser = MarkdownTableParser()
+    streamed = []
+    for start in range(0, len(RESPONSE), 7):
+        streamed.extend(parser.feed(RESPONSE[start:start + 7]))
+    streamed.extend(parser.close())
+    assert len(streamed) == 3
+    pd.testing.assert_frame_equal(parser.to_dataframe(), parse_markdown_table(RESPONSE))
+
+
+def test_split_cells_keeps_escaped_trailing_pipe():
+    assert split_cells("| a | b \\|") == ["a", "b |"]
+    assert split_cells("a|b|") == ["a", "b"]
+
+
+def test_reconcile_rows_finds_missing_files():
+    df = pd.DataFrame({
+        "File": ["report_1", "`report_3.txt`", "report_9.txt", "report_1.txt"],
+        "Diagnosis": ["a", "c", "hallucinated", "a2"],
+    })
+    matched, missing = reconcile_rows(df, ["report_1.txt", "report_2.txt", "report_3.txt"])
+    assert matched["Diagnosis"].tolist() == ["a", "c", "a2"]
+    assert missing == ["report_2.txt"]
+
+
+def test_reconcile_rows_without_filename_column():
+    df = pd.DataFrame({"Diagnosis": ["a", "b"]})
+    matched, missing = reconcile_rows(df, ["report_1.txt"])
+    assert missing is None
+    assert matched is df
+
+
+def test_file_positions_follow_file_list():
+    files = ["report_1.txt", "report_2.txt", "report_10.txt"]
+    retry = pd.DataFrame({"File": ["report_2", "unknown"], "Diagnosis": ["b", "?"]})
+    assert file_positions(retry, files).tolist()[0] == 1
+    assert pd.isna(file_positions(retry, files).iloc[1])
+    assert file_positions(pd.DataFrame({"Diagnosis": ["a"]}), files) is None
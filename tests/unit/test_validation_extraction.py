@@ -0,0 +1,62 @@
+"""
+파일명: tests/unit/test_validation_extraction.py
+목적: validation_extraction(추출 결과 검증)의 비교 규칙과 불일치 리포트 저장 검증
+주요 기능:
+- patient_id 제로패딩, 날짜 yyyy-mm-dd 정규화 후 일치하면 extracted_ 컬럼을 삭제하는지 확인
+- 불일치/남은 전문 행이 (check, row, expected, extracted) 리포트로 저장되는지 확인
+- 불일치 리포트가 비식별화 단계의 입력 목록에 포함되지 않는지 확인
+"""
+
+import pandas as pd
+import pytest
+
+from common.excel_io import save_frames
+from deidentifier.deid_utils import validation_extraction
+from deidentifier.pathology_deidentifier import list_structured_files
+
+MAPPING = {"patient_id": "patient_id", "result_date": "result_date", "report_column": "pathology_report"}
+
+
+def make_df():
+    return pd.DataFrame({
+        "patient_id": [1234567, "00000042", None],
+        "extracted_patient_id": ["01234567", "42", None],
+        "result_date": pd.to_datetime(["2025-01-02", "2025-03-04", None]),
+        "extracted_result_date": ["2025-01-02", "2025-03-05", ""],
+        "pathology_report": ["\n\r\n", "남은 문구\n", None],
+    })
+
+
+def test_matching_columns_dropped_and_mismatches_reported(tmp_path):
+    report_path = tmp_path / "validation_a.csv"
+    df = validation_extraction(make_df(), "pathology_report", MAPPING, mismatch_report_path=report_path)
+
+    assert "extracted_patient_id" not in df.columns
+    assert "extracted_result_date" in df.columns
+    assert "pathology_report" in df.columns
+
+    report = pd.read_csv(report_path, keep_default_na=False)
+    assert report.to_dict("records") == [
+        {"check": "pathology_report", "row": 1, "expected": "", "extracted": "남은 문구"},
+        {"check": "result_date vs extracted_result_date", "row": 1, "expected": "2025-03-04", "extracted": "2025-03-05"},
+    ]
+
+
+def test_all_clean_drops_report_column_without_report_file(tmp_path):
+    df = make_df().iloc[[0]]
+    df.loc[:, "pathology_report"] = "\n"
+    report_path = tmp_path / "validation_b.parquet"
+    df = validation_extraction(df, "pathology_report", MAPPING, mismatch_report_path=report_path)
+    assert list(df.columns) == ["patient_id", "result_date"]
+    assert not report_path.exists()
+
+
+def test_mismatch_report_is_not_deidentifier_input(tmp_path):
+    pytest.importorskip("pyarrow")
+    structured_dir = tmp_path / "structured"
+    df = validation_extraction(make_df(), "pathology_report", MAPPING,
+                               mismatch_report_path=structured_dir / "validation_a.parquet")
+    save_frames(str(structured_dir), {"a.xlsx": df}, prefix="structured_", fmt="parquet")
+
+    assert sorted(f.name for f in structured_dir.iterdir()) == ["structured_a.parquet", "validation_a.parquet"]
+    assert [f.name for f in list_structured_files(str(structured_dir), "parquet")] == ["structured_a.parquet"]